@@ -1,10 +1,19 @@
 class Config:
     # simulator
     sim_time = 10000
+    sim_engine = 'SimPy'  # SimPy (reference) or Fast
     enable_log = True
     verbose = False
+    log_in_background = False  # format and write log records in a background thread (call stop_logging to finish)
+    compress_log = False  # write logs gzip-compressed (.log.gz)
+    record_metrics = True  # record results in memory, so plots do not depend on parsing the log
+    metrics_file = None  # file (.npz) to which power_main.py exports the recorded results, or None
 
     # broker
+    # send VMs that arrive at the same time to the cloud as one batch; placements are the same as without batching.
+    # FirstFit sends each datacenter its share of a batch at once, and LeastCost, LeastPower and MaxGreen evaluate
+    # all datacenters once per batch and then only the datacenter of each placement
+    batch_arrivals = False
 
     # cloud
     dc_selection_policy = 'PPO'
@@ -16,9 +25,11 @@ class Config:
     pue_file = 'csv/pue.csv'
     br_cost_file = 'csv/br_cost.csv'
     solar_file = 'csv/solar_real.csv'
+    trace_cache_dir = None  # directory where csv power traces are cached in binary format to be shared, or None
     dc_attributes = {'arch': 'x86', 'os': 'Linux', 'vmm': 'Xen', 'time_zone': 10.0,
                      'cost_per_mips': 3.0, 'cost_per_ram': 0.05, 'cost_per_storage': 0.001,
                      'cost_per_bw': 0.0}
+    # FirstFit, LeastMips, BestFit, WorstFit, FirstFitTree, LeastMipsTree or MostMipsTree
     vm_allocation_policy = 'FirstFit'
     consolidation = True
 
@@ -35,6 +46,7 @@ class Config:
     # workload
     # vm_file = 'csv/vms_HighDuration_1.csv'
     vm_file = 'csv/vms_test.csv'
+    vm_chunk_size = 10000  # number of VM rows parsed at once when streaming the workload
 
     # miscellaneous
     eps = 1e-3
@@ -47,3 +59,14 @@ class Config:
     batch_size = 32
     memory = 10000
     horizon = 20
+    ppo_policy_file = None  # policy exported by rl_main.py (.npz), evaluated with NumPy when no agent is given
+
+    # sweep (sweep_main.py): every combination of the following runs as one simulation on a process pool
+    sweep_dc_selection_policies = ['FirstFit', 'RoundRobin', 'LeastPower', 'LeastCost', 'MaxGreen']
+    sweep_vm_allocation_policies = ['FirstFit', 'LeastMips']
+    sweep_dc_files = [dc_file]
+    sweep_vm_files = [vm_file]  # None stands for a synthetic workload of sweep_num_vms VMs
+    sweep_seeds = [None]
+    sweep_num_vms = 1000
+    sweep_workers = None  # number of worker processes, or None for the number of CPUs
+    sweep_results_file = 'sweep_results.csv'
@@ -6,10 +6,11 @@ Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
 Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
 """
 
-import simpy
-import logging
-
-from utils.logger import log
+from core.MessageBus import MessageBus, VmCreateAck, VmCreateBatchRequest, VmCreateRequest, VmDestroyRequest
+from core.SimConfig import SimConfig
+from core.SimEngine import ARRIVAL, MESSAGE
+from utils.logger import Logger
+from utils.metrics import MetricsRecorder
 
 
 class PyCloudSim(object):
@@ -17,30 +18,88 @@ class PyCloudSim(object):
     PyCloudSim class definition: It is responsible for initializing, starting and stopping the simulator
     :ivar _sim_time: simulation time
     :type _sim_time: int
-    :ivar _env: simulation environment
-    :type _env: simpy env
+    :ivar _env: simulation engine
+    :type _env: SimEngine
     :ivar _vm_list: list of VMs that to be processed
     :type _vm_list: list[VM]
     :ivar _cloud: an instance of Cloud class
     :type _cloud: Cloud
     :ivar _broker: an instance of Broker
     :type _broker: Broker
+    :ivar _message_bus: the bus that delivers messages between the broker, the cloud and datacenters
+    :type _message_bus: MessageBus
+    :ivar _config: configuration of the simulation
+    :type _config: SimConfig
+    :ivar _logger: the logger shared by all entities of the simulation
+    :type _logger: Logger
+    :ivar _metrics: the recorder of the results of the simulation (None if config.record_metrics is False)
+    :type _metrics: MetricsRecorder
     """
 
-    def __init__(self, sim_time, broker, cloud, vm_list):
-        log('INFO', 0, f'Creating PyCloudSim environment.')
+    def __init__(self, sim_time, broker, cloud, vm_list, engine=None, config=None):
+        """ Constructor
+        :param sim_time: simulation time
+        :param broker: an instance of Broker
+        :param cloud: an instance of Cloud
+        :param vm_list: list of VMs that to be processed
+        :param engine: name of the simulation engine ('SimPy' or 'Fast'), config.sim_engine if not specified
+        :param config: configuration of the simulation, resolved from Config if not specified. Its logger and options
+        are bound to the broker, the cloud and datacenters, and so is a metrics recorder if config.record_metrics is set
+        """
+        self._config = config if config is not None else SimConfig.from_config()
+        self._logger = Logger.from_config(self._config)
+        self._logger.log('INFO', 0, f'Creating PyCloudSim environment.')
         if isinstance(sim_time, int) and sim_time > 0:
             self._sim_time = sim_time
         else:
             raise ValueError('The value should be a positive integer.')
-        self._env = simpy.Environment()
+        self._engine_name = engine if engine is not None else self._config.sim_engine
         self._broker = broker
         self._cloud = cloud
         self._datacenter_list = cloud.get_dc_list()
         self._vm_list = vm_list
-        self._env.process(self._broker.start_run(self._env, sim_time))
-        [self._env.process(dc.start_run(self._env, sim_time)) for dc in self._datacenter_list]
-        self._env.process(self._cloud.start_run(self._env, sim_time))
+        self._env = None
+        self._message_bus = None
+        self._broker.set_logger(self._logger)
+        self._broker.set_batch_arrivals(self._config.batch_arrivals)
+        self._cloud.set_logger(self._logger)
+        self._metrics = MetricsRecorder() if self._config.record_metrics else None
+        self._cloud.set_metrics(self._metrics)
+        self._create_engine()
+
+    def _create_engine(self):
+        match self._engine_name:
+            # engines are imported on first use, so SimPy is not loaded if the fast engine is selected
+            case 'SimPy':
+                from core.SimPyEngine import SimPyEngine
+                self._env = SimPyEngine()
+            case 'Fast':
+                from core.FastEngine import FastEngine
+                self._env = FastEngine()
+            case _:
+                raise ValueError('Simulation engine not implemented')
+        self._message_bus = MessageBus(self._env)
+        self._message_bus.subscribe(VmCreateRequest, lambda request: self._cloud.process_vm_create(request.vm))
+        self._message_bus.subscribe(VmCreateBatchRequest,
+                                    lambda request: self._cloud.process_vm_create_batch(request.vms))
+        self._message_bus.subscribe(VmCreateAck, self._broker.process_ack)
+        self._message_bus.subscribe(VmDestroyRequest,
+                                    lambda request: request.datacenter.process_vm_destroy(request.vm))
+        self._broker.set_message_bus(self._message_bus)
+        self._cloud.set_message_bus(self._message_bus)
+        self._env.subscribe(ARRIVAL, self._broker.process_arrival)
+        self._env.subscribe(MESSAGE, self._message_bus.send)
+
+    def reset(self):
+        """ Return the simulation to its initial state in place, so that another run (e.g. an RL episode) reuses the
+        already built topology and the already parsed workload instead of rebuilding them from files
+        """
+        self._logger.log('INFO', 0, f'Resetting PyCloudSim environment.')
+        self._cloud.reset()
+        self._broker.reset()
+        if self._metrics is not None:
+            self._metrics.reset()
+        self._create_engine()
 
     def get_sim_time(self):
         return self._sim_time
@@ -54,13 +113,30 @@ class PyCloudSim(object):
     def _set_env(self, env):
         self._env = env
 
+    def get_message_bus(self):
+        return self._message_bus
+
+    def get_config(self):
+        return self._config
+
+    def get_logger(self):
+        return self._logger
+
+    def get_metrics(self):
+        return self._metrics
+
     def start_simulation(self):
-        log('INFO', 0, f'Starting simulation.')
+        self._logger.log('INFO', 0, f'Starting simulation.')
+        self._broker.start_run(self._env, self._sim_time)
+        [dc.start_run(self._env, self._sim_time) for dc in self._datacenter_list]
+        self._cloud.start_run(self._env, self._sim_time)
         self.get_env().run(until=self.get_sim_time())
 
     def stop_simulation(self):
-        log('INFO', int(self._env.now), 'Simulation Finished.')
+        self._logger.log('INFO', int(self._env.now), 'Simulation Finished.')
         cost = [dc.get_brown_cost() for dc in self._datacenter_list if callable(getattr(dc, 'get_brown_cost', None))]
-        log('STAT', int(self._env.now), f'Total cost of all datacenters = {sum(cost)}')
+        self._logger.log('STAT', int(self._env.now), f'Total cost of all datacenters = {sum(cost)}')
+        self._logger.log('INFO', int(self._env.now), f'Messages delivered: {self._message_bus.get_counts()}, '
+                                                     f'events: {self._env.get_num_events()}')
 
 
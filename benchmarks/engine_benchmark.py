@@ -0,0 +1,95 @@
+"""
+Title:          PyCloudSim
+Description:    A Python-based Cloud Simulator
+Author(s):      Mahmoud Momtazpour
+Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
+Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from PyCloudSim import PyCloudSim
+from benchmarks.scenario import write_scenario
+from core.FastEngine import FastEngine
+from core.SimConfig import SimConfig
+from core.SimEngine import ARRIVAL, MESSAGE
+from core.SimPyEngine import SimPyEngine
+from utils.creator import create_broker, create_cloud, create_power_datacenter_from_file, create_vms
+
+
+def run_engine(engine: str, files: dict, sim_time: int, config: SimConfig = None) -> dict:
+    """Run a scenario with a given simulation engine
+    :param engine: name of the engine ('SimPy' or 'Fast')
+    :param files: paths of the files of the scenario
+    :param sim_time: simulation time
+    :param config: configuration of the simulation
+    :return: the results (total cost, message counts and power history of datacenters) and performance of the run
+    :rtype: dict
+    """
+    datacenters = create_power_datacenter_from_file(files['dc_file'], files['pue_file'], files['br_cost_file'],
+                                                    files['solar_file'], config=config)
+    cloud = create_cloud(datacenters, config=config)
+    vms = create_vms(files['vm_file'], config=config)
+    broker = create_broker(cloud)
+    broker.submit_vm_list(vms)
+    cloud.set_broker(broker)
+    sim = PyCloudSim(sim_time, broker, cloud, vms, engine=engine, config=config)
+    start = time.perf_counter()
+    sim.start_simulation()
+    wall_time = time.perf_counter() - start
+    num_events = sim.get_env().get_num_events()
+    return {'cost': sum(dc.get_brown_cost() for dc in datacenters),
+            'messages': sim.get_message_bus().get_counts(),
+            'power': [np.array(dc.get_power_all()) for dc in datacenters],
+            'wall_time': wall_time, 'events': num_events, 'events_per_sec': num_events / wall_time}
+
+
+def run_kernel(engine, num_events: int, seed: int = 0) -> float:
+    """Measure the overhead of an engine alone, with handlers that only schedule new events: arrivals every second,
+    each followed by a message after a random delay, as VM creations are followed by their destruction
+    :param engine: an instance of a SimEngine subclass
+    :param num_events: number of arrivals
+    :param seed: seed of the random number generator
+    :return: delivered events per second
+    :rtype: float
+    """
+    delays = np.random.default_rng(seed).integers(0, 1000, size=num_events).tolist()
+    engine.subscribe(ARRIVAL, lambda i: (engine.schedule(delays[i], MESSAGE, i),
+                                         engine.schedule(1, ARRIVAL, i + 1) if i + 1 < num_events else None))
+    engine.subscribe(MESSAGE, lambda i: None)
+    engine.schedule(0, ARRIVAL, 0)
+    start = time.perf_counter()
+    engine.run(until=num_events + 1000)
+    return engine.get_num_events() / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare the SimPy and Fast simulation engines on a synthetic '
+                                                 'scenario.')
+    parser.add_argument('--dcs', type=int, default=4, help='number of datacenters')
+    parser.add_argument('--hosts', type=int, default=100, help='number of hosts of each datacenter')
+    parser.add_argument('--vms', type=int, default=50000, help='number of VMs')
+    parser.add_argument('--sim-time', type=int, default=100000, help='simulation time')
+    parser.add_argument('--dc-policy', default='RoundRobin', help='DC selection policy')
+    parser.add_argument('--vm-policy', default='FirstFitTree', help='VM allocation policy')
+    args = parser.parse_args()
+    config = SimConfig.from_config(enable_log=False, dc_selection_policy=args.dc_policy,
+                                   vm_allocation_policy=args.vm_policy)
+    with tempfile.TemporaryDirectory() as directory:
+        scenario = write_scenario(directory, args.dcs, args.hosts, args.vms, args.sim_time)
+        results = {engine: run_engine(engine, scenario, args.sim_time, config) for engine in ('SimPy', 'Fast')}
+    reference, fast = results['SimPy'], results['Fast']
+    identical = reference['cost'] == fast['cost'] and reference['messages'] == fast['messages'] and all(
+        np.array_equal(p, q) for p, q in zip(reference['power'], fast['power']))
+    for engine, result in results.items():
+        print(f'{engine:6s} {result["events"]} events in {result["wall_time"]:.2f}s '
+              f'({result["events_per_sec"]:.0f} events/s), cost = {result["cost"]:.2f}')
+    print(f'Identical results: {identical}')
+    print(f'Speedup: {reference["wall_time"] / fast["wall_time"]:.2f}x')
+    kernel = {'SimPy': run_kernel(SimPyEngine(), args.vms), 'Fast': run_kernel(FastEngine(), args.vms)}
+    print(f'Engine alone: SimPy {kernel["SimPy"]:.0f} events/s, Fast {kernel["Fast"]:.0f} events/s, '
+          f'speedup: {kernel["Fast"] / kernel["SimPy"]:.2f}x')
@@ -0,0 +1,111 @@
+"""
+Title:          PyCloudSim
+Description:    A Python-based Cloud Simulator
+Author(s):      Mahmoud Momtazpour
+Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
+Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from itertools import product
+
+from benchmarks.scenario import write_scenario
+
+DC_SELECTION_POLICIES = ['FirstFit', 'RoundRobin', 'LeastPower', 'LeastCost', 'MaxGreen']
+VM_ALLOCATION_POLICIES = ['FirstFit', 'LeastMips', 'BestFit', 'WorstFit', 'FirstFitTree', 'LeastMipsTree',
+                          'MostMipsTree']
+RESULT_FIELDS = ['dcs', 'hosts', 'vms', 'sim_time', 'dc_policy', 'vm_policy', 'engine', 'build_time', 'wall_time',
+                 'events', 'events_per_sec', 'placements', 'rejected', 'time_per_placement_us', 'peak_rss_mb']
+
+
+def run_cell(cell: dict) -> dict:
+    """Run one cell of the benchmark grid end to end. It is run in a fresh process, so that the peak memory of the
+    process is the peak memory of the cell
+    :param cell: the scale, policies, engine and scenario files of the cell
+    :return: the cell and its measurements
+    :rtype: dict
+    """
+    from PyCloudSim import PyCloudSim
+    from core.SimConfig import SimConfig
+    from utils.creator import create_broker, create_cloud, create_power_datacenter_from_file, create_vms
+
+    config = SimConfig.from_config(enable_log=False, dc_selection_policy=cell['dc_policy'],
+                                   vm_allocation_policy=cell['vm_policy'], sim_engine=cell['engine'])
+    files = cell['files']
+    start = time.perf_counter()
+    datacenters = create_power_datacenter_from_file(files['dc_file'], files['pue_file'], files['br_cost_file'],
+                                                    files['solar_file'], config=config)
+    cloud = create_cloud(datacenters, config=config)
+    vms = create_vms(files['vm_file'], config=config)
+    broker = create_broker(cloud)
+    broker.submit_vm_list(vms)
+    cloud.set_broker(broker)
+    sim = PyCloudSim(cell['sim_time'], broker, cloud, vms, config=config)
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    sim.start_simulation()
+    wall_time = time.perf_counter() - start
+    events = sim.get_env().get_num_events()
+    messages = sim.get_message_bus().get_counts()
+    # the cloud only acknowledges the VMs that it rejects
+    rejected = messages['VmCreateAck']
+    placements = broker.get_vms_requested() - rejected
+    result = {key: value for key, value in cell.items() if key != 'files'}
+    result.update(build_time=round(build_time, 3), wall_time=round(wall_time, 3), events=events,
+                  events_per_sec=round(events / wall_time), placements=placements, rejected=rejected,
+                  time_per_placement_us=round(wall_time / max(placements, 1) * 1e6, 1),
+                  peak_rss_mb=round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1))
+    return result
+
+
+def parse_scale(scale: str) -> tuple:
+    """Parse a scale given as DCSxHOSTSxVMS, e.g. 4x100x10000
+    :param scale: the scale
+    :return: number of datacenters, hosts of each datacenter and VMs
+    :rtype: tuple(int, int, int)
+    """
+    num_dcs, num_hosts, num_vms = map(int, scale.lower().split('x'))
+    return num_dcs, num_hosts, num_vms
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run the simulator end to end at increasing scales.')
+    parser.add_argument('--scales', nargs='+', default=['2x10x1000', '4x100x10000', '8x1000x100000'],
+                        help='scales as DCSxHOSTSxVMS')
+    parser.add_argument('--dc-policies', nargs='+', default=DC_SELECTION_POLICIES, help='DC selection policies')
+    parser.add_argument('--vm-policies', nargs='+', default=VM_ALLOCATION_POLICIES, help='VM allocation policies')
+    parser.add_argument('--engines', nargs='+', default=['Fast'], help='simulation engines (SimPy, Fast)')
+    parser.add_argument('--sim-time', type=int, default=100000, help='simulation time (VMs arrive in its first half)')
+    parser.add_argument('--mean-duration', type=int, default=None, help='mean duration of VMs')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the synthetic scenarios')
+    parser.add_argument('--output', default='benchmark_results', help='path of the results (.json and .csv)')
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory, \
+            multiprocessing.get_context('spawn').Pool(1, maxtasksperchild=1) as pool:
+        for scale in args.scales:
+            num_dcs, num_hosts, num_vms = parse_scale(scale)
+            files = write_scenario(os.path.join(directory, scale), num_dcs, num_hosts, num_vms, args.sim_time,
+                                   args.mean_duration, args.seed)
+            for dc_policy, vm_policy, engine in product(args.dc_policies, args.vm_policies, args.engines):
+                cell = {'dcs': num_dcs, 'hosts': num_hosts, 'vms': num_vms, 'sim_time': args.sim_time,
+                        'dc_policy': dc_policy, 'vm_policy': vm_policy, 'engine': engine, 'files': files}
+                result = pool.apply(run_cell, (cell,))
+                print(', '.join(f'{key}={result[key]}' for key in RESULT_FIELDS), flush=True)
+                results.append(result)
+
+    with open(args.output + '.json', mode='w') as file:
+        json.dump(results, file, indent=2)
+    with open(args.output + '.csv', mode='w', newline='') as file:
+        result_writer = csv.DictWriter(file, fieldnames=RESULT_FIELDS)
+        result_writer.writeheader()
+        result_writer.writerows(results)
+    print(f'Results are written to {args.output}.json and {args.output}.csv')
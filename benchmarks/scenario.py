@@ -0,0 +1,65 @@
+"""
+Title:          PyCloudSim
+Description:    A Python-based Cloud Simulator
+Author(s):      Mahmoud Momtazpour
+Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
+Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
+"""
+
+import os
+from csv import writer
+
+import numpy as np
+
+from utils.columnar import TRACE_DTYPE, VM_DTYPE
+
+# Host configuration of synthetic datacenters
+HOST_ATTRIBUTES = {'mips': 64, 'ram': 512, 'bw': 10000, 'storage': 0, 'max_power': 195, 'stat_power': 52,
+                   'mips_pr': 0.7, 'ram_pr': 0.26, 'bw_pr': 0.04, 'storage_pr': 0}
+# VM flavors of synthetic workloads as (mips, ram, bw)
+VM_FLAVORS = np.array([(4, 7.5, 80), (8, 15, 160), (16, 30, 320), (2, 3.75, 40)])
+
+
+def write_scenario(directory: str, num_dcs: int, num_hosts: int, num_vms: int, sim_time: int,
+                   mean_duration: int = None, seed: int = 0) -> dict:
+    """Write a synthetic scenario (topology, power traces and workload) in the formats read by the creator
+    :param directory: directory where the files are written
+    :param num_dcs: number of datacenters
+    :param num_hosts: number of hosts of each datacenter
+    :param num_vms: number of VMs of the workload, arriving uniformly over the first half of the simulation
+    :param sim_time: simulation time, which is also the length of the power traces
+    :param mean_duration: mean duration of VMs (sim_time / 8 if not specified)
+    :param seed: seed of the random number generator
+    :return: mapping between the kinds of files (dc_file, pue_file, br_cost_file, solar_file and vm_file) and their
+    paths
+    :rtype: dict<str, str>
+    """
+    rng = np.random.default_rng(seed)
+    os.makedirs(directory, exist_ok=True)
+    files = {name: os.path.join(directory, name.replace('_file', '') + suffix) for name, suffix in
+             (('dc_file', '.csv'), ('pue_file', '.npy'), ('br_cost_file', '.npy'), ('solar_file', '.npy'),
+              ('vm_file', '.npy'))}
+
+    with open(files['dc_file'], mode='w', newline='') as file:
+        dc_writer = writer(file)
+        dc_writer.writerow(['dc_id', 'num_host', *HOST_ATTRIBUTES, 'battery'])
+        for dc_id in range(1, num_dcs + 1):
+            dc_writer.writerow([dc_id, num_hosts, *HOST_ATTRIBUTES.values(), 100 * num_hosts * dc_id])
+
+    # daily cycles with a random phase per datacenter
+    t = np.arange(sim_time) / 86400 * 2 * np.pi
+    phase = rng.uniform(0, 2 * np.pi, size=(num_dcs, 1))
+    np.save(files['pue_file'], (1.3 + 0.1 * np.sin(t + phase)).astype(TRACE_DTYPE))
+    np.save(files['br_cost_file'], (0.1 + 0.05 * np.sin(t + phase + 1)).astype(TRACE_DTYPE))
+    np.save(files['solar_file'], (num_hosts * 20 * np.maximum(np.sin(t + phase), 0)).astype(TRACE_DTYPE))
+
+    vms = np.zeros(num_vms, dtype=VM_DTYPE)
+    vms['vm_id'] = np.arange(1, num_vms + 1)
+    vms['user_id'] = 1
+    flavors = VM_FLAVORS[rng.integers(len(VM_FLAVORS), size=num_vms)]
+    vms['mips'], vms['ram'], vms['bw'] = flavors.T
+    vms['arrival_time'] = np.sort(rng.integers(1, max(sim_time // 2, 2), size=num_vms))
+    mean_duration = mean_duration if mean_duration is not None else sim_time // 8
+    vms['duration'] = rng.integers(60, max(2 * mean_duration - 60, 61), size=num_vms)
+    np.save(files['vm_file'], vms)
+    return files
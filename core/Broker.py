@@ -6,9 +6,13 @@ Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
 Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
 """
 
+from heapq import merge
+from itertools import groupby
 
-from simpy.util import start_delayed
-from utils.logger import log_me
+from core.MessageBus import VmCreateBatchRequest, VmCreateRequest
+from core.SimEngine import ARRIVAL
+from core.VMList import VMList
+from utils.logger import Logger
 
 
 class Broker:
@@ -16,13 +20,18 @@ class Broker:
     on behalf of users
     :ivar _sim_time: simulation time
     :type _sim_time: int
-    :ivar _env: simulation environment
-    :type _env: simpy env
-    :ivar _vm_list: list of VMs
-    :type _vm_list: list[VM]
+    :ivar _env: simulation engine
+    :type _env: SimEngine
+    :ivar _vm_lists: the submitted lists of VMs (a VMList is kept as it is, so its VM instances are only created as
+    they arrive)
+    :type _vm_lists: list[Sequence[VM]]
+    :ivar _vm_sources: time-ordered iterables of VMs that are pulled lazily during the run
+    :type _vm_sources: list[Iterable[VM]]
+    :ivar _arrivals: the pending arrivals of the run, as (arrival time, VMs) pairs
+    :type _arrivals: Iterator[(float, list[VM])]
     :ivar _vms_created_list: list of created VMs
     :type _vms_created_list: list[VM]
-    :ivar _vms_requested: number of VM creation requests
+    :ivar _vms_requested: number of VMs whose creation was requested (a batch request counts each of its VMs)
     :type _vms_requested: int
     :ivar _vms_ack: number of VM creation request acknowledgement
     :type _vms_ack: int
@@ -36,6 +45,12 @@ class Broker:
     :type _vms_datacenter_map: dict<VM, Datacenter>
     :ivar _cloud: the cloud instance that includes all datacenters
     :type _cloud: Cloud
+    :ivar _message_bus: the bus that delivers requests to the cloud
+    :type _message_bus: MessageBus
+    :ivar _batch_arrivals: determines if VMs that arrive at the same time are sent to the cloud as one batch
+    :type _batch_arrivals: bool
+    :ivar _logger: the logger of the simulation
+    :type _logger: Logger
     """
     def __init__(self, cloud):
         """ Constructor
@@ -43,7 +58,9 @@ class Broker:
         """
         self._sim_time = -1
         self._env = None
-        self._vm_list = []
+        self._vm_lists = []
+        self._vm_sources = []
+        self._arrivals = None
         self._vms_created_list = []
         self._vms_requested = 0
         self._vms_ack = 0
@@ -52,43 +69,130 @@ class Broker:
         self._datacenter_requested_ids_list = []
         self._vms_datacenter_map = dict()
         self._cloud = cloud
+        self._message_bus = None
+        self._batch_arrivals = False
+        self._logger = Logger.from_config()
 
     def submit_vm_list(self, vm_list):
         """ Submit the list of VMs to the broker
         :param vm_list: list of VMs
         """
-        self._vm_list.extend(vm_list)
+        self._vm_lists.append(vm_list if isinstance(vm_list, VMList) else list(vm_list))
+
+    def submit_vm_source(self, vm_source):
+        """ Submit a source of VMs to the broker. Unlike submit_vm_list, the source is not materialized: VMs are pulled
+        from it one at a time during the run, so it can be a generator over a very large workload
+        :param vm_source: an iterable of VMs sorted by arrival time
+        """
+        self._vm_sources.append(vm_source)
+
+    def reset(self):
+        """ Return the broker to its initial state, so that the submitted VM list is replayed in the next run. VM
+        sources are consumed by a run, so they are dropped and have to be submitted again
+        """
+        self._sim_time = -1
+        self._env = None
+        self._vm_sources = []
+        self._arrivals = None
+        self._vms_created_list = []
+        self._vms_requested = 0
+        self._vms_ack = 0
+        self._vms_destroyed = 0
+        self._datacenter_requested_ids_list = []
+        self._vms_datacenter_map = dict()
+        vm_tables = set()
+        for vm_list in self._vm_lists:
+            if isinstance(vm_list, VMList):
+                vm_tables.add(vm_list.get_table())
+            else:
+                vm_tables.update(vm.get_table() for vm in vm_list)
+        for vm_table in vm_tables:
+            vm_table.reset_allocations()
+
+    def _get_arrivals(self):
+        """ Merge the submitted VM lists and VM sources into a single lazy stream ordered by arrival time. VMs that
+        arrive at the same time keep the order of their lists, and of the VMs within each list
+        :return: an iterator over all submitted VMs in order of arrival
+        :rtype: Iterator[VM]
+        """
+        sources = [vm_list.iter_by_arrival() if isinstance(vm_list, VMList) else
+                   sorted(vm_list, key=lambda obj: obj.get_arrival_time()) for vm_list in self._vm_lists if vm_list]
+        sources.extend(self._vm_sources)
+        if len(sources) == 1:
+            return iter(sources[0])
+        return merge(*sources, key=lambda obj: obj.get_arrival_time())
 
     def start_run(self, env, sim_time):
-        """Start the broker event processor
-        :param env: the simulation environment
+        """Start the broker. Arrivals are pulled lazily from the submitted VMs, so only the event of the next arrival
+        is pending in the simulation engine, no matter how large the workload is
+        :param env: the simulation engine
         :param sim_time: the simulation duration
         """
         self._env = env
         self._sim_time = sim_time
-        log_me('INFO', int(env.now), 'Broker', 'Started')
-        vm_list = sorted(self._vm_list, key=lambda obj: obj.get_arrival_time())
-        for vm in vm_list:
-            vm_delay = vm.get_arrival_time() - env.now
-            assert(vm_delay >= 0)
-            request = {'dest': 'cloud', 'type': 'vm_create', 'vm': vm}
-            if vm_delay == 0:
-                # TODO maybe sending interrupt be better than creating process
-                yield env.process(self.send_request(request))
-            else:
-                yield start_delayed(env, self.send_request(request), delay=vm_delay)
-        log_me('INFO', int(env.now), 'Broker', 'Stopped')
+        self._logger.log_me('INFO', int(env.now), 'Broker', 'Started')
+        if self._batch_arrivals:
+            # VMs that arrive at the same time are sent to the cloud together
+            self._arrivals = ((arrival_time, list(vms)) for arrival_time, vms in
+                              groupby(self._get_arrivals(), key=lambda obj: obj.get_arrival_time()))
+        else:
+            self._arrivals = ((vm.get_arrival_time(), [vm]) for vm in self._get_arrivals())
+        self._schedule_next_arrival()
+
+    def _schedule_next_arrival(self):
+        arrival = next(self._arrivals, None)
+        if arrival is None:
+            self._logger.log_me('INFO', int(self._env.now), 'Broker', 'Stopped')
+            return
+        vm_delay = arrival[0] - self._env.now
+        if vm_delay < 0:
+            raise ValueError('VMs should be submitted in order of their arrival time.')
+        # a zero delay still lets the events already due at this time (e.g. VM destructions) be processed first
+        self._env.schedule(vm_delay, ARRIVAL, arrival[1])
+
+    def process_arrival(self, vms):
+        """ Send the creation requests of VMs that arrive now to the cloud, and schedule the next arrival
+        :param vms: list of VMs that arrive at the same time
+        """
+        if len(vms) == 1:
+            self.send_request(VmCreateRequest(vms[0]))
+        else:
+            self.send_request(VmCreateBatchRequest(vms))
+        self._schedule_next_arrival()
 
     def send_request(self, request):
         """ Sending request (VM creation, etc.) to Cloud/Datacenters
-        :param request:  a dictionary containing the request type, destination, etc.
+        :param request: a request message, i.e. VmCreateRequest or VmCreateBatchRequest
+        :return: the result of processing the request
         """
-        if request['type'] == 'vm_create' and request['dest'] == 'cloud':
-            vm = request['vm']
-            log_me('INFO', int(self._env.now), 'Broker', 'VM creation request sent to cloud', vm_id=vm.get_id())
-            yield self._env.process(self._cloud.process_vm_create(vm))
+        vms = request.vms if isinstance(request, VmCreateBatchRequest) else [request.vm]
+        self._vms_requested += len(vms)
+        for vm in vms:
+            self._logger.log_me('INFO', int(self._env.now), 'Broker', 'VM creation request sent to cloud',
+                                vm_id=vm.get_id())
+        return self._message_bus.send(request)
 
     def process_ack(self, ack):
         # Todo: should do somthing with the ack, for example count created/not created VMs
-        log_me(ack['kind'], int(self._env.now), 'Broker', ack['message'], vm_id=ack['vm_id'])
-        yield self._env.timeout(0)
+        self._logger.log_me(ack.kind, int(self._env.now), 'Broker', ack.message, vm_id=ack.vm_id)
+
+    def get_message_bus(self):
+        return self._message_bus
+
+    def set_message_bus(self, message_bus):
+        self._message_bus = message_bus
+
+    def get_vms_requested(self):
+        return self._vms_requested
+
+    def get_batch_arrivals(self):
+        return self._batch_arrivals
+
+    def set_batch_arrivals(self, batch_arrivals):
+        self._batch_arrivals = batch_arrivals
+
+    def get_logger(self):
+        return self._logger
+
+    def set_logger(self, logger):
+        self._logger = logger
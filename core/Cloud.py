@@ -6,14 +6,15 @@ Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
 Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
 """
 
-from utils.logger import log_me
+from core.MessageBus import VmCreateAck
+from utils.logger import Logger
 
 
 class Cloud:
     """ Cloud class definition: It is responsible for managing datacenter selection for incoming VMs via its
     datacenter selection policy
-    :ivar _env: simulation environment
-    :type _env: simpy env
+    :ivar _env: simulation engine
+    :type _env: SimEngine
     :ivar _sim_time: simulation duration
     :type _sim_time: int
     :ivar _cloud_id: id of this cloud
@@ -24,6 +25,12 @@ class Cloud:
     :type _dc_list: list[Datacenter]
     :ivar _broker: an instance of the Broker class
     :type _broker: Broker
+    :ivar _message_bus: the bus that delivers messages to the broker and datacenters
+    :type _message_bus: MessageBus
+    :ivar _logger: the logger of the simulation
+    :type _logger: Logger
+    :ivar _metrics: the recorder of the results of the simulation (None if results are not recorded)
+    :type _metrics: MetricsRecorder
     """
 
     def __init__(self, cloud_attributes, dc_list, dc_selection_policy):
@@ -33,6 +40,9 @@ class Cloud:
         self._dc_selection_policy = dc_selection_policy
         self._dc_list = dc_list
         self._broker = None
+        self._message_bus = None
+        self._logger = Logger.from_config()
+        self._metrics = None
         self._dc_tried = 0
         if not dc_list:
             raise ValueError('The Cloud has no Datacenter in its DatacenterList.')
@@ -42,40 +52,143 @@ class Cloud:
     def start_run(self, env, sim_time):
         self._env = env
         self._sim_time = sim_time
-        log_me('INFO', int(env.now), 'Cloud', 'Started')
-        yield env.timeout(0)
+        self._logger.log_me('INFO', int(env.now), 'Cloud', 'Started')
+
+    def reset(self):
+        """ Return the cloud, its datacenters and its datacenter selection policy to their initial state, so that they
+        can be reused for another run """
+        self._env = None
+        self._sim_time = -1
+        self._dc_tried = 0
+        for dc in self._dc_list:
+            dc.reset()
+        self._dc_selection_policy.reset()
 
     def get_dc_list(self):
         return self._dc_list
 
+    def get_dc_selection_policy(self):
+        return self._dc_selection_policy
+
     def process_vm_create(self, vm):
-        log_me('INFO', int(self._env.now), 'Cloud', 'VM creation request received', vm_id=vm.get_id())
-        self._dc_tried = 0
+        self._logger.log_me('INFO', int(self._env.now), 'Cloud', 'VM creation request received', vm_id=vm.get_id())
+        status = self._place_vm(vm)
+        if not status:
+            self._reject_vm(vm)
+        return status
+
+    def process_vm_create_batch(self, vms):
+        """ Process the creation requests of VMs that arrive at the same time. If the selection policy can choose
+        datacenters for the whole batch at once, each datacenter receives its VMs in a single batch and the outcome of
+        each selection is then reported to the policy in the order of the VMs; VMs rejected by their datacenter go on
+        to the next datacenters chosen by the policy, as they would if they were placed one by one. Otherwise, the VMs
+        are placed one by one within a batch of the policy (see DCSelectionPolicy.start_batch)
+        :param vms: list of VMs
+        :return: number of created VMs
+        :rtype: int
+        """
+        for vm in vms:
+            self._logger.log_me('INFO', int(self._env.now), 'Cloud', 'VM creation request received', vm_id=vm.get_id())
+        selected_dcs = self._dc_selection_policy.select_dc_for_vms(vms)
+        if selected_dcs is None:
+            self._dc_selection_policy.start_batch(vms)
+            placed = [self._place_vm(vm) for vm in vms]
+            self._dc_selection_policy.end_batch()
+        else:
+            dc_vms = dict()
+            for vm, dc in zip(vms, selected_dcs):
+                self._logger.log_me('INFO', int(self._env.now), 'Cloud', 'VM sent to datacenter', vm_id=vm.get_id(),
+                                    dc_id=dc.get_id())
+                dc_vms.setdefault(dc, []).append(vm)
+            created = dict()
+            for dc, batch in dc_vms.items():
+                created.update(zip(map(id, batch), dc.process_vm_create_batch(batch)))
+            placed = []
+            for vm in vms:
+                if created[id(vm)]:
+                    self._dc_selection_policy.accept_selection()
+                    placed.append(True)
+                else:
+                    self._dc_selection_policy.reject_selection()
+                    placed.append(self._place_vm(vm, dc_tried=1))
+        num_rejected = 0
+        for vm, status in zip(vms, placed):
+            if not status:
+                self._reject_vm(vm)
+                num_rejected += 1
+        return len(vms) - num_rejected
+
+    def _place_vm(self, vm, dc_tried=0):
+        """ Try datacenters chosen by the selection policy one by one until one of them creates the VM
+        :param vm: an instance of the VM class
+        :param dc_tried: number of datacenters that have already rejected the VM
+        :return: True if the VM is created, False if all datacenters rejected it
+        :rtype: bool
+        """
+        self._dc_tried = dc_tried
         while self._dc_tried < len(self._dc_list):
             dc = self._dc_selection_policy.select_dc_for_vm(vm)
-            log_me('INFO', int(self._env.now), 'Cloud', 'VM sent to datacenter', vm_id=vm.get_id(), dc_id=dc.get_id())
+            self._logger.log_me('INFO', int(self._env.now), 'Cloud', 'VM sent to datacenter', vm_id=vm.get_id(),
+                                dc_id=dc.get_id())
             status = dc.process_vm_create(vm)
             if status:
                 self._dc_selection_policy.accept_selection()
-                break
+                return True
             else:
                 self._dc_selection_policy.reject_selection()
                 self._dc_tried = self._dc_tried + 1
-        if self._dc_tried == len(self._dc_list):
-            log_me('WARN', int(self._env.now), 'Cloud', 'VM not created on any datacenter', vm_id=vm.get_id())
-            ack = {'type': 'vm_create', 'dest': 'broker', 'vm_id': vm.get_id(),
-                   'message': f'VM creation request rejected', 'kind': 'WARN'}
-            yield self._env.process(self.send_ack(ack))
-        yield self._env.timeout(0)
+        self._logger.log_me('WARN', int(self._env.now), 'Cloud', 'VM not created on any datacenter', vm_id=vm.get_id())
+        return False
+
+    def _reject_vm(self, vm):
+        if self._metrics is not None:
+            self._metrics.record_rejection(int(self._env.now), vm.get_id())
+        self.send_ack(self._get_reject_ack(vm))
+
+    @staticmethod
+    def _get_reject_ack(vm):
+        return VmCreateAck(vm_id=vm.get_id(), message=f'VM creation request rejected', kind='WARN')
 
     def process_ack(self, ack):
-        log_me(ack['kind'], int(self._env.now), 'Cloud', ack["message"])
-        yield self._env.timeout(0)
+        self._logger.log_me(ack.kind, int(self._env.now), 'Cloud', ack.message)
 
     def send_ack(self, ack):
-        if ack['dest'] == 'broker':
-            yield self._env.process(self._broker.process_ack(ack))
-        yield self._env.timeout(0)
+        self._message_bus.send(ack)
 
     def set_broker(self, broker):
         self._broker = broker
+
+    def get_message_bus(self):
+        return self._message_bus
+
+    def set_message_bus(self, message_bus):
+        """ Set the message bus of the cloud and its datacenters
+        :param message_bus: an instance of the MessageBus class
+        """
+        self._message_bus = message_bus
+        for dc in self._dc_list:
+            dc.set_message_bus(message_bus)
+
+    def get_logger(self):
+        return self._logger
+
+    def set_logger(self, logger):
+        """ Set the logger of the cloud, its datacenters and its datacenter selection policy
+        :param logger: an instance of the Logger class
+        """
+        self._logger = logger
+        for dc in self._dc_list:
+            dc.set_logger(logger)
+        self._dc_selection_policy.set_logger(logger)
+
+    def get_metrics(self):
+        return self._metrics
+
+    def set_metrics(self, metrics):
+        """ Set the recorder of the results of the cloud, its datacenters and its datacenter selection policy
+        :param metrics: an instance of the MetricsRecorder class, or None to stop recording
+        """
+        self._metrics = metrics
+        for dc in self._dc_list:
+            dc.set_metrics(metrics)
+        self._dc_selection_policy.set_metrics(metrics)
@@ -6,9 +6,8 @@ Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
 Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
 """
 
-import simpy
-from simpy.util import start_delayed
-from utils.logger import log_me
+from core.MessageBus import VmDestroyRequest
+from utils.logger import Logger
 
 
 class Datacenter:
@@ -16,8 +15,8 @@ class Datacenter:
     created VMs via its VM allocation policy, and VM destruction when VM lifetime ends
     :ivar _sim_time: simulation time
     :type _sim_time: int
-    :ivar _env: simulation environment
-    :type _env: simpy env
+    :ivar _env: simulation engine
+    :type _env: SimEngine
     :ivar _arch: host architecture
     :type _arch: str
     :ivar _os: host os
@@ -48,6 +47,12 @@ class Datacenter:
     :type _host_list: list[Host]
     :ivar _cloud: an instance of Cloud
     :type _cloud: Cloud
+    :ivar _message_bus: the bus that delivers the destroy requests of VMs when their lifetime ends
+    :type _message_bus: MessageBus
+    :ivar _logger: the logger of the simulation
+    :type _logger: Logger
+    :ivar _metrics: the recorder of the results of the simulation (None if results are not recorded)
+    :type _metrics: MetricsRecorder
     """
 
     def __init__(self, dc_id, datacenter_attributes, vm_allocation_policy, host_list):
@@ -65,6 +70,9 @@ class Datacenter:
         self._vm_list = []
         self._host_list = host_list
         self._cloud = None
+        self._message_bus = None
+        self._logger = Logger.from_config()
+        self._metrics = None
         if not host_list:
             # logging.error('The Data center has no Host in its HostList.')
             raise ValueError('The Data center has no Host in its HostList')
@@ -74,14 +82,32 @@ class Datacenter:
     def start_run(self, env, sim_time):
         self._env = env
         self._sim_time = sim_time
-        log_me('INFO', int(env.now), 'Datacenter', 'Started',
-               dc_id=self._datacenter_id)
-        yield env.timeout(0)
+        self._logger.log_me('INFO', int(env.now), 'Datacenter', 'Started',
+                            dc_id=self._datacenter_id)
 
     def set_cloud(self, cloud):
         self._cloud = cloud
 
+    def get_message_bus(self):
+        return self._message_bus
+
+    def set_message_bus(self, message_bus):
+        self._message_bus = message_bus
+
+    def get_logger(self):
+        return self._logger
+
+    def set_logger(self, logger):
+        self._logger = logger
+
+    def get_metrics(self):
+        return self._metrics
+
+    def set_metrics(self, metrics):
+        self._metrics = metrics
+
     def run(self):
+        import simpy
         while True:
             try:
                 # logging.info('dc running')
@@ -92,22 +118,47 @@ class Datacenter:
                 break
 
     def process_vm_create(self, vm):
-        log_me('INFO', int(self._env.now), 'Datacenter', 'VM creation request received', vm.get_id(), self._datacenter_id)
-        result = self._vm_allocation_policy.allocate_host_for_vm(vm)
+        self._logger.log_me('INFO', int(self._env.now), 'Datacenter', 'VM creation request received', vm.get_id(),
+                            self._datacenter_id)
+        return self._create_vm(vm)
+
+    def _create_vm(self, vm):
+        result = self.may_host_vm(vm) and self._vm_allocation_policy.allocate_host_for_vm(vm)
         if result:
-            start_delayed(self._env, self.process_vm_destroy(vm), delay=vm.get_duration())
+            self._message_bus.send_delayed(VmDestroyRequest(vm, self), vm.get_duration())
             self._vm_list.append(vm.get_vm_uid())
-            log_me('INFO', int(self._env.now), 'Datacenter', 'VM created and allocated', vm.get_id(), self._datacenter_id, vm.get_host().get_id())
+            self._logger.log_me('INFO', int(self._env.now), 'Datacenter', 'VM created and allocated', vm.get_id(),
+                                self._datacenter_id, vm.get_host().get_id())
         else:
-            log_me('WARN', int(self._env.now), 'Datacenter', 'VM not created', vm.get_id(), self._datacenter_id)
+            self._logger.log_me('WARN', int(self._env.now), 'Datacenter', 'VM not created', vm.get_id(),
+                                self._datacenter_id)
         return result
 
+    def process_vm_create_batch(self, vms):
+        """ Process the creation requests of VMs that arrive at the same time in a single pass
+        :param vms: list of VMs
+        :return: for each VM, True if it is created and False otherwise
+        :rtype: list[bool]
+        """
+        for vm in vms:
+            self._logger.log_me('INFO', int(self._env.now), 'Datacenter', 'VM creation request received', vm.get_id(),
+                                self._datacenter_id)
+        return [self._create_vm(vm) for vm in vms]
+
     def process_vm_destroy(self, vm):
-        log_me('INFO', int(self._env.now), 'Datacenter', 'VM destroy request received', vm.get_id(), self._datacenter_id)
+        self._logger.log_me('INFO', int(self._env.now), 'Datacenter', 'VM destroy request received', vm.get_id(),
+                            self._datacenter_id)
         self._vm_allocation_policy.deallocate_host_for_vm(vm)
         self._vm_list.remove(vm.get_vm_uid())
-        log_me('INFO', int(self._env.now), 'Datacenter', 'VM destroyed', vm.get_id(), self._datacenter_id)
-        yield self._env.timeout(0)
+        self._logger.log_me('INFO', int(self._env.now), 'Datacenter', 'VM destroyed', vm.get_id(), self._datacenter_id)
+
+    def reset(self):
+        """ Return the datacenter to its initial state (no VMs on its hosts), so that it can be reused for another run
+        """
+        self._env = None
+        self._sim_time = None
+        self._vm_list = []
+        self._vm_allocation_policy.reset()
 
     def send_ack(self, ack):
         pass
@@ -116,7 +167,21 @@ class Datacenter:
         return self._datacenter_id
 
     def is_suitable_for_vm(self, vm):
-        for h in self._host_list:
-            if h.is_suitable_for_vm(vm):
-                return True
-        return False
+        return self.may_host_vm(vm) and self._vm_allocation_policy.get_capacity_index().first_fit(vm) >= 0
+
+    def may_host_vm(self, vm):
+        """ Check in O(1) against the capacity summary of the datacenter if a given VM may fit on one of its hosts
+        :param vm: an instance of the VM class
+        :return: False if no host is suitable for the VM, True otherwise
+        :rtype: bool
+        """
+        return self._vm_allocation_policy.get_capacity_index().may_fit(vm)
+
+    def get_capacity_summary(self):
+        """ Get the capacity summary of the datacenter
+        :return: the maximum available (mips, ram, bw, storage) on any host and the total available
+        (mips, ram, bw, storage) over all hosts
+        :rtype: tuple(list[float], list[float])
+        """
+        capacity_index = self._vm_allocation_policy.get_capacity_index()
+        return capacity_index.get_max_available(), capacity_index.get_total_available()
@@ -0,0 +1,75 @@
+"""
+Title:          PyCloudSim
+Description:    A Python-based Cloud Simulator
+Author(s):      Mahmoud Momtazpour
+Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
+Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
+"""
+
+from collections import namedtuple
+
+from core.SimEngine import MESSAGE
+
+# Messages exchanged between the broker, the cloud and datacenters
+VmCreateRequest = namedtuple('VmCreateRequest', ['vm'])
+VmCreateBatchRequest = namedtuple('VmCreateBatchRequest', ['vms'])
+VmCreateAck = namedtuple('VmCreateAck', ['vm_id', 'message', 'kind'])
+VmDestroyRequest = namedtuple('VmDestroyRequest', ['vm', 'datacenter'])
+
+
+class MessageBus:
+    """ MessageBus class definition: It delivers typed messages between simulation entities. Messages that take no
+    simulated time are delivered by calling the handler of their type directly, and only delayed messages are turned
+    into (a single) event of the simulation engine. It also counts the delivered messages of each type
+    :ivar _env: simulation engine
+    :type _env: SimEngine
+    :ivar _handlers: mapping between message types and their handlers
+    :type _handlers: dict<type, callable>
+    :ivar _counts: number of delivered messages of each type
+    :type _counts: dict<type, int>
+    """
+    def __init__(self, env=None):
+        self._env = env
+        self._handlers = dict()
+        self._counts = dict()
+
+    def subscribe(self, message_type, handler):
+        """ Set the handler of a message type
+        :param message_type: the type of messages, e.g. VmCreateRequest
+        :param handler: a callable that receives the message and returns the result of its processing
+        """
+        self._handlers[message_type] = handler
+        self._counts.setdefault(message_type, 0)
+
+    def send(self, message):
+        """ Deliver a message immediately
+        :param message: the message
+        :return: the result of the handler
+        :raise: raises KeyError if no handler is subscribed to the type of the message
+        """
+        message_type = type(message)
+        self._counts[message_type] += 1
+        return self._handlers[message_type](message)
+
+    def send_delayed(self, message, delay):
+        """ Deliver a message after a given simulated delay
+        :param message: the message
+        :param delay: the delay
+        """
+        self._env.schedule(delay, MESSAGE, message)
+
+    def get_counts(self):
+        """ Get the number of delivered messages of each type
+        :return: mapping between names of message types and their number of delivered messages
+        :rtype: dict<str, int>
+        """
+        return {message_type.__name__: count for message_type, count in self._counts.items()}
+
+    def reset_counts(self):
+        self._counts = dict.fromkeys(self._counts, 0)
+
+    def get_env(self):
+        return self._env
+
+    def set_env(self, env):
+        self._env = env
@@ -0,0 +1,91 @@
+"""
+Title:          PyCloudSim
+Description:    A Python-based Cloud Simulator
+Author(s):      Mahmoud Momtazpour
+Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
+Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
+"""
+
+from dataclasses import dataclass, field, fields, replace
+from types import MappingProxyType
+
+from Config import Config as conf
+
+
+@dataclass(frozen=True)
+class SimConfig:
+    """ SimConfig class definition: The configuration of one simulation. It is resolved once (by default from the
+    global Config class) and bound to the simulation entities when they are created, so that differently configured
+    simulations can coexist in one process
+    :ivar sim_time: simulation time
+    :type sim_time: int
+    :ivar sim_engine: name of the simulation engine ('SimPy' or 'Fast')
+    :type sim_engine: str
+    :ivar enable_log: determines if logging is enabled
+    :type enable_log: bool
+    :ivar verbose: determines if INFO and DEBUG messages are logged
+    :type verbose: bool
+    :ivar batch_arrivals: determines if VMs that arrive at the same time are sent to the cloud as one batch
+    :type batch_arrivals: bool
+    :ivar dc_selection_policy: name of the DC selection policy
+    :type dc_selection_policy: str
+    :ivar vm_allocation_policy: name of the VM allocation policy
+    :type vm_allocation_policy: str
+    :ivar dc_attributes: attributes of datacenters (arch, os, vmm, time_zone and costs), a read-only copy of the given
+    mapping
+    :type dc_attributes: MappingProxyType
+    :ivar consolidation: determines if idle hosts are switched off (i.e. consume no static power)
+    :type consolidation: bool
+    :ivar eps: tolerance of utilization bounds
+    :type eps: float
+    :ivar vm_chunk_size: number of VM rows parsed at once when streaming the workload
+    :type vm_chunk_size: int
+    :ivar ppo_policy_file: policy exported by rl_main.py (.npz), evaluated with NumPy when no agent is given
+    :type ppo_policy_file: str
+    :ivar record_metrics: determines if the results of the simulation are recorded in a MetricsRecorder
+    :type record_metrics: bool
+    """
+    sim_time: int = 10000
+    sim_engine: str = 'SimPy'
+    enable_log: bool = True
+    verbose: bool = False
+    batch_arrivals: bool = False
+    dc_selection_policy: str = 'FirstFit'
+    vm_allocation_policy: str = 'FirstFit'
+    dc_attributes: MappingProxyType = field(default_factory=dict)
+    consolidation: bool = True
+    eps: float = 1e-3
+    vm_chunk_size: int = 10000
+    ppo_policy_file: str = None
+    record_metrics: bool = True
+
+    def __post_init__(self):
+        # a copy, so that neither the given mapping nor the configuration can change the other
+        object.__setattr__(self, 'dc_attributes', MappingProxyType(dict(self.dc_attributes)))
+
+    def __getstate__(self):
+        # mapping proxies cannot be pickled, e.g. to send the configuration to another process
+        return {**self.__dict__, 'dc_attributes': dict(self.dc_attributes)}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__post_init__()
+
+    @classmethod
+    def from_config(cls, **overrides):
+        """ Resolve the configuration from the current values of the global Config class
+        :param overrides: values that replace those of the Config class, e.g. enable_log=False
+        :return: the configuration
+        :rtype: SimConfig
+        """
+        values = {f.name: getattr(conf, f.name) for f in fields(cls) if hasattr(conf, f.name)}
+        values.update(overrides)
+        return cls(**values)
+
+    def replace(self, **changes):
+        """ Get a copy of the configuration with some values changed
+        :param changes: the changed values
+        :return: the new configuration
+        :rtype: SimConfig
+        """
+        return replace(self, **changes)
@@ -0,0 +1,57 @@
+"""
+Title:          PyCloudSim
+Description:    A Python-based Cloud Simulator
+Author(s):      Mahmoud Momtazpour
+Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
+Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
+"""
+
+from abc import ABC, abstractmethod
+
+# Kinds of events: arrival of VMs at the broker and delivery of a delayed message (e.g. destruction of a VM)
+ARRIVAL, MESSAGE = 0, 1
+
+
+class SimEngine(ABC):
+    """ SimEngine class definition: It is the discrete-event kernel that advances the simulation time. Events are
+    typed (time, kind, payload) records that are delivered to the handler of their kind; events due at the same time
+    are delivered in the order they were scheduled
+    :ivar _handlers: mapping between kinds of events and their handlers
+    :type _handlers: dict<int, callable>
+    :ivar _num_events: number of delivered events
+    :type _num_events: int
+    """
+    def __init__(self):
+        self._handlers = dict()
+        self._num_events = 0
+
+    @property
+    @abstractmethod
+    def now(self):
+        pass
+
+    def subscribe(self, kind, handler):
+        """ Set the handler of a kind of events
+        :param kind: the kind of events, e.g. ARRIVAL
+        :param handler: a callable that receives the payload of the events
+        """
+        self._handlers[kind] = handler
+
+    @abstractmethod
+    def schedule(self, delay, kind, payload):
+        """ Schedule an event
+        :param delay: the delay from now (non-negative)
+        :param kind: the kind of the event
+        :param payload: the payload that is passed to the handler of the event
+        """
+        pass
+
+    @abstractmethod
+    def run(self, until):
+        """ Deliver all events that are due before a given time, and advance the time to it
+        :param until: the end of the simulation
+        """
+        pass
+
+    def get_num_events(self):
+        return self._num_events
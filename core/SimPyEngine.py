@@ -0,0 +1,40 @@
+"""
+Title:          PyCloudSim
+Description:    A Python-based Cloud Simulator
+Author(s):      Mahmoud Momtazpour
+Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
+Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
+"""
+
+import simpy
+
+from core.SimEngine import SimEngine
+
+
+class SimPyEngine(SimEngine):
+    """ SimPyEngine class definition: It is the reference engine, which delivers each event through a timeout of a
+    SimPy environment. Other SimPy processes can be added to the environment
+    :ivar _env: simulation environment
+    :type _env: simpy env
+    """
+    def __init__(self):
+        super().__init__()
+        self._env = simpy.Environment()
+
+    @property
+    def now(self):
+        return self._env.now
+
+    def schedule(self, delay, kind, payload):
+        self._env.timeout(delay, value=(kind, payload)).callbacks.append(self._dispatch)
+
+    def _dispatch(self, event):
+        kind, payload = event.value
+        self._num_events += 1
+        self._handlers[kind](payload)
+
+    def run(self, until):
+        self._env.run(until=until)
+
+    def get_env(self):
+        return self._env
@@ -7,129 +7,136 @@ Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
 """
 
 
+from core.VMTable import VMTable
+
+
 class VM:
     """ A VM (Virtual Machine) is an entity that runs inside a host, and consumes its resources
-    (mips, ram, bw and storage)
-    :ivar _vm_id: id of VM
-    :type _vm_id: int
-    :ivar _user_id: id of the user that submitted this VM
-    :type _user_id: int
-    :ivar _vm_uid: a unique id of VM that is generated by concatenating vm_id and user_id
-    :type _vm_uid: str
-    :ivar _mips: VM requested mips
-    :type _mips: int
-    :ivar _ram: VM requested ram
-    :type _ram: int
-    :ivar _storage: VM requested storage
-    :type _storage: int
-    :ivar _bw: VM requested bandwidth
-    :type _bw: int
-    :ivar _current_allocated_mips: VM allocated mips
-    :type _current_allocated_mips: int
-    :ivar _current_allocated_ram: VM allocated ram
-    :type _current_allocated_ram: int
-    :ivar _current_allocated_storage: VM allocated storage
-    :type _current_allocated_storage: int
-    :ivar _current_allocated_bw: VM allocated bandwidth
-    :type _current_allocated_bw: int
-    :ivar _arrival_time: arrival time of VM
-    :type _arrival_time: int
-    :ivar _duration: duration of VM
-    :type _duration: int
-    :ivar _host: the host that the VM allocated to
-    :type _host: Host
+    (mips, ram, bw and storage). A VM is a thin view over a row of a VMTable, which stores the attributes below in
+    typed columns. Views over the same row are equal and have the same hash, so any view of a VM can stand for it
+    :ivar _table: the table that stores the attributes of this VM
+    :type _table: VMTable
+    :ivar _row: the row of this VM in the table
+    :type _row: int
+    :cvar vm_id: id of VM
+    :cvar user_id: id of the user that submitted this VM
+    :cvar mips: VM requested mips
+    :cvar ram: VM requested ram
+    :cvar storage: VM requested storage
+    :cvar bw: VM requested bandwidth
+    :cvar current_allocated_mips: VM allocated mips
+    :cvar current_allocated_ram: VM allocated ram
+    :cvar current_allocated_storage: VM allocated storage
+    :cvar current_allocated_bw: VM allocated bandwidth
+    :cvar arrival_time: arrival time of VM
+    :cvar duration: duration of VM
+    :cvar host: the host that the VM allocated to
     """
-    def __init__(self, vm_id, user_id, mips, ram, bw, storage, arrival_time, duration):
-        self._vm_id = vm_id
-        self._user_id = user_id
-        self._vm_uid = str(user_id) + '-' + str(vm_id)
-        self._mips = mips
-        self._ram = ram
-        self._bw = bw
-        self._storage = storage
-        self._arrival_time = arrival_time
-        self._duration = duration
-        self._current_allocated_bw = 0
-        self._current_allocated_mips = 0
-        self._current_allocated_ram = 0
-        self._current_allocated_storage = 0
-        self._host = None
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, vm_id, user_id, mips, ram, bw, storage, arrival_time, duration, table=None):
+        self._table = table if table is not None else VMTable.get_default()
+        self._row = self._table.add_vm(vm_id, user_id, mips, ram, bw, storage, arrival_time, duration)
+
+    @classmethod
+    def from_row(cls, table, row):
+        """ Create a VM that is a view over an existing row of a table
+        :param table: the table that stores the attributes of the VM
+        :param row: the row of the VM in the table
+        :return: the VM
+        :rtype: VM
+        """
+        vm = cls.__new__(cls)
+        vm._table = table
+        vm._row = row
+        return vm
+
+    def __eq__(self, other):
+        # views are created on demand, so two views of the same row are the same VM
+        if not isinstance(other, VM):
+            return NotImplemented
+        return self._table is other._table and self._row == other._row
+
+    def __hash__(self):
+        return hash(self._table._uid_offset + self._row)
 
     def get_id(self):
-        return self._vm_id
+        return self._table._vm_id[self._row]
 
     def set_id(self, vm_id):
-        self._vm_id = vm_id
+        self._table._vm_id[self._row] = vm_id
 
     def get_vm_uid(self):
-        return self._vm_uid
+        return self._table._uid_offset + self._row
 
-    def set_vm_uid(self, uid):
-        self._vm_uid = uid
+    def get_row(self):
+        return self._row
 
     def get_user_id(self):
-        return self._user_id
+        return self._table._user_id[self._row]
 
     def set_user_id(self, user_id):
-        self._user_id = user_id
+        self._table._user_id[self._row] = user_id
 
     def get_mips(self):
-        return self._mips
+        return self._table._mips[self._row]
 
     def set_mips(self, mips):
-        self._mips = mips
+        self._table._mips[self._row] = mips
 
     def get_ram(self):
-        return self._ram
+        return self._table._ram[self._row]
 
     def set_ram(self, ram):
-        self._ram = ram
+        self._table._ram[self._row] = ram
 
     def get_bw(self):
-        return self._bw
+        return self._table._bw[self._row]
 
     def set_bw(self, bw):
-        self._bw = bw
+        self._table._bw[self._row] = bw
 
     def get_storage(self):
-        return self._storage
+        return self._table._storage[self._row]
 
     def set_storage(self, storage):
-        self._storage = storage
+        self._table._storage[self._row] = storage
 
     def get_current_allocated_bw(self):
-        return self._current_allocated_bw
+        return self._table._allocated_bw[self._row]
 
     def set_current_allocated_bw(self, current_allocated_bw):
-        self._current_allocated_bw = current_allocated_bw
+        self._table._allocated_bw[self._row] = current_allocated_bw
 
     def get_current_allocated_mips(self):
-        return self._current_allocated_mips
+        return self._table._allocated_mips[self._row]
 
     def set_current_allocated_mips(self, current_allocated_mips):
-        self._current_allocated_mips = current_allocated_mips
+        self._table._allocated_mips[self._row] = current_allocated_mips
 
     def get_current_allocated_ram(self):
-        return self._current_allocated_ram
+        return self._table._allocated_ram[self._row]
 
     def set_current_allocated_ram(self, current_allocated_ram):
-        self._current_allocated_ram = current_allocated_ram
+        self._table._allocated_ram[self._row] = current_allocated_ram
 
     def get_current_allocated_storage(self):
-        return self._current_allocated_storage
+        return self._table._allocated_storage[self._row]
 
     def set_current_allocated_storage(self, current_allocated_storage):
-        self._current_allocated_storage = current_allocated_storage
+        self._table._allocated_storage[self._row] = current_allocated_storage
 
     def get_host(self):
-        return self._host
+        return self._table.get_host(self._table._host[self._row])
 
     def set_host(self, host):
-        self._host = host
+        self._table._host[self._row] = self._table.get_host_index(host) if host is not None else -1
 
     def get_arrival_time(self):
-        return self._arrival_time
+        return self._table._arrival_time[self._row]
 
     def get_duration(self):
-        return self._duration
+        return self._table._duration[self._row]
 
+    def get_table(self):
+        return self._table
@@ -0,0 +1,62 @@
+"""
+Title:          PyCloudSim
+Description:    A Python-based Cloud Simulator
+Author(s):      Mahmoud Momtazpour
+Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
+Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+
+from core.VM import VM
+
+
+class VMList(Sequence):
+    """ VMList class definition: It is a read-only list of the VMs stored in a range of rows of a VMTable. It only
+    keeps the table and the range, and a VM instance (a view over a row) is created each time a VM is accessed, so a
+    workload costs no more memory than its table however many VMs it has
+    :ivar _table: the table that stores the VMs
+    :type _table: VMTable
+    :ivar _rows: the rows of the VMs in the table
+    :type _rows: range
+    """
+    def __init__(self, table, rows=None):
+        """ Constructor
+        :param table: the table that stores the VMs
+        :param rows: the rows of the VMs (all rows of the table if not specified)
+        """
+        self._table = table
+        self._rows = rows if rows is not None else range(table.get_num_vms())
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return VMList(self._table, self._rows[index])
+        return VM.from_row(self._table, self._rows[index])
+
+    def __iter__(self):
+        table = self._table
+        for row in self._rows:
+            yield VM.from_row(table, row)
+
+    def get_table(self):
+        return self._table
+
+    def get_rows(self):
+        return self._rows
+
+    def iter_by_arrival(self):
+        """ Iterate over the VMs in order of their arrival time (VMs that arrive at the same time keep their order).
+        Only the order of the rows is computed up front, and the VM instances are created as they are reached
+        :return: an iterator over the VMs in order of arrival time
+        :rtype: Iterator[VM]
+        """
+        rows = self._rows
+        table = self._table
+        arrival_time = table.get_column('arrival_time')[np.arange(rows.start, rows.stop, rows.step)]
+        for i in np.argsort(arrival_time, kind='stable'):
+            yield VM.from_row(table, rows[i])
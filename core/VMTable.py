@@ -0,0 +1,235 @@
+"""
+Title:          PyCloudSim
+Description:    A Python-based Cloud Simulator
+Author(s):      Mahmoud Momtazpour
+Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
+Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
+"""
+
+from array import array
+
+import numpy as np
+
+
+class VMTable:
+    """ VMTable class definition: It is a struct-of-arrays store that keeps the attributes of all VMs in typed columns,
+    one row per VM. VM instances are thin views over a row of this table, so a workload can be kept in the table and
+    its VM instances created only when they are needed
+    :ivar _uid_offset: offset added to rows to make unique ids of VMs across all tables
+    :type _uid_offset: int
+    :ivar _vm_id: id of VMs
+    :type _vm_id: array<int>
+    :ivar _user_id: id of the users that submitted VMs
+    :type _user_id: array<int>
+    :ivar _mips: requested mips of VMs
+    :type _mips: array<float>
+    :ivar _ram: requested ram of VMs
+    :type _ram: array<float>
+    :ivar _bw: requested bandwidth of VMs
+    :type _bw: array<float>
+    :ivar _storage: requested storage of VMs
+    :type _storage: array<float>
+    :ivar _arrival_time: arrival time of VMs
+    :type _arrival_time: array<float>
+    :ivar _duration: duration of VMs
+    :type _duration: array<float>
+    :ivar _allocated_mips: allocated mips of VMs
+    :type _allocated_mips: array<float>
+    :ivar _allocated_ram: allocated ram of VMs
+    :type _allocated_ram: array<float>
+    :ivar _allocated_bw: allocated bandwidth of VMs
+    :type _allocated_bw: array<float>
+    :ivar _allocated_storage: allocated storage of VMs
+    :type _allocated_storage: array<float>
+    :ivar _host: index of the host that each VM is allocated to (-1 if not allocated)
+    :type _host: array<int>
+    :ivar _hosts: hosts that VMs have been allocated to, indexed by host index
+    :type _hosts: list[Host]
+    :ivar _host_index: mapping between hosts and their host index
+    :type _host_index: dict<Host, int>
+    :ivar _host_dc: index of the datacenter of each host, indexed by host index
+    :type _host_dc: array<int>
+    :ivar _dcs: datacenters of the registered hosts, indexed by datacenter index
+    :type _dcs: list[Datacenter]
+    :ivar _dc_index: mapping between datacenters and their datacenter index
+    :type _dc_index: dict<Datacenter, int>
+    """
+    _default_table = None
+    _next_uid_offset = 0
+
+    def __init__(self):
+        self._uid_offset = VMTable._next_uid_offset
+        VMTable._next_uid_offset += 1 << 40
+        self._vm_id = array('q')
+        self._user_id = array('q')
+        self._mips = array('d')
+        self._ram = array('d')
+        self._bw = array('d')
+        self._storage = array('d')
+        self._arrival_time = array('d')
+        self._duration = array('d')
+        self._allocated_mips = array('d')
+        self._allocated_ram = array('d')
+        self._allocated_bw = array('d')
+        self._allocated_storage = array('d')
+        self._host = array('q')
+        self._hosts = []
+        self._host_index = dict()
+        self._host_dc = array('q')
+        self._dcs = []
+        self._dc_index = dict()
+
+    @classmethod
+    def get_default(cls):
+        """ Get the table that VMs are stored in when no table is specified
+        :return: the default table
+        :rtype: VMTable
+        """
+        if cls._default_table is None:
+            cls._default_table = VMTable()
+        return cls._default_table
+
+    def add_vm(self, vm_id, user_id, mips, ram, bw, storage, arrival_time, duration):
+        """ Add a VM to the table
+        :return: the row of the VM
+        :rtype: int
+        """
+        self._vm_id.append(vm_id)
+        self._user_id.append(user_id)
+        self._mips.append(mips)
+        self._ram.append(ram)
+        self._bw.append(bw)
+        self._storage.append(storage)
+        self._arrival_time.append(arrival_time)
+        self._duration.append(duration)
+        self._allocated_mips.append(0)
+        self._allocated_ram.append(0)
+        self._allocated_bw.append(0)
+        self._allocated_storage.append(0)
+        self._host.append(-1)
+        return len(self._vm_id) - 1
+
+    def add_vms(self, columns):
+        """ Add VMs to the table in bulk
+        :param columns: a dictionary that maps column names (vm_id, user_id, mips, ram, bw, storage, arrival_time and
+        duration) to arrays of equal length
+        :return: the range of rows of the added VMs
+        :rtype: range
+        """
+        start = len(self._vm_id)
+        for name in ('vm_id', 'user_id', 'mips', 'ram', 'bw', 'storage', 'arrival_time', 'duration'):
+            column = getattr(self, '_' + name)
+            column.frombytes(np.ascontiguousarray(columns[name], dtype=np.int64 if column.typecode == 'q'
+                                                  else np.float64).tobytes())
+        num_vms = len(self._vm_id) - start
+        for column in (self._allocated_mips, self._allocated_ram, self._allocated_bw, self._allocated_storage):
+            column.frombytes(bytes(8 * num_vms))
+        self._host.extend(array('q', [-1]) * num_vms)
+        return range(start, start + num_vms)
+
+    def get_vm(self, row):
+        """ Get a VM instance that is a view over a given row
+        :param row: the row of the VM
+        :return: the VM
+        :rtype: VM
+        """
+        from core.VM import VM
+        return VM.from_row(self, row)
+
+    def get_vms(self, rows=None):
+        """ Get VM instances that are views over given rows
+        :param rows: the rows of the VMs (all rows if not specified)
+        :return: list of VMs
+        :rtype: list[VM]
+        """
+        from core.VM import VM
+        return [VM.from_row(self, row) for row in (rows if rows is not None else range(len(self._vm_id)))]
+
+    def get_num_vms(self):
+        """ Get the number of VMs stored in the table
+        :return: number of VMs
+        :rtype: int
+        """
+        return len(self._vm_id)
+
+    def get_uid_offset(self):
+        return self._uid_offset
+
+    def get_host_index(self, host):
+        """ Get the index of a host, registering the host if it is not registered yet
+        :param host: an instance of the Host class
+        :return: the host index
+        :rtype: int
+        """
+        index = self._host_index.get(host)
+        if index is None:
+            index = len(self._hosts)
+            self._hosts.append(host)
+            self._host_index[host] = index
+            self._host_dc.append(self.get_dc_index(host.get_datacenter()))
+        return index
+
+    def get_host(self, index):
+        """ Get the host of a host index
+        :param index: the host index
+        :return: the host or None if index is -1
+        :rtype: Host
+        """
+        return self._hosts[index] if index >= 0 else None
+
+    def get_dc_index(self, datacenter):
+        """ Get the index of a datacenter, registering the datacenter if it is not registered yet
+        :param datacenter: an instance of the Datacenter class
+        :return: the datacenter index
+        :rtype: int
+        """
+        index = self._dc_index.get(datacenter)
+        if index is None:
+            index = len(self._dcs)
+            self._dcs.append(datacenter)
+            self._dc_index[datacenter] = index
+        return index
+
+    def get_column(self, name):
+        """ Get a copy of a column as a numpy array, e.g. for vectorized queries
+        :param name: name of the column (e.g. 'mips', 'allocated_ram' or 'host')
+        :return: the column
+        :rtype: ndarray
+        """
+        column = getattr(self, '_' + name)
+        return np.array(column, dtype=np.int64 if column.typecode == 'q' else np.float64)
+
+    def get_vm_rows_on_host(self, host):
+        """ Get the rows of all VMs allocated to a given host
+        :param host: an instance of the Host class
+        :return: rows of the VMs
+        :rtype: ndarray
+        """
+        if host not in self._host_index:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(self.get_column('host') == self._host_index[host])
+
+    def get_total_allocated(self, resource, datacenter=None):
+        """ Get the total amount of a resource allocated to VMs, in a given datacenter or in all datacenters
+        :param resource: name of the resource ('mips', 'ram', 'bw' or 'storage')
+        :param datacenter: an instance of the Datacenter class or None for all datacenters
+        :return: the total allocated amount
+        :rtype: float
+        """
+        allocated = self.get_column('allocated_' + resource)
+        hosts = self.get_column('host')
+        if datacenter is None:
+            return float(allocated[hosts >= 0].sum())
+        if datacenter not in self._dc_index:
+            return 0.0
+        host_dc = np.append(np.array(self._host_dc, dtype=np.int64), -1)
+        return float(allocated[host_dc[hosts] == self._dc_index[datacenter]].sum())
+
+    def reset_allocations(self):
+        """ Mark all VMs as not allocated """
+        num_rows = len(self._vm_id)
+        self._allocated_mips = array('d', bytes(8 * num_rows))
+        self._allocated_ram = array('d', bytes(8 * num_rows))
+        self._allocated_bw = array('d', bytes(8 * num_rows))
+        self._allocated_storage = array('d', bytes(8 * num_rows))
+        self._host = array('q', [-1]) * num_rows
@@ -8,15 +8,45 @@ Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
 
 from abc import ABC, abstractmethod
 
+from utils.logger import Logger
+
 
 class DCSelectionPolicy(ABC):
     def __init__(self, datacenter_list):
         self._datacenter_list = datacenter_list
+        self._logger = Logger.from_config()
+        self._metrics = None
 
     @abstractmethod
     def select_dc_for_vm(self, vm):
         pass
 
+    def select_dc_for_vms(self, vms):
+        """ Select datacenters for a batch of VMs that arrive at the same time. The selections must be the ones that
+        select_dc_for_vm would make if the VMs were placed one by one, so a policy may only override this if its first
+        choice for a VM does not depend on the placement of the earlier VMs of the batch (e.g. FirstFit, but not
+        policies that compare the current power or cost of datacenters, see start_batch). The outcome of each selection
+        is reported via accept_selection or reject_selection in the order of the VMs, and rejected VMs go on via
+        select_dc_for_vm
+        :param vms: list of VMs
+        :return: the selected datacenter of each VM, or None if the policy selects datacenters one VM at a time
+        :rtype: list[Datacenter]
+        """
+        return None
+
+    def start_batch(self, vms):
+        """ Start selecting datacenters one VM at a time for a batch of VMs that arrive at the same time. Within a
+        batch the time does not advance and only the datacenter of an accepted selection changes, so a policy that
+        compares datacenters may evaluate all of them once here, and then only reevaluate the selected datacenter in
+        accept_selection
+        :param vms: list of VMs
+        """
+        pass
+
+    def end_batch(self):
+        """ Stop selecting datacenters for a batch of VMs, see start_batch """
+        pass
+
     @abstractmethod
     def reject_selection(self):
         pass
@@ -24,3 +54,19 @@ class DCSelectionPolicy(ABC):
     @abstractmethod
     def accept_selection(self):
         pass
+
+    def reset(self):
+        """ Return the policy to its initial state, so that it can be reused for another run """
+        pass
+
+    def get_logger(self):
+        return self._logger
+
+    def set_logger(self, logger):
+        self._logger = logger
+
+    def get_metrics(self):
+        return self._metrics
+
+    def set_metrics(self, metrics):
+        self._metrics = metrics
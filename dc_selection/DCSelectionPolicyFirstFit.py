@@ -18,6 +18,14 @@ class DCSelectionPolicyFirstFit(DCSelectionPolicy):
     def select_dc_for_vm(self, vm):
         return self._datacenter_list[self._last_selected]
 
+    def select_dc_for_vms(self, vms):
+        # each placement starts from the first datacenter, whatever happened to the VMs before it
+        return [self._datacenter_list[self._last_selected]] * len(vms)
+
+    def reset(self):
+        self._vm_table = dict()
+        self._last_selected = 0
+
     def reject_selection(self):
         self._last_selected = (self._last_selected + 1) % len(self._datacenter_list)
 
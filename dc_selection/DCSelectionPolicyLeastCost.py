@@ -16,9 +16,14 @@ class DCSelectionPolicyLeastCost(DCSelectionPolicy):
         self._vm_table = dict()
         self._rejected = [0] * len(datacenter_list)
         self._selected = 0
+        # brown costs of datacenters during a batch (see start_batch), None outside of batches
+        self._batch_costs = None
 
     def select_dc_for_vm(self, vm):
-        costs = [dc.get_brown_cost() for dc in self._datacenter_list]
+        if self._batch_costs is not None:
+            costs = list(self._batch_costs)
+        else:
+            costs = [dc.get_state().brown_cost for dc in self._datacenter_list]
         if sum(self._rejected) == len(self._rejected):
             self._rejected = [0] * len(self._datacenter_list)
         for i in range(len(self._datacenter_list)):
@@ -27,8 +32,23 @@ class DCSelectionPolicyLeastCost(DCSelectionPolicy):
         self._selected = costs.index(min(costs))
         return self._datacenter_list[self._selected]
 
+    def reset(self):
+        self._vm_table = dict()
+        self._rejected = [0] * len(self._datacenter_list)
+        self._selected = 0
+        self._batch_costs = None
+
+    def start_batch(self, vms):
+        self._batch_costs = [dc.get_state().brown_cost for dc in self._datacenter_list]
+
+    def end_batch(self):
+        self._batch_costs = None
+
     def reject_selection(self):
         self._rejected[self._selected] = 1
 
     def accept_selection(self):
         self._rejected = [0] * len(self._datacenter_list)
+        if self._batch_costs is not None:
+            # only the selected datacenter has changed
+            self._batch_costs[self._selected] = self._datacenter_list[self._selected].get_state().brown_cost
@@ -16,9 +16,14 @@ class DCSelectionPolicyLeastPower(DCSelectionPolicy):
         self._vm_table = dict()
         self._rejected = [0] * len(datacenter_list)
         self._selected = 0
+        # powers of datacenters during a batch (see start_batch), None outside of batches
+        self._batch_powers = None
 
     def select_dc_for_vm(self, vm):
-        powers = [dc.get_power() for dc in self._datacenter_list]
+        if self._batch_powers is not None:
+            powers = list(self._batch_powers)
+        else:
+            powers = [dc.get_power() for dc in self._datacenter_list]
         if sum(self._rejected) == len(self._rejected):
             self._rejected = [0] * len(self._datacenter_list)
         for i in range(len(self._datacenter_list)):
@@ -27,9 +32,24 @@ class DCSelectionPolicyLeastPower(DCSelectionPolicy):
         self._selected = powers.index(min(powers))
         return self._datacenter_list[self._selected]
 
+    def reset(self):
+        self._vm_table = dict()
+        self._rejected = [0] * len(self._datacenter_list)
+        self._selected = 0
+        self._batch_powers = None
+
+    def start_batch(self, vms):
+        self._batch_powers = [dc.get_power() for dc in self._datacenter_list]
+
+    def end_batch(self):
+        self._batch_powers = None
+
     def reject_selection(self):
         self._rejected[self._selected] = 1
 
     def accept_selection(self):
         self._rejected = [0] * len(self._datacenter_list)
+        if self._batch_powers is not None:
+            # only the selected datacenter has changed
+            self._batch_powers[self._selected] = self._datacenter_list[self._selected].get_power()
 
@@ -5,7 +5,6 @@ Author(s):      Mahmoud Momtazpour
 Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
 Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
 """
-
 from dc_selection.DCSelectionPolicy import DCSelectionPolicy
 
 
@@ -15,9 +14,14 @@ class DCSelectionPolicyMaxGreen(DCSelectionPolicy):
         self._vm_table = dict()
         self._rejected = [0] * len(datacenter_list)
         self._selected = 0
+        # stored green energy of datacenters during a batch (see start_batch), None outside of batches
+        self._batch_greens = None
 
     def select_dc_for_vm(self, vm):
-        greens = [dc.get_green() for dc in self._datacenter_list]
+        if self._batch_greens is not None:
+            greens = list(self._batch_greens)
+        else:
+            greens = [dc.get_state().green for dc in self._datacenter_list]
         if sum(self._rejected) == len(self._rejected):
             self._rejected = [0] * len(self._datacenter_list)
         for i in range(len(self._datacenter_list)):
@@ -26,8 +30,23 @@ class DCSelectionPolicyMaxGreen(DCSelectionPolicy):
         self._selected = greens.index(max(greens))
         return self._datacenter_list[self._selected]
 
+    def reset(self):
+        self._vm_table = dict()
+        self._rejected = [0] * len(self._datacenter_list)
+        self._selected = 0
+        self._batch_greens = None
+
+    def start_batch(self, vms):
+        self._batch_greens = [dc.get_state().green for dc in self._datacenter_list]
+
+    def end_batch(self):
+        self._batch_greens = None
+
     def reject_selection(self):
         self._rejected[self._selected] = 1
 
     def accept_selection(self):
         self._rejected = [0] * len(self._datacenter_list)
+        if self._batch_greens is not None:
+            # only the selected datacenter has changed
+            self._batch_greens[self._selected] = self._datacenter_list[self._selected].get_state().green
@@ -5,8 +5,14 @@ Author(s):      Mahmoud Momtazpour
 Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
 Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
 """
+from collections import deque
+
+import numpy as np
+
 from dc_selection.DCSelectionPolicy import DCSelectionPolicy
-from utils.logger import log
+
+# number of the latest states kept, e.g. to check an exported policy against the agent
+_NUM_KEPT_STATES = 1000
 
 
 class DCSelectionPolicyPPO(DCSelectionPolicy):
@@ -20,35 +26,63 @@ class DCSelectionPolicyPPO(DCSelectionPolicy):
         self._action = None
         self._req_size = 0
         self._rejected = [0] * len(datacenter_list)
+        self._states = deque(maxlen=_NUM_KEPT_STATES)
+        # normalization of brown cost, brown price, green energy and pue (rows) of datacenters (columns)
+        self._state_scale = np.array([[dc.get_max_cost() for dc in datacenter_list],
+                                      [dc.get_max_br_price() for dc in datacenter_list],
+                                      [dc.get_battery_cap() for dc in datacenter_list],
+                                      [dc.get_max_pue() for dc in datacenter_list]], dtype=np.float64)
 
+    # the agent observes the outcome of each action before acting on the state it has left, so even within a batch it
+    # selects datacenters one VM at a time
     def select_dc_for_vm(self, vm):
         if int(vm.get_id()) == 100:  # should be updated based on the number of vms in workload
             self._terminal = True
         self._req_size = 0.7 * vm.get_mips() / 36 + 0.24 * vm.get_ram() / 512 + 0.06 * vm.get_bw() / 4048
         # states = [dc.get_power() for dc in self._datacenter_list]
-        state_cost = [dc.get_brown_cost(1) / dc.get_max_cost() for dc in self._datacenter_list]
-        state_br = [dc.get_br_price() / dc.get_max_br_price() for dc in self._datacenter_list]
-        state_gr = [dc.get_green() / dc.get_battery_cap() for dc in self._datacenter_list]
-        state_pue = [dc.get_pue() / dc.get_max_pue() for dc in self._datacenter_list]
-        state_suitable = list(map(float, [dc.is_suitable_for_vm(vm) for dc in self._datacenter_list]))
-        state_util = list(map(float, [dc.get_avg_util() for dc in self._datacenter_list]))
-        for i in range(len(state_cost)):
-            assert (0 <= state_cost[i] <= 1 and 0 <= state_br[i] <= 1 and 0 <= state_gr[i] <= 1 and 0 <= state_pue[i] <= 1 and 0 <= state_util[i] <= 1)
-        self._pre_costs = state_cost
-        states = state_cost
-        # for i in range(len(states)):
-        #     if self._rejected[i] == 1:
-        #         states[i] += 10000000
-        states.extend(state_br)
-        states.extend(state_gr)
-        states.extend(state_pue)
-        states.extend(state_suitable)
-        states.extend(state_util)
+        states = self._get_states([vm])[0]
+        self._states.append(states)
+        self._pre_costs = states[:len(self._datacenter_list)].tolist()
         action = self._agent.act(states=states, independent=self._evaluation)
         self._action = action
-        log('INFO', -1, f'action = {action}')
+        self._logger.log('INFO', -1, f'action = {action}')
         return self._datacenter_list[action]
 
+    def _get_states(self, vms):
+        """ Build the states of given VMs, which share the state of datacenters and differ in their suitability
+        :param vms: list of VMs
+        :return: a (VMs x 6*datacenters) matrix, one state per row
+        :rtype: ndarray
+        """
+        dc_states = [dc.get_state() for dc in self._datacenter_list]
+        # one column per datacenter: cost, br, gr, pue, suitable and util; a state lists each row in turn
+        state = np.empty((6, len(dc_states)))
+        state[:4] = np.transpose([(s.last_brown_cost, s.br_price, s.green, s.pue) for s in dc_states])
+        state[:4] /= self._state_scale
+        state[5] = [dc.get_avg_util() for dc in self._datacenter_list]
+        states = np.repeat(state.reshape(1, -1), len(vms), axis=0)
+        suitable = states[:, 4 * len(dc_states):5 * len(dc_states)]
+        suitable[:] = [[dc.is_suitable_for_vm(vm) for dc in self._datacenter_list] for vm in vms]
+        assert ((0 <= states) & (states <= 1)).all()
+        return states
+
+    def reset(self):
+        # the agent keeps what it has learned
+        self._vm_table = dict()
+        self._terminal = False
+        self._pre_costs = [0] * len(self._datacenter_list)
+        self._action = None
+        self._req_size = 0
+        self._rejected = [0] * len(self._datacenter_list)
+        self._states.clear()
+
+    def get_states(self):
+        """ Get the latest states observed by the agent in the current run
+        :return: a (states x state size) matrix, one state per row
+        :rtype: ndarray
+        """
+        return np.array(self._states)
+
     def reject_selection(self):
         if self._rejected[self._action] == 1:
             reward = -1000000000
@@ -64,7 +98,9 @@ class DCSelectionPolicyPPO(DCSelectionPolicy):
             reward += -(-costs - self._pre_costs[self._action]) / self._req_size
         else:
             reward += costs / self._req_size
-        log('INFO', -1, f'reward = {reward}')
+        self._logger.log('INFO', -1, f'reward = {reward}')
+        if self._metrics is not None:
+            self._metrics.record_reward(reward)
         if not self._evaluation:
             self._agent.observe(terminal=self._terminal, reward=reward)
 
@@ -79,6 +115,8 @@ class DCSelectionPolicyPPO(DCSelectionPolicy):
             reward = -(-costs - self._pre_costs[self._action]) / self._req_size
         else:
             reward = costs / self._req_size
-        log('INFO', -1, f'reward = {reward}')
+        self._logger.log('INFO', -1, f'reward = {reward}')
+        if self._metrics is not None:
+            self._metrics.record_reward(reward)
         if not self._evaluation:
             self._agent.observe(terminal=self._terminal, reward=reward)
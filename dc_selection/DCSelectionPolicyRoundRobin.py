@@ -18,6 +18,10 @@ class DCSelectionPolicyRoundRobin(DCSelectionPolicy):
     def select_dc_for_vm(self, vm):
         return self._datacenter_list[(self._last_selected+1) % len(self._datacenter_list)]
 
+    def reset(self):
+        self._vm_table = dict()
+        self._last_selected = len(self._datacenter_list) - 1
+
     def reject_selection(self):
         self._last_selected = (self._last_selected + 1) % len(self._datacenter_list)
 
@@ -0,0 +1,123 @@
+"""
+Title:          PyCloudSim
+Description:    A Python-based Cloud Simulator
+Author(s):      Mahmoud Momtazpour
+Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
+Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
+"""
+
+import numpy as np
+
+
+class PPONumpyPolicy:
+    """ PPONumpyPolicy class definition: It is a trained PPO policy network exported from a Tensorforce agent, whose
+    forward pass is computed with NumPy only. It can replace the agent of DCSelectionPolicyPPO in evaluation runs, so
+    that evaluation does not depend on TensorFlow. The network is a stack of dense layers with the same activation,
+    followed by a linear layer that gives the value of each action; the action with the highest value is selected,
+    like the deterministic act of the agent
+    :ivar _weights: weights of the layers
+    :type _weights: list[ndarray]
+    :ivar _biases: biases of the layers
+    :type _biases: list[ndarray]
+    :ivar _activation: activation of the hidden layers ('tanh' or 'relu')
+    :type _activation: str
+    """
+    def __init__(self, weights, biases, activation='tanh'):
+        if len(weights) != len(biases) or not weights:
+            raise ValueError('The policy network should have the same (non-zero) number of weights and biases.')
+        if activation not in ('tanh', 'relu'):
+            raise ValueError(f'Activation {activation} is not supported.')
+        self._weights = [np.asarray(w, dtype=np.float64) for w in weights]
+        self._biases = [np.asarray(b, dtype=np.float64) for b in biases]
+        self._activation = activation
+
+    @classmethod
+    def load(cls, npz_file):
+        """ Load a policy saved by save() or export_ppo_policy()
+        :param npz_file: path to the .npz file
+        :return: the policy
+        :rtype: PPONumpyPolicy
+        """
+        with np.load(npz_file) as data:
+            num_layers = int(data['num_layers'])
+            return cls([data[f'weights{i}'] for i in range(num_layers)], [data[f'bias{i}'] for i in range(num_layers)],
+                       str(data['activation']))
+
+    def save(self, npz_file):
+        """ Save the policy to a .npz file
+        :param npz_file: path to the .npz file
+        """
+        layers = {f'weights{i}': w for i, w in enumerate(self._weights)}
+        layers.update({f'bias{i}': b for i, b in enumerate(self._biases)})
+        np.savez(npz_file, num_layers=len(self._weights), activation=self._activation, **layers)
+
+    def get_action_values(self, states):
+        """ Compute the value of each action for one state or a batch of states
+        :param states: a state vector or a (batch x state size) matrix
+        :return: the action values
+        :rtype: ndarray
+        """
+        x = np.asarray(states, dtype=np.float64)
+        for w, b in zip(self._weights[:-1], self._biases[:-1]):
+            x = x @ w + b
+            x = np.tanh(x) if self._activation == 'tanh' else np.maximum(x, 0)
+        return x @ self._weights[-1] + self._biases[-1]
+
+    def act(self, states, independent=True):
+        """ Select an action for a given state, with the same signature as the act method of Tensorforce agents
+        :param states: the state vector
+        :param independent: unused, the policy is always evaluated independently
+        :return: the selected action
+        :rtype: int
+        """
+        return int(np.argmax(self.get_action_values(states)))
+
+    def get_num_layers(self):
+        return len(self._weights)
+
+    def get_activation(self):
+        return self._activation
+
+
+def export_ppo_policy(agent, npz_file, states, activation=None):
+    """Export the policy network of a trained Tensorforce PPO agent to a .npz file that can be loaded by
+    PPONumpyPolicy. The dense layers of the policy are taken in the order the agent lists them, followed by the layers
+    of its action distribution, each pairing the weights and bias of the same layer; the variables of the critic
+    (baseline) and of the optimizers are skipped. Since the network is recovered from the names of the variables, the
+    exported policy is only saved if it selects the same action as the deterministic act of the agent for all given
+    states
+    :param agent: a trained Tensorforce agent with an automatically configured (dense) network
+    :param npz_file: path to the .npz file to be written
+    :param states: states (e.g. of the last episode) on which the exported policy is checked against the agent
+    :param activation: activation of the hidden layers of the network ('tanh' or 'relu'), or None to use the one that
+    agrees with the agent
+    :return: the exported policy
+    :rtype: PPONumpyPolicy
+    :raise: raises ValueError if the policy network cannot be found among the variables of the agent, or the exported
+    policy does not select the same actions as the agent
+    """
+    layers = dict()
+    for name in agent.get_variables():
+        layer, _, kind = name.split(':')[0].rpartition('/')
+        if kind in ('weights', 'bias') and 'baseline' not in layer and 'critic' not in layer:
+            layers.setdefault(layer, dict())[kind] = name
+    if not layers or any(len(variables) != 2 for variables in layers.values()):
+        raise ValueError('Unable to find the dense layers of the policy network of the agent.')
+    names = sorted(layers, key=lambda layer: 'distribution' in layer)
+    weights = [agent.get_variable(layers[layer]['weights']) for layer in names]
+    biases = [agent.get_variable(layers[layer]['bias']) for layer in names]
+    if any(np.shape(w)[-1] != np.shape(b)[-1] for w, b in zip(weights, biases)) or \
+            any(np.shape(w)[-1] != np.shape(next_w)[0] for w, next_w in zip(weights, weights[1:])):
+        raise ValueError('The dense layers found among the variables of the agent do not form a network.')
+    states = np.asarray(states, dtype=np.float64)
+    if not len(states):
+        raise ValueError('The exported policy should be checked on at least one state.')
+    actions = np.array([int(agent.act(states=state, independent=True)) for state in states])
+    for candidate in ('tanh', 'relu') if activation is None else (activation,):
+        policy = PPONumpyPolicy(weights, biases, candidate)
+        mismatches = int(np.count_nonzero(policy.get_action_values(states).argmax(axis=1) != actions))
+        if not mismatches:
+            policy.save(npz_file)
+            return policy
+    raise ValueError(f'The exported policy selects a different action than the agent in {mismatches} of '
+                     f'{len(states)} states.')
@@ -0,0 +1,50 @@
+"""
+Title:          PyCloudSim
+Description:    A Python-based Cloud Simulator
+Author(s):      Mahmoud Momtazpour
+Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
+Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
+"""
+
+from importlib import import_module
+
+# Registry of DC selection policies as name: (module, class). Modules are imported when their policy is first used, so
+# heavy dependencies of a policy (e.g. the RL stack of PPO) are only loaded if it is selected
+_DC_SELECTION_POLICIES = {
+    'FirstFit': ('dc_selection.DCSelectionPolicyFirstFit', 'DCSelectionPolicyFirstFit'),
+    'RoundRobin': ('dc_selection.DCSelectionPolicyRoundRobin', 'DCSelectionPolicyRoundRobin'),
+    'LeastPower': ('dc_selection.DCSelectionPolicyLeastPower', 'DCSelectionPolicyLeastPower'),
+    'LeastCost': ('dc_selection.DCSelectionPolicyLeastCost', 'DCSelectionPolicyLeastCost'),
+    'MaxGreen': ('dc_selection.DCSelectionPolicyMaxGreen', 'DCSelectionPolicyMaxGreen'),
+    'PPO': ('dc_selection.DCSelectionPolicyPPO', 'DCSelectionPolicyPPO'),
+}
+
+
+def register_dc_selection_policy(name: str, module: str, class_name: str):
+    """Register a DC selection policy, so that it can be selected by its name
+    :param name: name of the policy, e.g. in Config.dc_selection_policy
+    :param module: the module that defines the policy
+    :param class_name: the class of the policy (a subclass of DCSelectionPolicy)
+    """
+    _DC_SELECTION_POLICIES[name] = (module, class_name)
+
+
+def get_dc_selection_policy(name: str) -> type:
+    """Get the class of a DC selection policy by its name, importing its module on first use
+    :param name: name of the policy
+    :return: the class of the policy
+    :rtype: type
+    :raise: raises ValueError if no policy is registered with the name
+    """
+    if name not in _DC_SELECTION_POLICIES:
+        raise ValueError('DC selection policy not implemented')
+    module, class_name = _DC_SELECTION_POLICIES[name]
+    return getattr(import_module(module), class_name)
+
+
+def get_dc_selection_policy_names() -> list[str]:
+    """Get the names of all registered DC selection policies
+    :return: names of the policies
+    :rtype: list[str]
+    """
+    return list(_DC_SELECTION_POLICIES)
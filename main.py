@@ -6,7 +6,7 @@ Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
 Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
 """
 from utils.creator import *
-from utils.logger import enable_logging, log
+from utils.logger import enable_logging, log, stop_logging
 from PyCloudSim import PyCloudSim
 
 
@@ -40,3 +40,4 @@ if __name__ == '__main__':
 
     # 5) Stop the simulation and finalize Results
     sim.stop_simulation()
+    stop_logging()
@@ -1,84 +1,119 @@
-from simpy.util import start_delayed
+from collections import namedtuple
 
 from core.Datacenter import Datacenter
-from utils.logger import log_me, log
-from numpy import cumsum, minimum, ones
+import numpy as np
+
+# IT power is accumulated as an integer number of 2^-60 W, so that the running sum does not drift
+_POWER_SCALE = 2 ** 60
+# gaps in the power history shorter than this are filled second by second, longer ones in bulk
+_MIN_BULK_GAP = 64
+# maximum number of seconds processed at once while filling a gap in bulk
+_MAX_BULK_WINDOW = 4096
+
+# Read-only view of the state of a power datacenter at a given time, as seen by DC selection policies. The average
+# utilization of hosts is not part of it, since it costs a loop over hosts (see PowerDatacenter.get_avg_util)
+DatacenterState = namedtuple('DatacenterState', ['time', 'power', 'green', 'brown_cost', 'last_brown_cost',
+                                                 'br_price', 'pue', 'battery', 'max_cost', 'max_br_price',
+                                                 'max_pue'])
 
 
 class PowerDatacenter(Datacenter):
     def __init__(self, dc_id, datacenter_attributes, datacenter_power_traces, vm_allocation_policy, host_list):
         super().__init__(dc_id, datacenter_attributes, vm_allocation_policy, host_list)
         self._power = 0.0
-        self._power_all = [0.0]
-        self._green_all = [0.0]
-        self._brCost_all = [0.0]
-        self._pue = list(map(float, datacenter_power_traces['pue']))
-        self._solar = list(map(float, datacenter_power_traces['solar']))
+        self._it_power = sum(int(host.get_current_power() * _POWER_SCALE) for host in self._host_list)
+        self._pue = np.asarray(datacenter_power_traces['pue'], dtype=np.float64)
+        self._solar = np.asarray(datacenter_power_traces['solar'], dtype=np.float64)
         self._battery = datacenter_attributes['battery']
-        self._br_price = list(map(float, datacenter_power_traces['br_cost']))
-
-
+        self._br_price = np.asarray(datacenter_power_traces['br_cost'], dtype=np.float64)
+        # history of power, stored green energy and brown cost, filled up to (excluding) _history_len
+        self._power_all = np.zeros(len(self._br_price))
+        self._green_all = np.zeros(len(self._br_price))
+        self._brCost_all = np.zeros(len(self._br_price))
+        # prefix sums of the brown cost history, i.e. _brCost_cum[t] is the total brown cost in [0, t]
+        self._brCost_cum = np.zeros(len(self._br_price))
+        self._history_len = 1
+        # trace maxima, which do not change during the simulation
+        self._max_pue = float(self._pue.max())
+        self._max_br_price = float(self._br_price.max())
+        self._max_cost = round(sum(host.get_max_power() for host in self._host_list) * self._max_pue *
+                               self._max_br_price, 2)
+        # the state snapshot is shared by all queries at the same time until the power of the datacenter changes
+        self._state = None
+        self._state_key = None
+        self._power_version = 0
+        # the average utilization of hosts, computed on demand and kept until the power of the datacenter changes
+        self._avg_util = None
+        self._avg_util_version = -1
 
     def process_vm_create(self, vm):
-        log_me('INFO', int(self._env.now), 'Datacenter', 'VM creation request received', vm.get_id(),
-               self._datacenter_id)
-        result = self._vm_allocation_policy.allocate_host_for_vm(vm)
+        self._logger.log_me('INFO', int(self._env.now), 'Datacenter', 'VM creation request received', vm.get_id(),
+                            self._datacenter_id)
+        result = self._create_vm(vm)
         if result:
-            start_delayed(self._env, self.process_vm_destroy(vm), delay=vm.get_duration())
             self.update_power()
             # self.update_brown_cost()
-            self._vm_list.append(vm.get_vm_uid())
-            log_me('INFO', int(self._env.now), 'Datacenter', 'VM created and allocated', vm.get_id(),
-                   self._datacenter_id, vm.get_host().get_id())
-            log_me('STAT', int(self._env.now), 'Datacenter',
-                   f'Now consumes {self._power}W, and hosts {len(self._vm_list)} VMs', vm_id=None,
-                   dc_id=self._datacenter_id)
-        else:
-            log_me('WARN', int(self._env.now), 'Datacenter', 'VM not created', vm.get_id(), self._datacenter_id)
+            self._record_state()
         return result
 
+    def process_vm_create_batch(self, vms):
+        """ Process the creation requests of VMs that arrive at the same time in a single pass. The power of the
+        datacenter is updated once for the whole batch
+        :param vms: list of VMs
+        :return: for each VM, True if it is created and False otherwise
+        :rtype: list[bool]
+        """
+        for vm in vms:
+            self._logger.log_me('INFO', int(self._env.now), 'Datacenter', 'VM creation request received', vm.get_id(),
+                                self._datacenter_id)
+        statuses = [self._create_vm(vm) for vm in vms]
+        if any(statuses):
+            self.update_power()
+            self._record_state()
+        return statuses
+
     def process_vm_destroy(self, vm):
-        log_me('INFO', int(self._env.now), 'Datacenter', 'VM destroy request received', vm.get_id(),
-               self._datacenter_id)
+        self._logger.log_me('INFO', int(self._env.now), 'Datacenter', 'VM destroy request received', vm.get_id(),
+                            self._datacenter_id)
         self._vm_allocation_policy.deallocate_host_for_vm(vm)
         self._vm_list.remove(vm.get_vm_uid())
-        log_me('INFO', int(self._env.now), 'Datacenter', 'VM destroyed', vm.get_id(), self._datacenter_id)
+        self._logger.log_me('INFO', int(self._env.now), 'Datacenter', 'VM destroyed', vm.get_id(), self._datacenter_id)
         self.update_power()
         # self.update_brown_cost()
-        log_me('STAT', int(self._env.now), 'Datacenter',
-               f'Now consumes {self._power}W, and hosts {len(self._vm_list)} VMs', vm_id=None,
-               dc_id=self._datacenter_id)
-        yield self._env.timeout(0)
+        self._record_state()
 
-    def update_power(self):
+    def _record_state(self):
+        """ Log the power and the number of VMs of the datacenter after its power is updated, and record them along
+        with its stored green energy and total brown cost """
+        now = int(self._env.now)
+        self._logger.log_me('STAT', now, 'Datacenter', 'Now consumes {}W, and hosts {} VMs', dc_id=self._datacenter_id,
+                            args=(self._power, len(self._vm_list)))
+        if self._metrics is not None:
+            # the last updated second of the power history
+            last = self._history_len - 1
+            self._metrics.record_dc(self._datacenter_id, now, self._power, len(self._vm_list),
+                                    self._green_all[last], self._brCost_cum[last])
+
+    def _get_trace_time(self):
         # get current time and update it if necessary
         now = int(self._env.now)
         if now > len(self._br_price) - 1:
-            log('WARN', now, 'Simulation time exceeds power traces length!')
+            self._logger.log('WARN', now, 'Simulation time exceeds power traces length!')
             now = len(self._br_price) - 1
+        return now
+
+    def update_power(self):
+        now = self._get_trace_time()
+        self._power_version += 1
 
         # set current power of data center
-        self._power = 0
-        for host in self._host_list:
-            self._power += host.get_power()
-        self._power = round(self._power * self._pue[now], 2)
-
-        # extend power_all history if it is not current
-        if now >= len(self._power_all):
-            diff = now - len(self._power_all) + 1
-            self._power_all.extend([self._power_all[-1]] * diff)
-            for i in reversed(range(diff)):
-                green = min(self._green_all[now - i - 1] + self._solar[now - i - 1], self._battery)
-                rem_green = green - self._power_all[now - i]
-                if rem_green < 0:
-                    self._brCost_all.append(-rem_green * self._br_price[now - i])
-                    self._green_all.append(0)
-                else:
-                    self._brCost_all.append(0)
-                    self._green_all.append(rem_green)
-        assert(len(self._power_all) == (now + 1))
+        self._power = round(self._it_power / _POWER_SCALE * float(self._pue[now]), 2)
+
+        # extend power history if it is not current
+        if now > self._history_len:
+            self._fill_history(self._history_len, now)
         self._power_all[now] = self._power
-        green = min(self._green_all[now - 1] + self._solar[now - 1], self._battery)
+        green = min(self._green_all[now - 1 if now > 0 else 0] + self._solar[now - 1], self._battery)
         rem_green = green - self._power
         if rem_green < 0:
             self._brCost_all[now] = -rem_green * self._br_price[now]
@@ -86,72 +121,201 @@ class PowerDatacenter(Datacenter):
         else:
             self._brCost_all[now] = 0
             self._green_all[now] = rem_green
+        self._brCost_cum[now] = self._brCost_cum[now - 1] + self._brCost_all[now] if now > 0 else self._brCost_all[0]
+        self._history_len = now + 1
+
+    def _extend_history(self, now):
+        """ Make the power history current without changing the power of the datacenter, i.e. assuming the power
+        has been constant since the last update. Since the filled values are fully determined by the last update, this
+        does not change the result of the simulation
+        :param now: the last second to be filled
+        """
+        if now >= self._history_len:
+            self._fill_history(self._history_len, now + 1)
+            self._history_len = now + 1
 
+    def _get_current(self, now):
+        """ Compute the power, stored green energy and brown cost of the datacenter at the current second as
+        update_power would, i.e. from the current IT power and the PUE of this second, without writing them to the
+        power history
+        :param now: the current time
+        :return: power, stored green energy and brown cost at the current second
+        :rtype: tuple(float, float, float)
+        """
+        self._extend_history(now - 1)
+        power = round(self._it_power / _POWER_SCALE * float(self._pue[now]), 2)
+        green = min(self._green_all[now - 1 if now > 0 else 0] + self._solar[now - 1], self._battery)
+        rem_green = green - power
+        if rem_green < 0:
+            return power, 0.0, float(-rem_green * self._br_price[now])
+        return power, float(rem_green), 0.0
+
+    def _fill_history(self, start, end):
+        """ Fill the power history in [start, end) during which the power of the datacenter was constant. The battery
+        is charged by solar energy (up to its capacity) and discharged by the datacenter power, and brown energy is
+        bought when the battery is empty
+        :param start: first second of the gap
+        :param end: the second after the last second of the gap
+        """
+        power = self._power_all[start - 1]
+        self._power_all[start:end] = power
+        if end - start < _MIN_BULK_GAP:
+            for t in range(start, end):
+                green = min(self._green_all[t - 1] + self._solar[t - 1], self._battery)
+                rem_green = green - power
+                if rem_green < 0:
+                    self._brCost_all[t] = -rem_green * self._br_price[t]
+                    self._green_all[t] = 0
+                else:
+                    self._brCost_all[t] = 0
+                    self._green_all[t] = rem_green
+                self._brCost_cum[t] = self._brCost_cum[t - 1] + self._brCost_all[t]
+            return
+        # green(t) = clip(green(t-1) + solar(t-1) - power, 0, battery - power) is a random walk reflected at both
+        # bounds. While it only touches one bound, it is a cumulative sum corrected by a running extremum, so the gap
+        # is processed in phases that end when the other bound is hit.
+        headroom = self._battery - power
+        if headroom <= 0:
+            self._green_all[start:end] = 0
+        else:
+            steps = self._solar[start - 1:end - 1] - power
+            green = self._green_all[start - 1]
+            at_top = False
+            window = _MIN_BULK_GAP
+            t = start
+            while t < end:
+                walk = green + np.cumsum(steps[t - start:min(end, t + window) - start])
+                if at_top:
+                    reflected = walk - np.maximum(np.maximum.accumulate(walk - headroom), 0)
+                    crossed = np.flatnonzero(reflected < 0)
+                else:
+                    reflected = walk - np.minimum(np.minimum.accumulate(walk), 0)
+                    crossed = np.flatnonzero(reflected > headroom)
+                if len(crossed):
+                    n = crossed[0]
+                    reflected = reflected[:n + 1]
+                    reflected[n] = 0 if at_top else headroom
+                    at_top = not at_top
+                    window = max(_MIN_BULK_GAP, 2 * len(reflected))
+                else:
+                    window = min(2 * window, _MAX_BULK_WINDOW)
+                self._green_all[t:t + len(reflected)] = reflected
+                green = reflected[-1]
+                t += len(reflected)
+        available = np.minimum(self._green_all[start - 1:end - 1] + self._solar[start - 1:end - 1], self._battery)
+        self._brCost_all[start:end] = np.maximum(power - available, 0) * self._br_price[start:end]
+        self._brCost_cum[start:end] = self._brCost_cum[start - 1] + np.cumsum(self._brCost_all[start:end])
 
     def get_brown_cost(self, num_points=-1):
         # num_points means how many costs should be
-        now = int(self._env.now)
-        if now > len(self._br_price) - 1:
-            log('WARN', now, 'Simulation time exceeds power traces length!')
-            now = len(self._br_price) - 1
+        now = self._get_trace_time()
         if num_points <= 0:
-            log('WARN', now, 'Number of points should be greater than 1. All points will be used!')
+            self._logger.log('WARN', now, 'Number of points should be greater than 1. All points will be used!')
             st = 0
         else:
             st = now + 1 - num_points
             if st < 0:
-                log('WARN', now, 'There are still fewer points than specified!')
+                self._logger.log('WARN', now, 'There are still fewer points than specified!')
                 st = 0
-        # br_price = self._br_price[st:now + 1]
-        self.update_power()
-        # power = self.get_power_all()[st:now + 1]
-        # green = self._solar[st:now + 1]
-        # return sum([max(0.0, (power[i] - green[i]) * br_price[i]) for i in range(len(green))])
-        return sum(self._brCost_all[st:now+1])
+        return self._get_brown_cost(st, now, self._get_current(now)[2])
 
+    def _get_brown_cost(self, st, now, current_cost):
+        # the brown cost in [st, now], given the brown cost of the current second
+        cost = current_cost
+        if now > 0:
+            cost += self._brCost_cum[now - 1]
+        if st > 0:
+            cost -= self._brCost_cum[st - 1]
+        return float(cost)
+
+    def get_state(self):
+        """ Get a snapshot of the state of the datacenter at the current time. The snapshot is computed once and
+        shared by all queries until the time advances or the power of the datacenter changes. The values of the
+        current second are computed as update_power would compute them, but are not written to the power history, so
+        the history (and the brown cost) does not depend on how often policies query the datacenter
+        :return: the state of the datacenter
+        :rtype: DatacenterState
+        """
+        now = self._get_trace_time()
+        key = (now, self._power_version)
+        if self._state_key != key:
+            power, green, cost = self._get_current(now)
+            self._state = DatacenterState(time=now, power=power, green=green,
+                                          brown_cost=self._get_brown_cost(0, now, cost), last_brown_cost=cost,
+                                          br_price=float(self._br_price[now]), pue=float(self._pue[now]),
+                                          battery=self._battery, max_cost=self._max_cost,
+                                          max_br_price=self._max_br_price, max_pue=self._max_pue)
+            self._state_key = key
+        return self._state
+
+    def reset(self):
+        super().reset()
+        self._power = 0.0
+        self._it_power = sum(int(host.get_current_power() * _POWER_SCALE) for host in self._host_list)
+        self._power_all.fill(0)
+        self._green_all.fill(0)
+        self._brCost_all.fill(0)
+        self._brCost_cum.fill(0)
+        self._history_len = 1
+        self._state = None
+        self._state_key = None
+        self._power_version = 0
+        self._avg_util = None
+        self._avg_util_version = -1
+
+    def update_host_power(self, old_power, new_power):
+        """ Update the IT power (i.e. total power of hosts) of the datacenter in O(1) when the power of one of its hosts
+        changes
+        :param old_power: the previous power of the host
+        :param new_power: the current power of the host
+        """
+        self._it_power += int(new_power * _POWER_SCALE) - int(old_power * _POWER_SCALE)
+
+    def get_it_power(self):
+        return self._it_power / _POWER_SCALE
 
     def get_max_cost(self):
-        power = 0
-        for host in self._host_list:
-            power += host.get_max_power()
-        return round(power * self.get_max_pue() * self.get_max_br_price(), 2)
+        return self._max_cost
+
     def get_reward(self):
         now = int(self._env.now)
         if self._brCost_all[now] > 0:
-            return -self._brCost_all[now]
+            return -float(self._brCost_all[now])
         else:
-            return self._green_all[now]
+            return float(self._green_all[now])
 
     def get_power(self):
         return self._power
 
     def get_power_all(self):
-        return self._power_all
+        return self._power_all[:self._history_len]
 
     def get_br_price(self):
         now = int(self._env.now)
-        return self._br_price[now]
+        return float(self._br_price[now])
 
     def get_max_br_price(self):
-        return max(self._br_price)
+        return self._max_br_price
 
     def get_green(self):
-        now = int(self._env.now)
-        self.update_power()
-        return self._green_all[now]
+        return self.get_state().green
 
     def get_pue(self):
         now = int(self._env.now)
-        return self._pue[now]
+        return float(self._pue[now])
 
     def get_max_pue(self):
-        return max(self._pue)
+        return self._max_pue
 
     def get_battery_cap(self):
         return self._battery
 
     def get_avg_util(self):
-        util = 0
-        for h in self._host_list:
-            util += h.get_avg_util()
-        return util / len(self._host_list)
\ No newline at end of file
+        # hosts only change along with the power of the datacenter, so the loop over hosts runs once per change
+        if self._avg_util_version != self._power_version:
+            util = 0
+            for h in self._host_list:
+                util += h.get_avg_util()
+            self._avg_util = util / len(self._host_list)
+            self._avg_util_version = self._power_version
+        return self._avg_util
\ No newline at end of file
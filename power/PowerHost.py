@@ -3,10 +3,10 @@ import logging
 
 
 class PowerHost(Host):
-    def __init__(self, host_id, ram_provisioner, bw_provisioner, storage_provisioner, mips_provisioner, power_model):
-        super().__init__(host_id, ram_provisioner, bw_provisioner, storage_provisioner, mips_provisioner)
+    def __init__(self, host_id, provisioner, power_model):
+        super().__init__(host_id, provisioner)
         self._power_model = power_model
-        self._power = 0
+        self._power = self.get_power()
 
     def get_power(self):
         return self._power_model.get_power(self.get_mips_util(), self.get_ram_util(), self.get_bw_util(),
@@ -35,9 +35,24 @@ class PowerHost(Host):
     def vm_create(self, vm):
         status = super().vm_create(vm)
         if status:
-            self._power = self.get_power()
+            self._update_power()
         return status
 
     def vm_destroy(self, vm):
         super().vm_destroy(vm)
-        self._power = self.get_power()
+        self._update_power()
+
+    def vm_destroy_all(self):
+        super().vm_destroy_all()
+        self._update_power()
+
+    def _update_power(self):
+        """ Recompute the power of this host after its VMs change, and report the change to its datacenter """
+        power = self.get_power()
+        old_power = self._power
+        self._power = power
+        if power != old_power and self._datacenter is not None:
+            self._datacenter.update_host_power(old_power, power)
+
+    def get_current_power(self):
+        return self._power
@@ -3,7 +3,8 @@ from power.models.PowerModel import PowerModel
 
 
 class PowerModelLinear(PowerModel):
-    def __init__(self, max_power, stat_power, mips_power_ratio, ram_power_ratio, bw_power_ratio, storage_power_ratio):
+    def __init__(self, max_power, stat_power, mips_power_ratio, ram_power_ratio, bw_power_ratio, storage_power_ratio,
+                 eps=None, consolidation=None):
         super().__init__(max_power, stat_power)
         if (mips_power_ratio + ram_power_ratio + bw_power_ratio + storage_power_ratio) != 1:
             raise ValueError('The sum of power ratios must be one!')
@@ -11,16 +12,28 @@ class PowerModelLinear(PowerModel):
         self._ram_p_r = ram_power_ratio
         self._bw_p_r = bw_power_ratio
         self._storage_p_r = storage_power_ratio
+        # tolerance of utilization bounds and consolidation are bound once (from Config if not given)
+        self._eps = eps if eps is not None else conf.eps
+        self._consolidation = consolidation if consolidation is not None else conf.consolidation
+        self._min_util = -self._eps
+        self._max_util = 1 + self._eps
 
     def get_power(self, mips_util, ram_util, bw_util, storage_util):
-        if -conf.eps <= mips_util <= 1 + conf.eps and -conf.eps <= ram_util <= 1 + conf.eps and -conf.eps <= bw_util <= 1 + conf.eps and -conf.eps <= storage_util <= 1 + conf.eps:
+        min_util, max_util = self._min_util, self._max_util
+        if min_util <= mips_util <= max_util and min_util <= ram_util <= max_util and min_util <= bw_util <= max_util and min_util <= storage_util <= max_util:
             util = (mips_util * self._mips_p_r +
                     ram_util * self._ram_p_r +
                     bw_util * self._bw_p_r +
                     storage_util * self._storage_p_r)
-            if conf.consolidation:
+            if self._consolidation:
                 return self._stat_p * int(util != 0) + (self._max_p - self._stat_p) * util
             else:
                 return self._stat_p + (self._max_p - self._stat_p) * util
         else:
             raise ValueError('Utilization exceeds its boundaries [0,1]')
+
+    def get_eps(self):
+        return self._eps
+
+    def get_consolidation(self):
+        return self._consolidation
@@ -9,41 +9,52 @@ Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
 import logging
 from Config import Config as conf
 from csv import DictReader, reader
-from utils.logger import enable_logging, log
+from utils.logger import enable_logging, log, stop_logging
 from utils.parser import parse
 from utils.plotter import plot_results
 from PyCloudSim import PyCloudSim
+from core.SimConfig import SimConfig
 from utils.creator import *
 
 
 if __name__ == '__main__':
-    if conf.enable_log:
-        enable_logging(conf.vm_file.replace('csv', 'log'))
+    config = SimConfig.from_config()
+    log_file = conf.vm_file.replace('csv', 'log') + ('.gz' if conf.compress_log else '')
+    if config.enable_log:
+        enable_logging(log_file, conf.log_in_background)
         log('INFO', 0, f'Initializing PyCloudSim...')
 
     # 1) Create Datacenter(s) and Cloud
-    datacenters = create_power_datacenter_from_file(conf.dc_file, conf.pue_file, conf.br_cost_file, conf.solar_file)
-    cloud = create_cloud(datacenters)
+    datacenters = create_power_datacenter_from_file(conf.dc_file, conf.pue_file, conf.br_cost_file, conf.solar_file,
+                                                    config=config)
+    cloud = create_cloud(datacenters, config=config)
 
-    # 2) Create VM(s) either manually or from a file
-    vms = create_vms(conf.vm_file)
+    # 2) Create VM(s) either manually or by streaming them from a file
+    vms = stream_vms(conf.vm_file, config=config)
     # vms = create_vms()
 
     # 3) Create a Broker and submit VMs to it
     broker = create_broker(cloud)
-    broker.submit_vm_list(vms)
+    broker.submit_vm_source(vms)
     cloud.set_broker(broker)
 
     # 4) Create and initialize simulation environment and event processors
-    sim_time = conf.sim_time
-    sim = PyCloudSim(sim_time, broker, cloud, vms)
+    sim_time = config.sim_time
+    sim = PyCloudSim(sim_time, broker, cloud, vms, config=config)
 
     # 5) Start the simulation
     sim.start_simulation()
 
     # 5) Stop the simulation and finalize Results
     sim.stop_simulation()
-
-    # 6) Plot the results
-    power_readings, num_vms, num_rejected, _ = parse(conf.vm_file.replace('csv', 'log'))
+    stop_logging()
+
+    # 6) Export and plot the results
+    metrics = sim.get_metrics()
+    if metrics is not None:
+        if conf.metrics_file is not None:
+            metrics.save(conf.metrics_file)
+        power_readings, num_vms, num_rejected, _ = metrics.to_results()
+    else:
+        power_readings, num_vms, num_rejected, _ = parse(log_file)
     plot_results(power_readings, num_vms, num_rejected)
@@ -0,0 +1,143 @@
+"""
+Title:          PyCloudSim
+Description:    A Python-based Cloud Simulator
+Author(s):      Mahmoud Momtazpour
+Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
+Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
+"""
+
+MIPS, RAM, BW, STORAGE = 0, 1, 2, 3
+
+
+class VectorProvisioner:
+    """ VectorProvisioner class definition: It is responsible for provisioning all host resources (mips, ram, bw and
+    storage) for VMs. Total and available amounts of the resources are kept in small vectors indexed by
+    MIPS, RAM, BW and STORAGE
+    :ivar _capacity: host total resources
+    :type _capacity: list[float]
+    :ivar _available: host available (i.e. remaining) resources
+    :type _available: list[float]
+    :ivar _vm_table: mapping between VM uid and its allocated resources
+    :type _vm_table: dict<vm_uid: int, (mips, ram, bw, storage)>
+    """
+    def __init__(self, mips, ram, bw, storage):
+        """ Constructor
+        :param mips: total mips of the provisioner
+        :param ram: total ram of the provisioner
+        :param bw: total bandwidth of the provisioner
+        :param storage: total storage of the provisioner
+        """
+        self._capacity = [mips, ram, bw, storage]
+        self._available = [mips, ram, bw, storage]
+        self._vm_table = dict()
+
+    def is_suitable_for_vm(self, vm):
+        """ Check if the provisioner has enough resources for a given VM. The provisioner is not modified
+        :param vm: an instance of the VM class
+        :return: True: has enough resources, False: otherwise
+        :rtype: bool
+        """
+        available = self._available
+        allocated = self._vm_table.get(vm.get_vm_uid())
+        if allocated is not None:
+            available = [available[i] + allocated[i] for i in range(4)]
+        return available[MIPS] >= vm.get_mips() and available[RAM] >= vm.get_ram() and \
+            available[BW] >= vm.get_bw() and available[STORAGE] >= vm.get_storage()
+
+    def allocate_for_vm(self, vm):
+        """ Allocate the requested resources of a given VM. Either all resources are allocated or none of them
+        :param vm: an instance of the VM class
+        :return: True: succeeded, False: failed
+        :rtype: bool
+        """
+        self.deallocate_for_vm(vm)
+        requested = (vm.get_mips(), vm.get_ram(), vm.get_bw(), vm.get_storage())
+        available = self._available
+        if available[MIPS] >= requested[MIPS] and available[RAM] >= requested[RAM] and \
+                available[BW] >= requested[BW] and available[STORAGE] >= requested[STORAGE]:
+            available[MIPS] -= requested[MIPS]
+            available[RAM] -= requested[RAM]
+            available[BW] -= requested[BW]
+            available[STORAGE] -= requested[STORAGE]
+            self._vm_table[vm.get_vm_uid()] = requested
+            self._set_allocated(vm, requested)
+            return True
+        return False
+
+    def deallocate_for_vm(self, vm):
+        """ Deallocate the resources of a given VM
+        :param vm: an instance of the VM class
+        """
+        allocated = self._vm_table.pop(vm.get_vm_uid(), None)
+        if allocated is not None:
+            available = self._available
+            available[MIPS] += allocated[MIPS]
+            available[RAM] += allocated[RAM]
+            available[BW] += allocated[BW]
+            available[STORAGE] += allocated[STORAGE]
+            self._set_allocated(vm, (0, 0, 0, 0))
+
+    def deallocate_for_all_vm(self):
+        """ Deallocate the resources of all resident VMs"""
+        self._available = list(self._capacity)
+        self._vm_table = dict()
+
+    @staticmethod
+    def _set_allocated(vm, allocated):
+        vm.set_current_allocated_mips(allocated[MIPS])
+        vm.set_current_allocated_ram(allocated[RAM])
+        vm.set_current_allocated_bw(allocated[BW])
+        vm.set_current_allocated_storage(allocated[STORAGE])
+
+    def get_allocated_for_vm(self, vm):
+        """ Get the resources allocated for a given VM
+        :param vm: an instance of the VM class
+        :return: the allocated (mips, ram, bw, storage)
+        :rtype: tuple
+        """
+        return self._vm_table.get(vm.get_vm_uid(), (0, 0, 0, 0))
+
+    def get_vm_table(self):
+        """ Get the resources-VM mapping table
+        :return: the resources-VM mapping table
+        :rtype: dict<vm_uid: int, (mips, ram, bw, storage)>
+        """
+        return self._vm_table
+
+    def get_capacity(self):
+        """ Get the total resources of the provisioner
+        :return: the total (mips, ram, bw, storage)
+        :rtype: list[float]
+        """
+        return self._capacity
+
+    def get_available(self):
+        """ Get the available resources of the provisioner
+        :return: the available (mips, ram, bw, storage)
+        :rtype: list[float]
+        """
+        return self._available
+
+    def get_mips(self):
+        return self._capacity[MIPS]
+
+    def get_available_mips(self):
+        return self._available[MIPS]
+
+    def get_ram(self):
+        return self._capacity[RAM]
+
+    def get_available_ram(self):
+        return self._available[RAM]
+
+    def get_bw(self):
+        return self._capacity[BW]
+
+    def get_available_bw(self):
+        return self._available[BW]
+
+    def get_storage(self):
+        return self._capacity[STORAGE]
+
+    def get_available_storage(self):
+        return self._available[STORAGE]
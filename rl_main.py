@@ -8,9 +8,10 @@ Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
 
 from utils.creator import *
 from tensorforce import Agent
+from dc_selection.PPONumpyPolicy import export_ppo_policy
 from utils.parser import parse
 from utils.plotter import plot_results
-from utils.logger import enable_logging, log
+from utils.logger import enable_logging, log, stop_logging
 from PyCloudSim import PyCloudSim
 
 
@@ -65,32 +66,36 @@ if __name__ == '__main__':
     train_dc_file = 'csv/dcs_test.csv'
     train_vm_file = 'csv/vms_test.csv'
     eval_vm_file = 'csv/vms_HighDuration_1.csv'
-    train_log_file = train_vm_file.replace('csv', 'log')
-    eval_log_file = eval_vm_file.replace('csv', 'log')
+    train_log_file = train_vm_file.replace('csv', 'log') + ('.gz' if conf.compress_log else '')
+    eval_log_file = eval_vm_file.replace('csv', 'log') + ('.gz' if conf.compress_log else '')
+    # Build the training environment once; each episode resets it in place
+    # 1) Create Datacenter(s) and Cloud
+    datacenters = create_power_datacenter_from_file(train_dc_file, conf.pue_file, conf.br_cost_file, conf.solar_file)
+    cloud = create_cloud(datacenters, agent, evaluation=False)
+
+    # 2) Create VM(s) either manually or from a file
+    vms = create_vms(train_vm_file)
+    # vms = create_vms()
+
+    # 3) Create a Broker and submit VMs to it
+    broker = create_broker(cloud)
+    broker.submit_vm_list(vms)
+    cloud.set_broker(broker)
+
+    # 4) Create and initialize simulation environment and event processors
+    sim_time = conf.sim_time
+    sim = PyCloudSim(sim_time, broker, cloud, vms)
+
     # Train for num_epi episodes
     for i in range(conf.num_epi):
         print(f'starting episode {i}')
         if conf.enable_log:
-            enable_logging(train_log_file)
+            enable_logging(train_log_file, conf.log_in_background)
             log('INFO', 0, f'Initializing PyCloudSim...')
 
         # Initialize episode
-        # 1) Create Datacenter(s) and Cloud
-        datacenters = create_power_datacenter_from_file(train_dc_file, conf.pue_file, conf.br_cost_file, conf.solar_file)
-        cloud = create_cloud(datacenters, agent, evaluation=False)
-
-        # 2) Create VM(s) either manually or from a file
-        vms = create_vms(train_vm_file)
-        # vms = create_vms()
-
-        # 3) Create a Broker and submit VMs to it
-        broker = create_broker(cloud)
-        broker.submit_vm_list(vms)
-        cloud.set_broker(broker)
-
-        # 4) Create and initialize simulation environment and event processors
-        sim_time = conf.sim_time
-        sim = PyCloudSim(sim_time, broker, cloud, vms)
+        if i > 0:
+            sim.reset()
 
         # 5) Start the simulation
         sim.start_simulation()
@@ -99,13 +104,23 @@ if __name__ == '__main__':
         sim.stop_simulation()
 
     # 6) Plot the results
-    power_readings, num_vms, num_rejected, rewards = parse(train_log_file)
+    stop_logging()
+    metrics = sim.get_metrics()
+    power_readings, num_vms, num_rejected, rewards = metrics.to_results() if metrics is not None else parse(
+        train_log_file)
     plot_results(power_readings, num_vms, num_rejected, agent.reward_buffers[0])
 
+    # Export the trained policy, so that it can be evaluated without TensorFlow (see Config.ppo_policy_file). It is
+    # checked against the agent on the states of the last episode, and a failed export does not stop the evaluation
+    try:
+        export_ppo_policy(agent, 'ppo_policy.npz', cloud.get_dc_selection_policy().get_states())
+    except Exception as err:
+        log('ERROR', 0, f'Unable to export the trained policy. Unexpected {err=}, {type(err)=}')
+
     # Run an episode for evaluation
 
     if conf.enable_log:
-        enable_logging(eval_log_file)
+        enable_logging(eval_log_file, conf.log_in_background)
         log('INFO', 0, f'Initializing PyCloudSim...')
 
     # 1) Create Datacenter(s) and Cloud
@@ -132,5 +147,8 @@ if __name__ == '__main__':
     sim.stop_simulation()
 
     # 6) Plot the results
-    power_readings, num_vms, num_rejected, rewards = parse(eval_log_file)
+    stop_logging()
+    metrics = sim.get_metrics()
+    power_readings, num_vms, num_rejected, rewards = metrics.to_results() if metrics is not None else parse(
+        eval_log_file)
     plot_results(power_readings, num_vms, num_rejected, agent.reward_buffers[0])
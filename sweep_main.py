@@ -0,0 +1,30 @@
+"""
+Title:          PyCloudSim
+Description:    A Python-based Cloud Simulator
+Author(s):      Mahmoud Momtazpour
+Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
+Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
+"""
+
+import time
+
+from Config import Config as conf
+from utils.sweep import RESULT_FIELDS, expand_grid, run_sweep, write_results
+
+
+if __name__ == '__main__':
+    # 1) Expand the grid of experiments
+    cells = expand_grid(conf.sweep_dc_selection_policies, conf.sweep_vm_allocation_policies, conf.sweep_dc_files,
+                        conf.sweep_vm_files, conf.sweep_seeds)
+    print(f'Running {len(cells)} simulations...')
+
+    # 2) Run them in parallel
+    start = time.perf_counter()
+    results = run_sweep(cells, conf.pue_file, conf.br_cost_file, conf.solar_file, conf.sim_time, conf.sweep_num_vms,
+                        conf.sweep_workers)
+    print(f'Finished in {time.perf_counter() - start:.1f}s.')
+
+    # 3) Gather the results into one table
+    write_results(results, conf.sweep_results_file)
+    for result in results:
+        print(', '.join(f'{field}={result[field]}' for field in RESULT_FIELDS))
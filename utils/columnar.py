@@ -0,0 +1,158 @@
+"""
+Title:          PyCloudSim
+Description:    A Python-based Cloud Simulator
+Author(s):      Mahmoud Momtazpour
+Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
+Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
+"""
+
+import argparse
+from csv import reader
+from itertools import islice
+from typing import Iterator
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+# Fixed-width record of a VM request (64 bytes per VM)
+VM_DTYPE = np.dtype([('vm_id', '<i8'), ('user_id', '<i8'), ('mips', '<f8'), ('ram', '<f8'), ('bw', '<f8'),
+                     ('storage', '<f8'), ('arrival_time', '<f8'), ('duration', '<f8')])
+
+# Power traces (pue, solar, brown price) are stored as a (num_dcs x trace_length) matrix of this type
+TRACE_DTYPE = np.dtype('<f8')
+
+BINARY_SUFFIX = '.npy'
+
+
+def is_binary_file(file_name: str) -> bool:
+    """Check if a workload or trace file is in the binary columnar format
+    :param file_name: path to the file
+    :return: True if the file is a binary (.npy) file
+    :rtype: bool
+    """
+    return str(file_name).endswith(BINARY_SUFFIX)
+
+
+def read_vm_csv_chunks(csv_file: str, chunk_size: int) -> Iterator[dict]:
+    """Parse a VM csv file in chunks of rows, converting each chunk to typed columns at once
+    :param csv_file: path to the csv file
+    :param chunk_size: number of rows parsed at once
+    :return: an iterator over dictionaries that map column names to numpy arrays
+    :rtype: Iterator[dict<str, ndarray>]
+    """
+    with open(csv_file, mode='r') as file:
+        header = [name.strip() for name in next(reader(file))]
+        usecols = [header.index(name) for name in VM_DTYPE.names]
+        while True:
+            lines = list(islice(file, chunk_size))
+            if not lines:
+                break
+            data = np.loadtxt(lines, delimiter=',', usecols=usecols, ndmin=2)
+            if len(data) == 0:
+                continue
+            columns = {name: data[:, i] for i, name in enumerate(VM_DTYPE.names)}
+            columns['vm_id'] = columns['vm_id'].astype(VM_DTYPE['vm_id'])
+            columns['user_id'] = columns['user_id'].astype(VM_DTYPE['user_id'])
+            yield columns
+
+
+def read_vm_binary_chunks(npy_file: str, chunk_size: int) -> Iterator[dict]:
+    """Read a binary VM file in chunks of rows. The file is memory-mapped, so only the pages of the current chunk are
+    loaded and the columns are views into the mapped file
+    :param npy_file: path to the binary file
+    :param chunk_size: number of rows read at once
+    :return: an iterator over dictionaries that map column names to numpy arrays
+    :rtype: Iterator[dict<str, ndarray>]
+    """
+    vms = load_vms(npy_file)
+    for start in range(0, len(vms), chunk_size):
+        chunk = vms[start:start + chunk_size]
+        yield {name: chunk[name] for name in VM_DTYPE.names}
+
+
+def load_vms(npy_file: str) -> np.ndarray:
+    """Memory-map a binary VM file read-only. The mapping can be shared by several processes
+    :param npy_file: path to the binary file
+    :return: a structured array with VM_DTYPE records
+    :rtype: ndarray
+    :raise: raises ValueError if the file does not contain VM records
+    """
+    vms = np.load(npy_file, mmap_mode='r')
+    if vms.dtype != VM_DTYPE or vms.ndim != 1:
+        raise ValueError(f'{npy_file} is not a binary VM file.')
+    return vms
+
+
+def load_trace(npy_file: str) -> np.ndarray:
+    """Memory-map a binary power trace file read-only. The mapping can be shared by several processes
+    :param npy_file: path to the binary file
+    :return: a (num_dcs x trace_length) matrix, one row per datacenter
+    :rtype: ndarray
+    :raise: raises ValueError if the file does not contain a trace matrix
+    """
+    trace = np.load(npy_file, mmap_mode='r')
+    if trace.dtype != TRACE_DTYPE or trace.ndim != 2:
+        raise ValueError(f'{npy_file} is not a binary trace file.')
+    return trace
+
+
+def convert_vm_file(csv_file: str, npy_file: str, chunk_size: int = 100000) -> int:
+    """Convert a VM csv file (vm_id,user_id,mips,ram,bw,storage,arrival_time,duration) to the binary format. The csv
+    file is converted in chunks, so files larger than memory can be converted
+    :param csv_file: path to the csv file
+    :param npy_file: path to the binary file to be written
+    :param chunk_size: number of rows converted at once
+    :return: number of converted VMs
+    :rtype: int
+    """
+    with open(csv_file, mode='r') as file:
+        num_vms = sum(1 for line in file if line.strip()) - 1
+    vms = open_memmap(npy_file, mode='w+', dtype=VM_DTYPE, shape=(max(num_vms, 0),))
+    start = 0
+    for columns in read_vm_csv_chunks(csv_file, chunk_size):
+        end = start + len(columns['vm_id'])
+        for name in VM_DTYPE.names:
+            vms[name][start:end] = columns[name]
+        start = end
+    vms.flush()
+    del vms
+    return start
+
+
+def read_trace_csv(csv_file: str) -> np.ndarray:
+    """Parse a power trace csv file (one row of values per datacenter) into a matrix
+    :param csv_file: path to the csv file
+    :return: a (num_dcs x trace_length) matrix, one row per datacenter
+    :rtype: ndarray
+    :raise: raises ValueError if the rows do not have the same length
+    """
+    with open(csv_file, mode='r') as file:
+        rows = [np.asarray(row, dtype=TRACE_DTYPE) for row in reader(file) if row]
+    if len({len(row) for row in rows}) > 1:
+        raise ValueError(f'All rows of {csv_file} should have the same length.')
+    return np.vstack(rows) if rows else np.empty((0, 0), dtype=TRACE_DTYPE)
+
+
+def convert_trace_file(csv_file: str, npy_file: str) -> tuple:
+    """Convert a power trace csv file (one row of values per datacenter) to the binary format
+    :param csv_file: path to the csv file
+    :param npy_file: path to the binary file to be written
+    :return: shape of the converted trace
+    :rtype: tuple(int, int)
+    :raise: raises ValueError if the rows do not have the same length
+    """
+    trace = read_trace_csv(csv_file)
+    np.save(npy_file, trace)
+    return trace.shape
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Convert csv workloads and power traces to the binary format.')
+    parser.add_argument('kind', choices=['vms', 'trace'], help='type of the csv file')
+    parser.add_argument('csv_file', help='path to the csv file')
+    parser.add_argument('npy_file', help='path to the binary file to be written')
+    args = parser.parse_args()
+    if args.kind == 'vms':
+        print(f'Converted {convert_vm_file(args.csv_file, args.npy_file)} VMs.')
+    else:
+        print(f'Converted a trace of shape {convert_trace_file(args.csv_file, args.npy_file)}.')
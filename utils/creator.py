@@ -1,73 +1,143 @@
-import random
+from typing import TYPE_CHECKING, Iterator
 
-from tensorforce import Agent
+import numpy as np
 
 
-from utils.logger import log
+from utils.logger import Logger, log
 from Config import Config as conf
-from csv import DictReader, reader
+from csv import DictReader
 from core.Broker import Broker
 from core.Cloud import Cloud
 from core.VM import VM
+from core.VMTable import VMTable
+from core.VMList import VMList
 from core.Datacenter import Datacenter
 from core.Host import Host
-from dc_selection.DCSelectionPolicyLeastPower import DCSelectionPolicyLeastPower
-from dc_selection.DCSelectionPolicyFirstFit import DCSelectionPolicyFirstFit
-from dc_selection.DCSelectionPolicyRoundRobin import DCSelectionPolicyRoundRobin
-from dc_selection.DCSelectionPolicyPPO import DCSelectionPolicyPPO
-from dc_selection.DCSelectionPolicyLeastCost import DCSelectionPolicyLeastCost
-from dc_selection.DCSelectionPolicyMaxGreen import DCSelectionPolicyMaxGreen
+from core.SimConfig import SimConfig
+from dc_selection import get_dc_selection_policy
 from power.PowerDatacenter import PowerDatacenter
 from power.PowerHost import PowerHost
 from power.models.PowerModelLinear import PowerModelLinear
-from provisioner.BwProvisioner import BwProvisioner
-from provisioner.MipsProvisioner import MipsProvisioner
-from provisioner.RamProvisioner import RamProvisioner
-from provisioner.StorageProvisioner import StorageProvisioner
-from vm_allocation.VMAllocationPolicyLeastMips import VMAllocationPolicyLeastMips
-from vm_allocation.VMAllocationPolicyFirstFit import VMAllocationPolicyFirstFit
+from utils.columnar import is_binary_file, read_vm_binary_chunks, read_vm_csv_chunks
+from utils.generator import generate_vm_chunks, generate_vms
+from utils.trace_store import get_trace_store
+from provisioner.VectorProvisioner import VectorProvisioner
+from vm_allocation import get_vm_allocation_policy
 
+if TYPE_CHECKING:
+    from tensorforce import Agent
+    from dc_selection.PPONumpyPolicy import PPONumpyPolicy
+    from vm_allocation.VMAllocationPolicy import VMAllocationPolicy
 
-def create_vms(vm_file: str = None) -> list[VM]:
-    """Create some VMs by importing from a file, or manually if vm_file is not specified
+
+def create_vms(vm_file: str = None, seed: int = None, config: SimConfig = None) -> VMList:
+    """Create some VMs by importing from a file, or randomly if vm_file is not specified. The VMs are kept in a single
+    VMTable, and the returned list creates their VM instances only when they are accessed
     :param vm_file: a string that includes the path to the file
     :type vm_file: str
+    :param seed: seed of the random VMs (a different workload in each call if not specified)
+    :type seed: int
+    :param config: configuration of the simulation (resolved from Config if not specified)
+    :type config: SimConfig
     :return: list of vms
-    :rtype: list[VM]
+    :rtype: VMList
     :raise: raises exception if importing vm_list file fails
     """
+    config = config if config is not None else SimConfig.from_config()
+    logger = Logger.from_config(config)
     if vm_file is None:
-        log('INFO', 0, f'Creating some random VMs manually.')
-        vm_list = []
+        logger.log('INFO', 0, f'Creating some random VMs manually.')
         num_vms = 100
-        log('INFO', 0, f'Creating {num_vms} VMs.')
-        # adding some VMs
-        mips = 100  # host MIPS
-        ram = 256  # host memory(MB)
-        storage = 100000  # host storage (MB)
-        bw = 1000  # host network bandwidth (MB/s)
-        user_id = 1  # same user ID for all VMs
-        arrival_time = 10  # max arrival time for all VMs, should be greater than 1
-        duration = 10  # max duration for all VMs
-        for vm_id in range(num_vms):
-            vm_list.append(VM(vm_id, user_id, random.randint(1, mips), random.randint(1, ram), random.randint(1, bw),
-                              random.randint(1, storage), random.randint(1, arrival_time), random.randint(1, duration)))
-        return vm_list
+        logger.log('INFO', 0, f'Creating {num_vms} VMs.')
+        # 10 arrivals per second with a mean duration of 5 seconds
+        vms = generate_vms(num_vms, seed=seed, arrival_rate=10, duration_distribution='exponential', mean_duration=5,
+                           first_vm_id=0)
+        return _create_vms_from_columns({name: vms[name] for name in vms.dtype.names}, VMTable())
     else:
-        log('INFO', 0, f'Importing VMs from file.')
-        vm_list = []
+        logger.log('INFO', 0, f'Importing VMs from file.')
+        vm_table = VMTable()
         try:
-            with open(vm_file, mode='r') as vm_file:
-                vm_dict = DictReader(vm_file)
-                for row in vm_dict:
-                    vm_list.append(
-                        VM(row['vm_id'], row['user_id'], float(row['mips']), float(row['ram']), float(row['bw']),
-                           float(row['storage']), float(row['arrival_time']),
-                           float(row['duration'])))
+            for columns in _read_vm_chunks(vm_file, config.vm_chunk_size):
+                vm_table.add_vms(columns)
         except Exception as err:
-            log('ERROR', 0, f'Unable to import VMs from file. Unexpected {err=}, {type(err)=}')
+            logger.log('ERROR', 0, f'Unable to import VMs from file. Unexpected {err=}, {type(err)=}')
             raise Exception(f'Unable to import VMs from file. Unexpected {err=}, {type(err)=}')
-        return vm_list
+        return VMList(vm_table)
+
+
+def stream_vms(vm_file: str, chunk_size: int = None, config: SimConfig = None) -> Iterator[VM]:
+    """Lazily import VMs from a file sorted by arrival time. The file is parsed in chunks of chunk_size rows, so the
+    simulation can start as soon as the first chunk is parsed and memory use is bounded by the chunk size
+    :param vm_file: a string that includes the path to the file
+    :type vm_file: str
+    :param chunk_size: number of rows parsed at once (config.vm_chunk_size if not specified)
+    :type chunk_size: int
+    :param config: configuration of the simulation (resolved from Config if not specified)
+    :type config: SimConfig
+    :return: an iterator over vms in order of arrival time
+    :rtype: Iterator[VM]
+    :raise: raises exception if importing vm_list file fails or the file is not sorted by arrival time
+    """
+    config = config if config is not None else SimConfig.from_config()
+    logger = Logger.from_config(config)
+    logger.log('INFO', 0, f'Streaming VMs from file.')
+    last_arrival_time = -np.inf
+    try:
+        for columns in _read_vm_chunks(vm_file, chunk_size or config.vm_chunk_size):
+            # rows with equal arrival times keep their file order
+            order = np.argsort(columns['arrival_time'], kind='stable')
+            columns = {name: column[order] for name, column in columns.items()}
+            if columns['arrival_time'][0] < last_arrival_time:
+                raise ValueError('VM file is not sorted by arrival time.')
+            last_arrival_time = columns['arrival_time'][-1]
+            yield from _create_vms_from_columns(columns, VMTable())
+    except Exception as err:
+        logger.log('ERROR', 0, f'Unable to import VMs from file. Unexpected {err=}, {type(err)=}')
+        raise Exception(f'Unable to import VMs from file. Unexpected {err=}, {type(err)=}')
+
+
+def stream_generated_vms(num_vms: int, chunk_size: int = None, seed: int = None, config: SimConfig = None,
+                         **kwargs) -> Iterator[VM]:
+    """Lazily generate a synthetic workload (see utils.generator.generate_vm_chunks for the distributions and their
+    parameters). Only one chunk is in memory at a time, so very large workloads can be simulated without writing them
+    to disk
+    :param num_vms: number of VMs
+    :type num_vms: int
+    :param chunk_size: number of VMs generated at once (config.vm_chunk_size if not specified)
+    :type chunk_size: int
+    :param seed: seed of the random number generator
+    :type seed: int
+    :param config: configuration of the simulation (resolved from Config if not specified)
+    :type config: SimConfig
+    :return: an iterator over vms in order of arrival time
+    :rtype: Iterator[VM]
+    """
+    config = config if config is not None else SimConfig.from_config()
+    Logger.from_config(config).log('INFO', 0, f'Streaming {num_vms} generated VMs.')
+    for chunk in generate_vm_chunks(num_vms, chunk_size or config.vm_chunk_size, seed, **kwargs):
+        yield from _create_vms_from_columns({name: chunk[name] for name in chunk.dtype.names}, VMTable())
+
+
+def _read_vm_chunks(vm_file: str, chunk_size: int) -> Iterator[dict]:
+    """Parse a VM file (csv or binary) in chunks of rows, converting each chunk to typed columns at once
+    :param vm_file: a string that includes the path to the file
+    :param chunk_size: number of rows parsed at once
+    :return: an iterator over dictionaries that map column names to numpy arrays
+    :rtype: Iterator[dict<str, ndarray>]
+    """
+    if is_binary_file(vm_file):
+        return read_vm_binary_chunks(vm_file, chunk_size)
+    return read_vm_csv_chunks(vm_file, chunk_size)
+
+
+def _create_vms_from_columns(columns: dict, vm_table: VMTable) -> VMList:
+    """Create VMs from typed columns
+    :param columns: a dictionary that maps column names to numpy arrays
+    :param vm_table: the table that stores the created VMs
+    :return: list of vms
+    :rtype: VMList
+    """
+    return VMList(vm_table, vm_table.add_vms(columns))
 
 
 def create_datacenter() -> list[Datacenter]:
@@ -88,15 +158,12 @@ def create_datacenter() -> list[Datacenter]:
     for dc_id in range(num_dcs):
         host_list = []
         for host_id in range(num_hosts):
-            ram_provisioner = RamProvisioner(ram)
-            mips_provisioner = MipsProvisioner(mips)
-            storage_provisioner = StorageProvisioner(storage)
-            bw_provisioner = BwProvisioner(bw)
-            host_list.append(Host(host_id, ram_provisioner, bw_provisioner, storage_provisioner, mips_provisioner))
+            provisioner = VectorProvisioner(mips, ram, bw, storage)
+            host_list.append(Host(host_id, provisioner))
         datacenter_attributes = {'arch': 'x86', 'os': 'Linux', 'time_zone': 10.0,
                                  'cost_per_mips': 3.0, 'cost_per_ram': 0.05, 'cost_per_storage': 0.001,
                                  'cost_per_bw': 0.0}
-        vm_allocation_policy = VMAllocationPolicyLeastMips(host_list)
+        vm_allocation_policy = get_vm_allocation_policy('LeastMips')(host_list)
         dc_list.append(Datacenter(dc_id, datacenter_attributes, vm_allocation_policy, host_list))
     return dc_list
 
@@ -123,81 +190,96 @@ def create_power_datacenter() -> list[PowerDatacenter]:
     for dc_id in range(num_dcs):
         host_list = []
         for host_id in range(num_hosts):
-            ram_provisioner = RamProvisioner(ram)
-            mips_provisioner = MipsProvisioner(mips)
-            storage_provisioner = StorageProvisioner(storage)
-            bw_provisioner = BwProvisioner(bw)
+            provisioner = VectorProvisioner(mips, ram, bw, storage)
             power_model = PowerModelLinear(max_power, stat_power, mips_power_ratio, ram_power_ratio,
                                            bw_power_ratio, storage_power_ratio)
             host_list.append(
-                PowerHost(host_id, ram_provisioner, bw_provisioner, storage_provisioner, mips_provisioner, power_model))
-        match vm_allocation_policy:
-            case 'FirstFit':
-                vm_allocation_policy = VMAllocationPolicyFirstFit(host_list)
-            case 'LeastMips':
-                vm_allocation_policy = VMAllocationPolicyLeastMips(host_list)
-            case _:
-                raise ValueError('VM allocation policy not implemented')
+                PowerHost(host_id, provisioner, power_model))
         dc_list.append(
-            PowerDatacenter(dc_id, datacenter_attributes, vm_allocation_policy, host_list))
+            PowerDatacenter(dc_id, datacenter_attributes, _create_vm_allocation_policy(vm_allocation_policy, host_list),
+                            host_list))
     return dc_list
 
 
-def create_power_datacenter_from_file(dc_file: str, pue_file: str, br_cost_file: str, solar_file: str) -> list[
-    PowerDatacenter]:
-    log('INFO', 0, f'Importing datacenters and their hosts from file.')
+def create_power_datacenter_from_file(dc_file: str, pue_file: str, br_cost_file: str, solar_file: str,
+                                      vm_allocation_policy: str = None,
+                                      config: SimConfig = None) -> list[PowerDatacenter]:
+    """Import datacenters, their hosts and their power traces from files
+    :param dc_file: path to the csv file of datacenters and their hosts
+    :type dc_file: str
+    :param pue_file: path to the pue trace file
+    :type pue_file: str
+    :param br_cost_file: path to the brown energy price trace file
+    :type br_cost_file: str
+    :param solar_file: path to the solar power trace file
+    :type solar_file: str
+    :param vm_allocation_policy: name of the VM allocation policy of the datacenters (config.vm_allocation_policy if
+    not specified)
+    :type vm_allocation_policy: str
+    :param config: configuration of the simulation (resolved from Config if not specified)
+    :type config: SimConfig
+    :return: list of datacenters
+    :rtype: list[PowerDatacenter]
+    :raise: raises exception if importing the files fails
+    """
+    config = config if config is not None else SimConfig.from_config()
+    logger = Logger.from_config(config)
+    logger.log('INFO', 0, f'Importing datacenters and their hosts from file.')
+    vm_allocation_policy = vm_allocation_policy if vm_allocation_policy is not None else config.vm_allocation_policy
     dc_list = []
     dc_list_dict = {}
     try:
-        with open(dc_file, mode='r') as dc_file, open(pue_file, mode='r') as pue_file, \
-                open(br_cost_file, mode='r') as br_cost_file, open(solar_file, mode='r') as solar_file:
+        trace_store = get_trace_store()
+        with open(dc_file, mode='r') as dc_file:
             dc_dict = DictReader(dc_file)
-            pue_list = list(reader(pue_file))
-            br_cost_list = list(reader(br_cost_file))
-            solar_list = list(reader(solar_file))
             host_id_start = dict()
             for row in dc_dict:
                 host_list = []
                 if row['dc_id'] not in host_id_start:
                     host_id_start[row['dc_id']] = 0
                 for host_id in range(host_id_start[row['dc_id']], host_id_start[row['dc_id']] + int(row['num_host'])):
-                    ram_provisioner = RamProvisioner(float(row['ram']))
-                    mips_provisioner = MipsProvisioner(float(row['mips']))
-                    storage_provisioner = StorageProvisioner(float(row['storage']))
-                    bw_provisioner = BwProvisioner(float(row['bw']))
+                    provisioner = VectorProvisioner(float(row['mips']), float(row['ram']), float(row['bw']),
+                                                    float(row['storage']))
                     power_model = PowerModelLinear(float(row['max_power']), float(row['stat_power']),
                                                    float(row['mips_pr']), float(row['ram_pr']),
-                                                   float(row['bw_pr']), float(row['storage_pr']))
+                                                   float(row['bw_pr']), float(row['storage_pr']), config.eps,
+                                                   config.consolidation)
                     host_list.append(
-                        PowerHost(host_id, ram_provisioner, bw_provisioner, storage_provisioner, mips_provisioner,
-                                  power_model))
+                        PowerHost(host_id, provisioner, power_model))
                 if row['dc_id'] in dc_list_dict.keys():
                     dc_list_dict[row['dc_id']][0].extend(host_list)
                 else:
-                    dc_attributes = conf.dc_attributes
-                    dc_attributes['battery'] = float(row['battery'])
+                    dc_attributes = {**config.dc_attributes, 'battery': float(row['battery'])}
                     dc_power_traces = dict()
-                    dc_power_traces['solar'] = solar_list[int(row['dc_id']) - 1]
-                    dc_power_traces['br_cost'] = br_cost_list[int(row['dc_id']) - 1]
-                    dc_power_traces['pue'] = pue_list[int(row['dc_id']) - 1]
-                    match conf.vm_allocation_policy:
-                        case 'FirstFit':
-                            vm_allocation_policy = VMAllocationPolicyFirstFit(host_list)
-                        case 'LeastMips':
-                            vm_allocation_policy = VMAllocationPolicyLeastMips(host_list)
-                        case _:
-                            raise ValueError('VM allocation policy not implemented')
-                    dc_list_dict[row['dc_id']] = [host_list, dc_attributes, dc_power_traces, vm_allocation_policy]
+                    dc_power_traces['solar'] = trace_store.get_row(solar_file, int(row['dc_id']) - 1)
+                    dc_power_traces['br_cost'] = trace_store.get_row(br_cost_file, int(row['dc_id']) - 1)
+                    dc_power_traces['pue'] = trace_store.get_row(pue_file, int(row['dc_id']) - 1)
+                    dc_list_dict[row['dc_id']] = [host_list, dc_attributes, dc_power_traces]
                 host_id_start[row['dc_id']] += len(host_list)
+            # the allocation policies index the hosts of their datacenter, so they are only created once the hosts of
+            # all rows of the datacenter are known
             for key, value in dc_list_dict.items():
+                dc_vm_allocation_policy = _create_vm_allocation_policy(vm_allocation_policy, value[0])
                 dc_list.append(
-                    PowerDatacenter(key, value[1], value[2], value[3], value[0]))
+                    PowerDatacenter(key, value[1], value[2], dc_vm_allocation_policy, value[0]))
     except Exception as err:
-        log('ERROR', 0, f'Unable to import datacenters from file. Unexpected {err=}, {type(err)=}')
+        logger.log('ERROR', 0, f'Unable to import datacenters from file. Unexpected {err=}, {type(err)=}')
         raise Exception(f'Unable to import datacenters from file. Unexpected {err=}, {type(err)=}')
     return dc_list
 
 
+def _create_vm_allocation_policy(vm_allocation_policy: str, host_list: list[Host]) -> 'VMAllocationPolicy':
+    """Create a VM allocation policy by its name
+    :param vm_allocation_policy: name of the policy
+    :type vm_allocation_policy: str
+    :param host_list: list of hosts within the datacenter
+    :type host_list: list[Host]
+    :return: VM allocation policy
+    :rtype: VMAllocationPolicy
+    """
+    return get_vm_allocation_policy(vm_allocation_policy)(host_list)
+
+
 def create_broker(cloud: Cloud) -> Broker:
     """Create a broker that submits VMs to the cloud
     :param cloud: a handle to cloud object
@@ -209,32 +291,34 @@ def create_broker(cloud: Cloud) -> Broker:
     return Broker(cloud)
 
 
-def create_cloud(dc_list: list[PowerDatacenter], agent: Agent = None, evaluation: bool = False) -> Cloud:
+def create_cloud(dc_list: list[PowerDatacenter], agent: 'Agent | PPONumpyPolicy' = None,
+                 evaluation: bool = False, dc_selection_policy: str = None, config: SimConfig = None) -> Cloud:
     """Create a cloud from the list of data centers
     :param dc_list: list of datacenters
     :type dc_list: list[Datacenter]
-    :param agent: RL agent
+    :param agent: RL agent, or a policy exported from it. If not given, the policy in config.ppo_policy_file is
+    evaluated
     :type agent: RLAgent
     :param evaluation: determines if we are in Evaluation phase or not
     :type agent: bool
+    :param dc_selection_policy: name of the DC selection policy (config.dc_selection_policy if not specified)
+    :type dc_selection_policy: str
+    :param config: configuration of the simulation (resolved from Config if not specified)
+    :type config: SimConfig
     :return: cloud
     :rtype: Cloud
     """
-    log('INFO', 0, f'Creating the cloud.')
+    config = config if config is not None else SimConfig.from_config()
+    Logger.from_config(config).log('INFO', 0, f'Creating the cloud.')
     cloud_attributes = {'cloud_id': 1}
-    match conf.dc_selection_policy:
-        case 'FirstFit':
-            dc_selection_policy = DCSelectionPolicyFirstFit(dc_list)
-        case 'RoundRobin':
-            dc_selection_policy = DCSelectionPolicyRoundRobin(dc_list)
-        case 'PPO':
-            dc_selection_policy = DCSelectionPolicyPPO(dc_list, agent, evaluation)
-        case 'LeastPower':
-            dc_selection_policy = DCSelectionPolicyLeastPower(dc_list)
-        case 'LeastCost':
-            dc_selection_policy = DCSelectionPolicyLeastCost(dc_list)
-        case 'MaxGreen':
-            dc_selection_policy = DCSelectionPolicyMaxGreen(dc_list)
-        case _:
-            raise ValueError('DC selection policy not implemented')
+    name = dc_selection_policy if dc_selection_policy is not None else config.dc_selection_policy
+    policy_class = get_dc_selection_policy(name)
+    if name == 'PPO':
+        if agent is None and config.ppo_policy_file is not None:
+            from dc_selection.PPONumpyPolicy import PPONumpyPolicy
+            agent = PPONumpyPolicy.load(config.ppo_policy_file)
+            evaluation = True
+        dc_selection_policy = policy_class(dc_list, agent, evaluation)
+    else:
+        dc_selection_policy = policy_class(dc_list)
     return Cloud(cloud_attributes, dc_list, dc_selection_policy)
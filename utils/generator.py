@@ -0,0 +1,169 @@
+"""
+Title:          PyCloudSim
+Description:    A Python-based Cloud Simulator
+Author(s):      Mahmoud Momtazpour
+Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
+Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
+"""
+
+import argparse
+from typing import Iterator
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from utils.columnar import VM_DTYPE, is_binary_file
+
+# VM flavors as (mips, ram, bw, storage) and their relative frequencies, taken from csv/vms_test.csv
+DEFAULT_FLAVORS = np.array([(1, 1.7, 160, 0), (1, 3.75, 4, 0), (16, 30, 320, 0), (16, 122, 3200, 0),
+                            (16, 122, 320, 0), (8, 15, 160, 0), (8, 68.4, 1680, 0), (4, 7.5, 80, 0),
+                            (4, 30.5, 80, 0), (4, 34.2, 850, 0)])
+DEFAULT_FLAVOR_WEIGHTS = np.array([24, 13, 10, 8, 6, 5, 4, 4, 4, 3])
+
+DAY = 86400
+# resolution (in seconds) of the inverse of the cumulative diurnal arrival rate
+_DIURNAL_GRID = 60
+CSV_FORMAT = ['%d', '%d', '%.10g', '%.10g', '%.10g', '%.10g', '%d', '%d']
+
+
+def generate_vm_chunks(num_vms: int, chunk_size: int = 1000000, seed: int = None, arrival_rate: float = 1.0,
+                       diurnal_amplitude: float = 0.0, peak_time: float = DAY / 2, start_time: int = 1,
+                       duration_distribution: str = 'lognormal', mean_duration: float = 3600,
+                       duration_shape: float = 1.0, min_duration: int = 1, max_duration: int = None,
+                       flavors: np.ndarray = None, flavor_weights: np.ndarray = None, user_id: int = 1,
+                       first_vm_id: int = 1) -> Iterator[np.ndarray]:
+    """Generate a synthetic workload in chunks, drawing whole columns at once. VMs arrive as a Poisson process whose
+    rate follows a daily cycle, their durations are drawn from a (possibly heavy-tailed) distribution and their sizes
+    from a mix of flavors. Each column is drawn from its own random stream, so the generated workload only depends on
+    the seed and not on the chunk size
+    :param num_vms: number of VMs
+    :param chunk_size: number of VMs generated at once
+    :param seed: seed of the random number generator (a random workload if not specified)
+    :param arrival_rate: mean number of arrivals per second
+    :param diurnal_amplitude: relative amplitude of the daily cycle of the arrival rate, in [0, 1]
+    :param peak_time: time of the day (in seconds) at which the arrival rate peaks
+    :param start_time: earliest arrival time
+    :param duration_distribution: distribution of durations, 'exponential', 'lognormal' or 'pareto'
+    :param mean_duration: mean duration of VMs (before rounding and clipping)
+    :param duration_shape: sigma of the lognormal or alpha (> 1) of the pareto distribution
+    :param min_duration: minimum duration of VMs
+    :param max_duration: maximum duration of VMs (unbounded if not specified)
+    :param flavors: (mips, ram, bw, storage) of VM flavors, DEFAULT_FLAVORS if not specified
+    :param flavor_weights: relative frequencies of flavors (DEFAULT_FLAVOR_WEIGHTS for the default flavors, uniform
+    otherwise)
+    :param user_id: user id of all VMs
+    :param first_vm_id: id of the first VM, the others are numbered consecutively
+    :return: an iterator over structured arrays of VM_DTYPE records sorted by arrival time
+    :rtype: Iterator[ndarray]
+    :raise: raises ValueError if a parameter is out of its range
+    """
+    if num_vms < 0 or chunk_size <= 0 or arrival_rate <= 0 or mean_duration <= 0:
+        raise ValueError('Number of VMs, chunk size, arrival rate and mean duration should be positive.')
+    if not 0 <= diurnal_amplitude <= 1:
+        raise ValueError('Diurnal amplitude should be in [0, 1].')
+    if flavors is None:
+        flavors = DEFAULT_FLAVORS
+        flavor_weights = DEFAULT_FLAVOR_WEIGHTS if flavor_weights is None else flavor_weights
+    flavors = np.asarray(flavors, dtype=np.float64).reshape(-1, 4)
+    probabilities = None if flavor_weights is None else np.asarray(flavor_weights, dtype=np.float64) / np.sum(
+        flavor_weights)
+    arrival_rng, duration_rng, flavor_rng = (np.random.default_rng(child) for child in
+                                             np.random.SeedSequence(seed).spawn(3))
+
+    # The arrival process is mapped to a unit rate one by the cumulative rate, which grows by one day worth of
+    # arrivals per day, so only its inverse over a single day is needed.
+    grid = np.arange(0, DAY + _DIURNAL_GRID, _DIURNAL_GRID, dtype=np.float64)
+    omega = 2 * np.pi / DAY
+    cumulative = grid + diurnal_amplitude / omega * (np.sin(omega * (grid - peak_time)) + np.sin(omega * peak_time))
+    last_arrival = 0.0
+    for first in range(0, num_vms, chunk_size):
+        n = min(chunk_size, num_vms - first)
+        chunk = np.zeros(n, dtype=VM_DTYPE)
+        chunk['vm_id'] = np.arange(first_vm_id + first, first_vm_id + first + n)
+        chunk['user_id'] = user_id
+
+        # the sum is continued from the previous chunk in the same order, so it does not depend on the chunk size
+        arrivals = np.cumsum(np.concatenate(([last_arrival], arrival_rng.standard_exponential(n))))[1:]
+        last_arrival = arrivals[-1]
+        arrivals /= arrival_rate
+        if diurnal_amplitude > 0:
+            days, remainder = np.divmod(arrivals, DAY)
+            arrivals = days * DAY + np.interp(remainder, cumulative, grid)
+        chunk['arrival_time'] = start_time + np.floor(arrivals)
+
+        match duration_distribution:
+            case 'exponential':
+                durations = duration_rng.exponential(mean_duration, n)
+            case 'lognormal':
+                durations = duration_rng.lognormal(np.log(mean_duration) - duration_shape ** 2 / 2, duration_shape, n)
+            case 'pareto':
+                if duration_shape <= 1:
+                    raise ValueError('Shape of the pareto distribution should be greater than 1.')
+                durations = mean_duration * (duration_shape - 1) / duration_shape * (
+                        1 + duration_rng.pareto(duration_shape, n))
+            case _:
+                raise ValueError('Duration distribution not implemented')
+        chunk['duration'] = np.clip(np.ceil(durations), min_duration, max_duration)
+
+        sizes = flavors[flavor_rng.choice(len(flavors), size=n, p=probabilities)]
+        chunk['mips'], chunk['ram'], chunk['bw'], chunk['storage'] = sizes.T
+        yield chunk
+
+
+def generate_vms(num_vms: int, seed: int = None, **kwargs) -> np.ndarray:
+    """Generate a synthetic workload at once (see generate_vm_chunks for the parameters)
+    :param num_vms: number of VMs
+    :param seed: seed of the random number generator
+    :return: a structured array of VM_DTYPE records sorted by arrival time
+    :rtype: ndarray
+    """
+    chunks = list(generate_vm_chunks(num_vms, chunk_size=max(num_vms, 1), seed=seed, **kwargs))
+    return chunks[0] if chunks else np.zeros(0, dtype=VM_DTYPE)
+
+
+def write_vms(vm_file: str, num_vms: int, chunk_size: int = 1000000, seed: int = None, **kwargs) -> int:
+    """Generate a synthetic workload and write it to a binary (.npy) or csv file chunk by chunk, so workloads larger
+    than memory can be written (see generate_vm_chunks for the parameters)
+    :param vm_file: path to the file to be written
+    :param num_vms: number of VMs
+    :param chunk_size: number of VMs generated and written at once
+    :param seed: seed of the random number generator
+    :return: number of written VMs
+    :rtype: int
+    """
+    chunks = generate_vm_chunks(num_vms, chunk_size=chunk_size, seed=seed, **kwargs)
+    start = 0
+    if is_binary_file(vm_file):
+        vms = open_memmap(vm_file, mode='w+', dtype=VM_DTYPE, shape=(num_vms,))
+        for chunk in chunks:
+            vms[start:start + len(chunk)] = chunk
+            start += len(chunk)
+        vms.flush()
+        del vms
+    else:
+        with open(vm_file, mode='w') as file:
+            file.write(','.join(VM_DTYPE.names) + '\n')
+            for chunk in chunks:
+                np.savetxt(file, chunk, fmt=CSV_FORMAT, delimiter=',')
+                start += len(chunk)
+    return start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate a synthetic workload.')
+    parser.add_argument('vm_file', help='path to the file to be written (.npy or .csv)')
+    parser.add_argument('--num-vms', type=int, default=100000, help='number of VMs')
+    parser.add_argument('--seed', type=int, default=None, help='seed of the random number generator')
+    parser.add_argument('--arrival-rate', type=float, default=1.0, help='mean number of arrivals per second')
+    parser.add_argument('--diurnal-amplitude', type=float, default=0.0, help='relative amplitude of the daily cycle')
+    parser.add_argument('--duration-distribution', default='lognormal', choices=['exponential', 'lognormal', 'pareto'],
+                        help='distribution of durations')
+    parser.add_argument('--mean-duration', type=float, default=3600, help='mean duration of VMs')
+    parser.add_argument('--duration-shape', type=float, default=1.0, help='sigma (lognormal) or alpha (pareto)')
+    parser.add_argument('--max-duration', type=int, default=None, help='maximum duration of VMs')
+    args = parser.parse_args()
+    count = write_vms(args.vm_file, args.num_vms, seed=args.seed, arrival_rate=args.arrival_rate,
+                      diurnal_amplitude=args.diurnal_amplitude, duration_distribution=args.duration_distribution,
+                      mean_duration=args.mean_duration, duration_shape=args.duration_shape,
+                      max_duration=args.max_duration)
+    print(f'Generated {count} VMs.')
@@ -1,53 +1,216 @@
+import gzip
 import logging
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+
 from Config import Config as conf
 
+LOG_FORMAT = '[%(levelname)8s]: %(message)6s'
+# logging levels of the kinds of messages
+_LEVELS = {'STAT': logging.INFO, 'INFO': logging.INFO, 'WARN': logging.WARNING, 'DEBUG': logging.DEBUG,
+           'ERROR': logging.ERROR}
+# kinds of messages that log_me only emits in verbose mode
+_VERBOSE_KINDS = frozenset(['INFO', 'DEBUG'])
+
 
-def enable_logging(log_file):
-    """Enable logging"""
-    logging.basicConfig(
-        force=True,
-        level=logging.INFO,
-        format='[%(levelname)8s]: %(message)6s',
-        filename=log_file, filemode="w")  # pass explicit filename here
-    logging.getLogger().addHandler(logging.StreamHandler())
+def enable_logging(log_file, background=False):
+    """Enable logging to a file (gzip-compressed if its name ends with .gz) and the console
+    :param log_file: path to the log file
+    :param background: if True, records are formatted and written by a background thread, so the simulation only
+    pays for putting them in a queue
+    """
+    sink = BufferedFileHandler(log_file)
+    sink.setFormatter(logging.Formatter(LOG_FORMAT))
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter())
+    if background:
+        handlers = [DeferredQueueHandler(SimpleQueue(), sink, console)]
+    else:
+        handlers = [sink, console]
+    logging.basicConfig(force=True, level=logging.INFO, handlers=handlers)
     logging.info('Logging enabled')
 
 
-def log_me(kind, time, sender, message, vm_id=None, dc_id=None, host_id=None):
-    if conf.enable_log:
-        msg = f'[{time}]'.ljust(8) + f'[{sender}]'.ljust(15) + f'[{message}]'.ljust(50) + (
-            f'[vm_id:{vm_id}]' if vm_id is not None else '').ljust(15) + (
-                  f'[dc_id: {dc_id}]' if dc_id is not None else '').ljust(15) + (
-                  f'[host_id: {host_id}]' if host_id is not None else '').ljust(15)
-        match kind:
-            case 'STAT':
-                logging.info(msg)
-            case 'INFO':
-                if conf.verbose:
-                    logging.info(msg)
-            case 'WARN':
-                logging.warning(msg)
-            case 'DEBUG':
-                if conf.verbose:
-                    logging.debug(msg)
-            case 'ERROR':
-                logging.error(msg)
-            case _:
-                logging.info(msg)
+def stop_logging():
+    """Flush and close the handlers of the root logger (waiting for a background writer to write all queued records),
+    e.g. before the log file is parsed"""
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+
+
+class BufferedFileHandler(logging.StreamHandler):
+    """ BufferedFileHandler class definition: It writes records to a (possibly gzip-compressed) file through a buffer,
+    instead of flushing the file after every record like logging.FileHandler. The buffer is written to the file when it
+    is full, or when the handler is flushed or closed
+    :ivar _log_file: path to the log file
+    :type _log_file: str
+    """
+    def __init__(self, log_file, buffer_size=1 << 20):
+        self._log_file = log_file
+        if str(log_file).endswith('.gz'):
+            stream = gzip.open(log_file, mode='wt', compresslevel=6)
+        else:
+            stream = open(log_file, mode='w', buffering=buffer_size)
+        super().__init__(stream)
+
+    def emit(self, record):
+        # like StreamHandler.emit, but without flushing the stream after the record
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        self.acquire()
+        try:
+            if self.stream is not None:
+                self.stream.close()
+                self.stream = None
+        finally:
+            self.release()
+            super().close()
+
+    def get_log_file(self):
+        return self._log_file
+
+
+class DeferredQueueHandler(QueueHandler):
+    """ DeferredQueueHandler class definition: It puts records in a queue that is drained by a background thread, which
+    formats and writes them to the given handlers. Unlike QueueHandler, records are not formatted before they are
+    queued: log messages are immutable, so formatting them later in the background gives the same result
+    :ivar _listener: the background thread that writes queued records
+    :type _listener: QueueListener
+    """
+    def __init__(self, queue, *handlers):
+        super().__init__(queue)
+        self._listener = QueueListener(queue, *handlers, respect_handler_level=True)
+        self._listener.start()
+
+    def prepare(self, record):
+        return record
+
+    def close(self):
+        """ Write all queued records, and close the handlers of the background thread """
+        if self._listener is not None:
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
+        super().close()
+
+
+class _Message:
+    """ A log message that is formatted only when a handler emits it. It only holds immutable values (ids, times and
+    numbers), so it can be formatted later, e.g. by a background thread """
+    __slots__ = ('_time', '_sender', '_message', '_args', '_vm_id', '_dc_id', '_host_id')
+
+    def __init__(self, time, sender, message, args, vm_id, dc_id, host_id):
+        self._time = time
+        self._sender = sender
+        self._message = message
+        self._args = args
+        self._vm_id = vm_id
+        self._dc_id = dc_id
+        self._host_id = host_id
+
+    def __str__(self):
+        message = self._message.format(*self._args) if self._args else self._message
+        if self._sender is None:
+            return f'[{self._time}]'.ljust(8) + message
+        return f'[{self._time}]'.ljust(8) + f'[{self._sender}]'.ljust(15) + f'[{message}]'.ljust(50) + (
+            f'[vm_id:{self._vm_id}]' if self._vm_id is not None else '').ljust(15) + (
+                   f'[dc_id: {self._dc_id}]' if self._dc_id is not None else '').ljust(15) + (
+                   f'[host_id: {self._host_id}]' if self._host_id is not None else '').ljust(15)
+
+
+def _emit(level, message):
+    # like logging.log, but without looking up the caller in the stack, which the log format does not use
+    root = logging.root
+    if root.isEnabledFor(level):
+        if not root.handlers:
+            logging.basicConfig()
+        root.handle(root.makeRecord(root.name, level, '(unknown file)', 0, message, None, None))
+
+
+def log_me(kind, time, sender, message, vm_id=None, dc_id=None, host_id=None, args=()):
+    if conf.enable_log and (conf.verbose or kind not in _VERBOSE_KINDS):
+        _emit(_LEVELS.get(kind, logging.INFO), _Message(time, sender, message, args, vm_id, dc_id, host_id))
 
 
 def log(kind, time, msg):
     if conf.enable_log:
-        msg = f'[{time}]'.ljust(8) + msg
-        match kind:
-            case 'INFO':
-                logging.info(msg),
-            case 'WARN':
-                logging.warning(msg),
-            case 'DEBUG':
-                logging.debug(msg),
-            case 'ERROR':
-                logging.error(msg)
-            case _:
-                logging.info(msg)
+        _emit(_LEVELS.get(kind, logging.INFO), _Message(time, None, msg, (), None, None, None))
+
+
+def _discard(*args, **kwargs):
+    pass
+
+
+class Logger:
+    """ Logger class definition: It logs the messages of the entities of one simulation. Unlike log_me and log, whether
+    logging is enabled (and verbose) is bound at construction time instead of being read from Config on every message,
+    so differently configured simulations can log (or not) in the same process. Messages of kinds that are not emitted
+    are dropped before they are formatted, and emitted ones are only formatted when a handler writes them
+    :ivar _enabled: determines if logging is enabled
+    :type _enabled: bool
+    :ivar _verbose: determines if INFO and DEBUG messages are logged
+    :type _verbose: bool
+    :ivar _levels: logging levels of the kinds of messages, or None for the kinds that log_me drops
+    :type _levels: dict<str, int>
+    """
+    def __init__(self, enabled=True, verbose=False):
+        self._enabled = enabled
+        self._verbose = verbose
+        self._levels = {kind: level if enabled and (verbose or kind not in _VERBOSE_KINDS) else None
+                        for kind, level in _LEVELS.items()}
+        if not enabled:
+            # a disabled logger costs a single call per message
+            self.log_me = _discard
+            self.log = _discard
+
+    @classmethod
+    def from_config(cls, config=None):
+        """ Create a logger configured by a simulation configuration
+        :param config: an instance of SimConfig (the current values of Config if not specified)
+        :return: the logger
+        :rtype: Logger
+        """
+        if config is None:
+            return cls(conf.enable_log, conf.verbose)
+        return cls(config.enable_log, config.verbose)
+
+    def log_me(self, kind, time, sender, message, vm_id=None, dc_id=None, host_id=None, args=()):
+        """ Log a message of an entity
+        :param kind: kind of the message (STAT, INFO, WARN, DEBUG or ERROR)
+        :param time: the simulation time
+        :param sender: name of the entity
+        :param message: the message, a format string if args are given
+        :param vm_id: id of the related VM
+        :param dc_id: id of the related datacenter
+        :param host_id: id of the related host
+        :param args: arguments of the message, formatted into it only if the message is written
+        """
+        level = self._levels.get(kind, logging.INFO)
+        if level is not None:
+            _emit(level, _Message(time, sender, message, args, vm_id, dc_id, host_id))
+
+    def log(self, kind, time, msg):
+        _emit(_LEVELS.get(kind, logging.INFO), _Message(time, None, msg, (), None, None, None))
+
+    def is_enabled_for(self, kind):
+        """ Check if messages of a kind are emitted, e.g. to skip computing an expensive message
+        :param kind: kind of the message
+        :return: True if the messages are emitted
+        :rtype: bool
+        """
+        return self._enabled and self._levels.get(kind, logging.INFO) is not None
+
+    def is_enabled(self):
+        return self._enabled
 
+    def is_verbose(self):
+        return self._verbose
@@ -0,0 +1,134 @@
+"""
+Title:          PyCloudSim
+Description:    A Python-based Cloud Simulator
+Author(s):      Mahmoud Momtazpour
+Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
+Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
+"""
+
+from array import array
+
+import numpy as np
+
+# columns of datacenter samples and their typecodes
+DC_COLUMNS = {'dc_id': 'q', 'time': 'q', 'power': 'd', 'num_vms': 'q', 'green': 'd', 'brown_cost': 'd'}
+# columns of rejections and rewards and their typecodes
+REJECTION_COLUMNS = {'rejection_time': 'q', 'rejection_vm_id': 'q'}
+REWARD_COLUMNS = {'reward': 'd'}
+_COLUMNS = {**DC_COLUMNS, **REJECTION_COLUMNS, **REWARD_COLUMNS}
+_DTYPES = {'q': np.int64, 'd': np.float64}
+
+
+class MetricsRecorder:
+    """ MetricsRecorder class definition: It records the results of a simulation as typed samples pushed by its
+    entities, held in growable typed columns. Unlike parsing the log file, the results are available whether logging
+    is enabled or not, and are exported or turned into the inputs of plot_results without any text processing
+    :ivar _columns: samples of each column: the datacenter samples (dc_id, time, power, num_vms, green and brown_cost),
+    the rejected VMs (rejection_time and rejection_vm_id) and the rewards of the DC selection policy (reward)
+    :type _columns: dict<str, array>
+    """
+
+    def __init__(self):
+        self._columns = {name: array(typecode) for name, typecode in _COLUMNS.items()}
+
+    def record_dc(self, dc_id, time, power, num_vms, green, brown_cost):
+        """ Record the state of a datacenter after its power has changed
+        :param dc_id: id of the datacenter
+        :param time: the simulation time
+        :param power: power consumption of the datacenter
+        :param num_vms: number of VMs hosted by the datacenter
+        :param green: stored green energy of the datacenter
+        :param brown_cost: total brown energy cost of the datacenter up to this time
+        """
+        columns = self._columns
+        columns['dc_id'].append(int(dc_id))
+        columns['time'].append(time)
+        columns['power'].append(power)
+        columns['num_vms'].append(num_vms)
+        columns['green'].append(green)
+        columns['brown_cost'].append(brown_cost)
+
+    def record_rejection(self, time, vm_id):
+        """ Record a VM that was not created on any datacenter
+        :param time: the simulation time
+        :param vm_id: id of the VM
+        """
+        self._columns['rejection_time'].append(time)
+        self._columns['rejection_vm_id'].append(vm_id)
+
+    def record_reward(self, reward):
+        """ Record a reward observed by the DC selection policy
+        :param reward: the reward
+        """
+        self._columns['reward'].append(reward)
+
+    def reset(self):
+        """ Remove all samples, e.g. before another run of the simulation """
+        for column in self._columns.values():
+            del column[:]
+
+    def get_column(self, name):
+        """ Get a copy of a column as a NumPy array
+        :param name: name of the column
+        :return: samples of the column
+        :rtype: ndarray
+        """
+        # a copy, since the column cannot grow while a view of it is exported
+        return np.array(self._columns[name], dtype=_DTYPES[self._columns[name].typecode])
+
+    def get_columns(self):
+        return {name: self.get_column(name) for name in self._columns}
+
+    def get_num_samples(self):
+        return len(self._columns['dc_id'])
+
+    def get_num_rejected(self):
+        return len(self._columns['rejection_time'])
+
+    def get_rewards(self):
+        return self._columns['reward'].tolist()
+
+    def save(self, metrics_file, compressed=False):
+        """ Export all columns to a .npz file, one array per column
+        :param metrics_file: path to the file
+        :param compressed: determines if the columns are compressed
+        """
+        if compressed:
+            np.savez_compressed(metrics_file, **self.get_columns())
+        else:
+            np.savez(metrics_file, **self.get_columns())
+
+    @classmethod
+    def load(cls, metrics_file):
+        """ Load the columns exported by save
+        :param metrics_file: path to the .npz file
+        :return: a recorder holding the loaded samples
+        :rtype: MetricsRecorder
+        """
+        recorder = cls()
+        with np.load(metrics_file) as data:
+            for name, column in recorder._columns.items():
+                if name in data:
+                    column.frombytes(data[name].astype(_DTYPES[column.typecode]).tobytes())
+        return recorder
+
+    def to_results(self):
+        """ Get the results in the format of utils.parser.parse, i.e. the inputs of plot_results. Like in the log, the
+        last sample of a datacenter at a given time overrides the earlier ones
+        :return: power readings and number of VMs of each datacenter by time, number of rejected VMs and rewards
+        :rtype: tuple(dict<int, dict<int, float>>, dict<int, dict<int, int>>, int, list[float])
+        """
+        dc_ids = self.get_column('dc_id')
+        times = self.get_column('time')
+        power = self.get_column('power')
+        num_vms = self.get_column('num_vms')
+        power_readings = dict()
+        dc_num_vms = dict()
+        # datacenters in the order of their first sample
+        ids, first = np.unique(dc_ids, return_index=True)
+        for dc_id in ids[np.argsort(first)].tolist():
+            mask = dc_ids == dc_id
+            dc_times = times[mask].tolist()
+            power_readings[dc_id] = dict(zip(dc_times, power[mask].tolist()))
+            dc_num_vms[dc_id] = dict(zip(dc_times, num_vms[mask].tolist()))
+        return power_readings, dc_num_vms, self.get_num_rejected(), self.get_rewards()
@@ -1,9 +1,10 @@
+import gzip
 import re
 from csv import reader
 
 
 def parse(log_file):
-    with open(log_file) as log:
+    with (gzip.open(log_file, mode='rt') if str(log_file).endswith('.gz') else open(log_file)) as log:
         lines = list(reader(log, ))
         power_readings = {}
         num_rejected = 0
@@ -0,0 +1,139 @@
+"""
+Title:          PyCloudSim
+Description:    A Python-based Cloud Simulator
+Author(s):      Mahmoud Momtazpour
+Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
+Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
+"""
+
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from csv import DictWriter
+from itertools import product
+from tempfile import TemporaryDirectory
+
+import numpy as np
+
+from Config import Config as conf
+from utils.columnar import convert_vm_file, is_binary_file
+from utils.trace_store import TraceStore
+
+# One run of a sweep. If vm_file is None, a synthetic workload of num_vms VMs is generated with the seed of the cell
+SweepCell = namedtuple('SweepCell', ['dc_selection_policy', 'vm_allocation_policy', 'dc_file', 'vm_file', 'seed'])
+
+RESULT_FIELDS = ['dc_selection_policy', 'vm_allocation_policy', 'dc_file', 'vm_file', 'seed', 'num_vms',
+                 'num_rejected', 'total_cost', 'wall_time']
+
+
+def expand_grid(dc_selection_policies: list[str], vm_allocation_policies: list[str], dc_files: list[str],
+                vm_files: list[str], seeds: list[int] = (None,)) -> list[SweepCell]:
+    """Expand a grid of experiments into its cells
+    :param dc_selection_policies: names of DC selection policies
+    :param vm_allocation_policies: names of VM allocation policies
+    :param dc_files: paths to datacenter files
+    :param vm_files: paths to VM files (None for a synthetic workload)
+    :param seeds: seeds of the random number generators
+    :return: one cell for each combination
+    :rtype: list[SweepCell]
+    """
+    return [SweepCell(*values) for values in
+            product(dc_selection_policies, vm_allocation_policies, dc_files, vm_files, seeds)]
+
+
+def share_files(cells: list[SweepCell], trace_files: list[str], cache_dir: str) -> tuple[list[SweepCell], list[str]]:
+    """Convert the csv traces and VM files of a sweep to the binary format once, so that all workers memory-map the same
+    files instead of each parsing its own copy
+    :param cells: cells of the sweep
+    :param trace_files: paths to the power trace files
+    :param cache_dir: directory where the binary copies are written (and reused, if they are up to date)
+    :return: the cells, with VM files replaced by their binary copies, and the binary copies of the trace files
+    :rtype: tuple(list[SweepCell], list[str])
+    """
+    store = TraceStore(cache_dir)
+    shared_traces = [trace_file if is_binary_file(trace_file) else store.get_cached_file(trace_file)
+                     for trace_file in trace_files]
+    binary_files = {vm_file: store.get_cached_file(vm_file, convert_vm_file) for vm_file in
+                    {cell.vm_file for cell in cells if cell.vm_file is not None and not is_binary_file(cell.vm_file)}}
+    return [cell._replace(vm_file=binary_files.get(cell.vm_file, cell.vm_file)) for cell in cells], shared_traces
+
+
+def run_cell(cell: SweepCell, pue_file: str, br_cost_file: str, solar_file: str, sim_time: int,
+             num_vms: int = 1000) -> dict:
+    """Run one cell of a sweep. Logging is disabled, and the results are taken from the simulation objects
+    :param cell: the cell
+    :param pue_file: path to the pue trace file
+    :param br_cost_file: path to the brown energy price trace file
+    :param solar_file: path to the solar power trace file
+    :param sim_time: simulation time
+    :param num_vms: number of VMs of synthetic workloads
+    :return: the cell and its results
+    :rtype: dict
+    """
+    from PyCloudSim import PyCloudSim
+    from core.SimConfig import SimConfig
+    from utils.creator import create_broker, create_cloud, create_power_datacenter_from_file, stream_generated_vms, \
+        stream_vms
+
+    config = SimConfig.from_config(enable_log=False, dc_selection_policy=cell.dc_selection_policy,
+                                   vm_allocation_policy=cell.vm_allocation_policy)
+    if cell.seed is not None:
+        random.seed(cell.seed)
+        np.random.seed(cell.seed)
+    start = time.perf_counter()
+    datacenters = create_power_datacenter_from_file(cell.dc_file, pue_file, br_cost_file, solar_file, config=config)
+    cloud = create_cloud(datacenters, config=config)
+    if cell.vm_file is not None:
+        vms = stream_vms(cell.vm_file, config=config)
+    else:
+        vms = stream_generated_vms(num_vms, seed=cell.seed, config=config)
+    broker = create_broker(cloud)
+    broker.submit_vm_source(vms)
+    cloud.set_broker(broker)
+    sim = PyCloudSim(sim_time, broker, cloud, [], config=config)
+    sim.start_simulation()
+    messages = sim.get_message_bus().get_counts()
+    result = cell._asdict()
+    result.update(num_vms=broker.get_vms_requested(),
+                  num_rejected=messages['VmCreateAck'],
+                  total_cost=sum(dc.get_brown_cost() for dc in datacenters),
+                  wall_time=round(time.perf_counter() - start, 3))
+    return result
+
+
+def run_sweep(cells: list[SweepCell], pue_file: str, br_cost_file: str, solar_file: str, sim_time: int,
+              num_vms: int = 1000, max_workers: int = None) -> list[dict]:
+    """Run the cells of a sweep in parallel on a process pool
+    :param cells: cells of the sweep
+    :param pue_file: path to the pue trace file
+    :param br_cost_file: path to the brown energy price trace file
+    :param solar_file: path to the solar power trace file
+    :param sim_time: simulation time
+    :param num_vms: number of VMs of synthetic workloads
+    :param max_workers: number of worker processes (number of CPUs if not specified)
+    :return: results of the cells, in the order of the cells
+    :rtype: list[dict]
+    """
+    # without a cache directory, the binary copies are only kept for the sweep
+    with nullcontext(conf.trace_cache_dir) if conf.trace_cache_dir is not None else TemporaryDirectory() as cache_dir:
+        shared_cells, shared_traces = share_files(cells, [pue_file, br_cost_file, solar_file], cache_dir)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(run_cell, cell, *shared_traces, sim_time, num_vms) for cell in shared_cells]
+            results = [future.result() for future in futures]
+    # report the files of the cells as they were given
+    for cell, result in zip(cells, results):
+        result['vm_file'] = cell.vm_file
+    return results
+
+
+def write_results(results: list[dict], results_file: str):
+    """Write the results of a sweep as a csv table
+    :param results: results of the cells
+    :param results_file: path to the csv file
+    """
+    with open(results_file, mode='w', newline='') as file:
+        result_writer = DictWriter(file, fieldnames=RESULT_FIELDS)
+        result_writer.writeheader()
+        result_writer.writerows(results)
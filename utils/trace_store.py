@@ -0,0 +1,110 @@
+"""
+Title:          PyCloudSim
+Description:    A Python-based Cloud Simulator
+Author(s):      Mahmoud Momtazpour
+Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
+Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
+"""
+
+import hashlib
+import os
+
+import numpy as np
+
+from Config import Config as conf
+from utils.columnar import BINARY_SUFFIX, convert_trace_file, is_binary_file, load_trace, read_trace_csv
+
+
+class TraceStore:
+    """ TraceStore class definition: It loads each power trace file (pue, solar, brown price) once into a
+    (num_dcs x trace_length) float64 matrix and hands out rows of it as views, so datacenters, episodes and repeated
+    runs share the same memory. Binary traces are memory-mapped read-only. If a cache directory is given, csv traces
+    are converted to the binary format once and memory-mapped too, so that parallel processes share the same pages
+    :ivar _cache_dir: directory where csv traces are cached in the binary format, or None
+    :type _cache_dir: str
+    :ivar _traces: mapping between absolute paths of trace files and their (file signature, matrix)
+    :type _traces: dict<str, (tuple, ndarray)>
+    """
+    def __init__(self, cache_dir=None):
+        self._cache_dir = cache_dir
+        self._traces = dict()
+
+    def get_trace(self, trace_file):
+        """ Get the matrix of a trace file, loading it if it is not loaded yet or has changed on disk
+        :param trace_file: path to the csv or binary trace file
+        :return: a read-only (num_dcs x trace_length) matrix, one row per datacenter
+        :rtype: ndarray
+        """
+        path = os.path.abspath(trace_file)
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._traces.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        if is_binary_file(path):
+            trace = load_trace(path)
+        elif self._cache_dir is not None:
+            trace = load_trace(self._get_cached_file(path, signature))
+        else:
+            trace = read_trace_csv(path)
+            trace.flags.writeable = False
+        self._traces[path] = (signature, trace)
+        return trace
+
+    def get_row(self, trace_file, row):
+        """ Get the trace of one datacenter as a view into the shared matrix
+        :param trace_file: path to the csv or binary trace file
+        :param row: index of the row (i.e. datacenter id - 1)
+        :return: a read-only view of the row
+        :rtype: ndarray
+        """
+        return np.asarray(self.get_trace(trace_file)[row])
+
+    def get_cached_file(self, source_file, convert=convert_trace_file):
+        """ Get the binary copy of a csv file in the cache directory, converting the file first if it has no copy yet
+        :param source_file: path to the csv file
+        :param convert: function that writes the binary copy of a csv file, given the paths to both (convert_trace_file
+        by default, e.g. convert_vm_file for VM files)
+        :return: path to the binary copy
+        :rtype: str
+        """
+        path = os.path.abspath(source_file)
+        stat = os.stat(path)
+        return self._get_cached_file(path, (stat.st_mtime_ns, stat.st_size), convert)
+
+    def _get_cached_file(self, path, signature, convert=convert_trace_file):
+        # the name of the cached file depends on the csv file and its signature, so stale caches are never used
+        key = hashlib.sha1(f'{path}:{signature[0]}:{signature[1]}'.encode()).hexdigest()[:16]
+        name = os.path.splitext(os.path.basename(path))[0]
+        cached_file = os.path.join(self._cache_dir, f'{name}-{key}{BINARY_SUFFIX}')
+        if not os.path.exists(cached_file):
+            os.makedirs(self._cache_dir, exist_ok=True)
+            # write to a temporary file first, so that concurrent processes never see a partial file
+            temp_file = os.path.join(self._cache_dir, f'{name}-{key}.{os.getpid()}.tmp{BINARY_SUFFIX}')
+            convert(path, temp_file)
+            os.replace(temp_file, cached_file)
+        return cached_file
+
+    def clear(self):
+        """ Forget all loaded traces """
+        self._traces = dict()
+
+    def get_cache_dir(self):
+        return self._cache_dir
+
+    def set_cache_dir(self, cache_dir):
+        self._cache_dir = cache_dir
+
+
+_default_store = None
+
+
+def get_trace_store() -> TraceStore:
+    """Get the trace store shared by all datacenters of this process
+    :return: the shared trace store
+    :rtype: TraceStore
+    """
+    global _default_store
+    if _default_store is None:
+        _default_store = TraceStore(conf.trace_cache_dir)
+    return _default_store
@@ -0,0 +1,162 @@
+"""
+Title:          PyCloudSim
+Description:    A Python-based Cloud Simulator
+Author(s):      Mahmoud Momtazpour
+Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
+Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
+"""
+
+import numpy as np
+
+
+class HostCapacityIndex:
+    """ HostCapacityIndex class definition: It keeps the total and available resources of all hosts of a datacenter in
+    (hosts x resources) matrices, so that allocation policies can find a host for a VM with a few vectorized
+    operations instead of a loop over hosts. Columns are ordered as mips, ram, bw and storage. It also keeps a summary
+    of the datacenter (maximum available amount of each resource on any host, and total available amount of each
+    resource), so that VMs that cannot fit on any host are rejected in O(1)
+    :ivar _host_list: a list of all hosts within a data center
+    :type _host_list: list[Host]
+    :ivar _host_position: mapping between hosts and their row in the matrices
+    :type _host_position: dict<Host, int>
+    :ivar _capacity: total resources of hosts
+    :type _capacity: ndarray
+    :ivar _available: available resources of hosts
+    :type _available: ndarray
+    :ivar _inv_capacity: inverse of total resources of hosts (0 for resources that a host does not have)
+    :type _inv_capacity: ndarray
+    :ivar _max_available: maximum available amount of each resource on any host
+    :type _max_available: list[float]
+    :ivar _max_available_dirty: True if _max_available should be recomputed, since a host that had the maximum
+    available amount of a resource has lost some of it
+    :type _max_available_dirty: bool
+    :ivar _total_available: total available amount of each resource over all hosts
+    :type _total_available: list[float]
+    """
+    def __init__(self, host_list):
+        self._host_list = host_list
+        self._host_position = {host: i for i, host in enumerate(host_list)}
+        self._capacity = np.array([host.get_provisioner().get_capacity() for host in host_list], dtype=np.float64,
+                                  ndmin=2).reshape(len(host_list), 4)
+        self._inv_capacity = np.divide(1.0, self._capacity, out=np.zeros_like(self._capacity),
+                                       where=self._capacity > 0)
+        self._available = np.empty_like(self._capacity)
+        self._max_available = [0.0] * 4
+        self._max_available_dirty = True
+        self._total_available = [0.0] * 4
+        self.rebuild()
+
+    def rebuild(self):
+        """ Reload the available resources of all hosts """
+        for i, host in enumerate(self._host_list):
+            self._available[i] = host.get_provisioner().get_available()
+        self._total_available = self._available.sum(axis=0).tolist()
+        self._max_available_dirty = True
+
+    def update_host(self, host):
+        """ Reload the available resources of a host after VMs are created on or destroyed from it. The datacenter
+        summary is updated in O(1)
+        :param host: an instance of the Host class
+        """
+        row = self._available[self._host_position[host]]
+        old = row.tolist()
+        available = host.get_provisioner().get_available()
+        row[:] = available
+        max_available = self._max_available
+        total_available = self._total_available
+        for r in range(4):
+            total_available[r] += available[r] - old[r]
+            if available[r] > max_available[r]:
+                max_available[r] = available[r]
+            elif available[r] < old[r] == max_available[r]:
+                self._max_available_dirty = True
+
+    def get_max_available(self):
+        """ Get the maximum available amount of each resource on any host
+        :return: the maximum available (mips, ram, bw, storage)
+        :rtype: list[float]
+        """
+        if self._max_available_dirty:
+            self._max_available = self._available.max(axis=0).tolist()
+            self._max_available_dirty = False
+        return self._max_available
+
+    def get_total_available(self):
+        """ Get the total available amount of each resource over all hosts
+        :return: the total available (mips, ram, bw, storage)
+        :rtype: list[float]
+        """
+        return self._total_available
+
+    def may_fit(self, vm):
+        """ Check in O(1) if a given VM may fit on a host, i.e. no resource is requested more than the maximum
+        available amount of that resource on any host. If it returns False, no host is suitable for the VM
+        :param vm: an instance of the VM class
+        :return: False if no host is suitable for the VM, True otherwise
+        :rtype: bool
+        """
+        max_available = self.get_max_available()
+        return max_available[0] >= vm.get_mips() and max_available[1] >= vm.get_ram() and \
+            max_available[2] >= vm.get_bw() and max_available[3] >= vm.get_storage()
+
+    def get_suitable_mask(self, vm):
+        """ Get a mask of hosts that have enough resources for a given VM
+        :param vm: an instance of the VM class
+        :return: a boolean array with one element per host
+        :rtype: ndarray
+        """
+        requested = np.array((vm.get_mips(), vm.get_ram(), vm.get_bw(), vm.get_storage()))
+        return (self._available >= requested).all(axis=1)
+
+    def first_fit(self, vm):
+        """ Find the first host that has enough resources for a given VM
+        :param vm: an instance of the VM class
+        :return: position of the host in the host list or -1 if no host is suitable
+        :rtype: int
+        """
+        mask = self.get_suitable_mask(vm)
+        position = int(mask.argmax())
+        return position if mask[position] else -1
+
+    def least_mips(self, vm):
+        """ Find the host with the least available mips among the hosts that have enough resources for a given VM
+        :param vm: an instance of the VM class
+        :return: position of the host in the host list or -1 if no host is suitable
+        :rtype: int
+        """
+        return self._select(self.get_suitable_mask(vm), self._available[:, 0])
+
+    def best_fit(self, vm):
+        """ Find the host that would be left with the least normalized free resources after allocating a given VM
+        :param vm: an instance of the VM class
+        :return: position of the host in the host list or -1 if no host is suitable
+        :rtype: int
+        """
+        return self._select(self.get_suitable_mask(vm), self._get_remaining(vm))
+
+    def worst_fit(self, vm):
+        """ Find the host that would be left with the most normalized free resources after allocating a given VM
+        :param vm: an instance of the VM class
+        :return: position of the host in the host list or -1 if no host is suitable
+        :rtype: int
+        """
+        return self._select(self.get_suitable_mask(vm), -self._get_remaining(vm))
+
+    def _get_remaining(self, vm):
+        requested = np.array((vm.get_mips(), vm.get_ram(), vm.get_bw(), vm.get_storage()))
+        return ((self._available - requested) * self._inv_capacity).sum(axis=1)
+
+    @staticmethod
+    def _select(mask, key):
+        if not mask.any():
+            return -1
+        return int(np.where(mask, key, np.inf).argmin())
+
+    def get_host_position(self, host):
+        return self._host_position[host]
+
+    def get_capacity(self):
+        return self._capacity
+
+    def get_available(self):
+        return self._available
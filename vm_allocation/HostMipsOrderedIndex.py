@@ -0,0 +1,250 @@
+"""
+Title:          PyCloudSim
+Description:    A Python-based Cloud Simulator
+Author(s):      Mahmoud Momtazpour
+Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
+Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
+"""
+
+from random import Random
+
+
+class HostMipsOrderedIndex:
+    """ HostMipsOrderedIndex class definition: It keeps the hosts of a datacenter in a balanced search tree (a treap)
+    ordered by their available mips, in which each node also keeps the maximum available ram, bw and storage of the
+    hosts below it. The hosts with the least or the most available mips that fit a VM are found by descending the tree
+    and skipping subtrees that cannot fit the VM, and hosts are moved in the tree in O(log(hosts)) when they change.
+    Since the maxima of a subtree may come from different hosts, a subtree may pass the check although none of its
+    hosts fits the VM, so a lookup visits O(hosts) nodes in the worst case. Each host is a node of the tree, identified
+    by its position in the host list
+    :ivar _host_list: a list of all hosts within a data center
+    :type _host_list: list[Host]
+    :ivar _host_position: mapping between hosts and their position in the host list
+    :type _host_position: dict<Host, int>
+    :ivar _root: position of the host at the root of the tree (-1 if there are no hosts)
+    :type _root: int
+    :ivar _key: (available mips, position) of each node, by which the tree is ordered
+    :type _key: list[tuple(float, int)]
+    :ivar _available: available (ram, bw, storage) of each node
+    :type _available: list[tuple(float, float, float)]
+    :ivar _max_available: maximum available (ram, bw, storage) over the subtree of each node
+    :type _max_available: list[tuple(float, float, float)]
+    :ivar _priority: random priority of each node, which keeps the tree balanced
+    :type _priority: list[float]
+    :ivar _left: left child of each node (-1 if none)
+    :type _left: list[int]
+    :ivar _right: right child of each node (-1 if none)
+    :type _right: list[int]
+    """
+    def __init__(self, host_list):
+        self._host_list = host_list
+        self._host_position = {host: i for i, host in enumerate(host_list)}
+        # a fixed seed, so that the shape of the tree (though not the results) is reproducible
+        random = Random(len(host_list))
+        self._priority = [random.random() for _ in host_list]
+        self._root = -1
+        self._key = []
+        self._available = []
+        self._max_available = []
+        self._left = []
+        self._right = []
+        self.rebuild()
+
+    def rebuild(self):
+        """ Reload the available resources of all hosts """
+        n = len(self._host_list)
+        self._key = [None] * n
+        self._available = [None] * n
+        self._max_available = [None] * n
+        self._left = [-1] * n
+        self._right = [-1] * n
+        for i, host in enumerate(self._host_list):
+            self._load(i, host)
+        # build the tree from the sorted nodes in O(hosts) with a stack holding its right spine
+        spine = []
+        for node in sorted(range(n), key=self._key.__getitem__):
+            last = -1
+            while spine and self._priority[spine[-1]] < self._priority[node]:
+                last = spine.pop()
+                self._pull(last)
+            self._left[node] = last
+            if spine:
+                self._right[spine[-1]] = node
+            spine.append(node)
+        while spine:
+            self._pull(spine.pop())
+        self._root = max(range(n), key=self._priority.__getitem__) if n else -1
+
+    def _load(self, node, host):
+        available = host.get_provisioner().get_available()
+        self._key[node] = (available[0], node)
+        self._available[node] = (available[1], available[2], available[3])
+        self._max_available[node] = self._available[node]
+
+    def _pull(self, node):
+        # recompute the maxima of a node from its own resources and those of its children
+        ram, bw, storage = self._available[node]
+        for child in (self._left[node], self._right[node]):
+            if child >= 0:
+                child_ram, child_bw, child_storage = self._max_available[child]
+                if child_ram > ram:
+                    ram = child_ram
+                if child_bw > bw:
+                    bw = child_bw
+                if child_storage > storage:
+                    storage = child_storage
+        self._max_available[node] = (ram, bw, storage)
+
+    def _split(self, node, key):
+        """ Split a subtree into the nodes whose keys are less than a given key and the others
+        :param node: root of the subtree
+        :param key: the key
+        :return: roots of the two subtrees
+        :rtype: tuple(int, int)
+        """
+        if node < 0:
+            return -1, -1
+        if self._key[node] < key:
+            self._right[node], right = self._split(self._right[node], key)
+            self._pull(node)
+            return node, right
+        left, self._left[node] = self._split(self._left[node], key)
+        self._pull(node)
+        return left, node
+
+    def _merge(self, left, right):
+        # merge two subtrees, all keys of the left one being less than those of the right one
+        if left < 0:
+            return right
+        if right < 0:
+            return left
+        if self._priority[left] > self._priority[right]:
+            self._right[left] = self._merge(self._right[left], right)
+            self._pull(left)
+            return left
+        self._left[right] = self._merge(left, self._left[right])
+        self._pull(right)
+        return right
+
+    def _attach(self, parent, node):
+        # make a node the child of a parent (or the root, if the parent is -1) on the side of its key
+        if parent < 0:
+            self._root = node
+        elif self._key[node] < self._key[parent]:
+            self._left[parent] = node
+        else:
+            self._right[parent] = node
+
+    def _insert(self, new):
+        """ Insert a node below the nodes of higher priority on the way to its key. Only the maxima of the nodes on
+        that way can grow, and they stop growing at the first node whose maxima already cover the new node
+        :param new: the node
+        """
+        key = self._key[new]
+        priority = self._priority[new]
+        path = []
+        node = self._root
+        while node >= 0 and self._priority[node] > priority:
+            path.append(node)
+            node = self._left[node] if key < self._key[node] else self._right[node]
+        self._left[new], self._right[new] = self._split(node, key)
+        self._pull(new)
+        self._attach(path[-1] if path else -1, new)
+        ram, bw, storage = self._available[new]
+        for node in reversed(path):
+            old = self._max_available[node]
+            if old[0] >= ram and old[1] >= bw and old[2] >= storage:
+                break
+            self._max_available[node] = (max(old[0], ram), max(old[1], bw), max(old[2], storage))
+
+    def _remove(self, old):
+        """ Remove a node by merging its subtrees in its place. Only the maxima of its ancestors can shrink, and they
+        stop shrinking at the first ancestor whose maxima do not change
+        :param old: the node
+        """
+        key = self._key[old]
+        path = []
+        node = self._root
+        while node != old:
+            path.append(node)
+            node = self._left[node] if key < self._key[node] else self._right[node]
+        merged = self._merge(self._left[old], self._right[old])
+        parent = path[-1] if path else -1
+        if parent < 0:
+            self._root = merged
+        elif self._left[parent] == old:
+            self._left[parent] = merged
+        else:
+            self._right[parent] = merged
+        for node in reversed(path):
+            maxima = self._max_available[node]
+            self._pull(node)
+            if self._max_available[node] == maxima:
+                break
+
+    def update_host(self, host):
+        """ Reload the available resources of a host after VMs are created on or destroyed from it, in O(log(hosts))
+        :param host: an instance of the Host class
+        """
+        node = self._host_position[host]
+        available = host.get_provisioner().get_available()
+        if self._key[node][0] == available[0] and self._available[node] == (available[1], available[2], available[3]):
+            return
+        self._remove(node)
+        self._load(node, host)
+        self._insert(node)
+
+    @staticmethod
+    def _fits(resources, ram, bw, storage):
+        return resources[0] >= ram and resources[1] >= bw and resources[2] >= storage
+
+    def _first_fit(self, node, key, ram, bw, storage):
+        """ Find the node with the least key not less than a given key whose ram, bw and storage fit
+        :return: the node or -1 if there is none in the subtree
+        :rtype: int
+        """
+        while node >= 0 and self._fits(self._max_available[node], ram, bw, storage):
+            if self._key[node] < key:
+                # the node and its left subtree have too little mips
+                node = self._right[node]
+                continue
+            found = self._first_fit(self._left[node], key, ram, bw, storage)
+            if found >= 0:
+                return found
+            if self._fits(self._available[node], ram, bw, storage):
+                return node
+            node = self._right[node]
+        return -1
+
+    def _last_fit(self, node, key, ram, bw, storage):
+        """ Find the node with the greatest key not less than a given key whose ram, bw and storage fit
+        :return: the node or -1 if there is none in the subtree
+        :rtype: int
+        """
+        while node >= 0 and self._fits(self._max_available[node], ram, bw, storage):
+            found = self._last_fit(self._right[node], key, ram, bw, storage)
+            if found >= 0:
+                return found
+            if self._key[node] < key:
+                # the node and its left subtree have too little mips
+                return -1
+            if self._fits(self._available[node], ram, bw, storage):
+                return node
+            node = self._left[node]
+        return -1
+
+    def least_mips(self, vm):
+        """ Find the host with the least available mips that has enough resources for a given VM
+        :param vm: an instance of the VM class
+        :return: position of the host in the host list or -1 if no host is suitable
+        :rtype: int
+        """
+        return self._first_fit(self._root, (vm.get_mips(), -1), vm.get_ram(), vm.get_bw(), vm.get_storage())
+
+    def most_mips(self, vm):
+        """ Find the host with the most available mips that has enough resources for a given VM
+        :param vm: an instance of the VM class
+        :return: position of the host in the host list or -1 if no host is suitable
+        :rtype: int
+        """
+        return self._last_fit(self._root, (vm.get_mips(), -1), vm.get_ram(), vm.get_bw(), vm.get_storage())
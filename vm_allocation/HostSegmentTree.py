@@ -0,0 +1,83 @@
+"""
+Title:          PyCloudSim
+Description:    A Python-based Cloud Simulator
+Author(s):      Mahmoud Momtazpour
+Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
+Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
+"""
+
+from math import inf
+
+
+class HostSegmentTree:
+    """ HostSegmentTree class definition: It is a segment tree over the available resources of the hosts of a
+    datacenter. Each node keeps the maximum available mips, ram, bw and storage among the hosts below it, so the first
+    host that fits a VM is found by descending from the root and skipping subtrees that cannot fit it. Since the maxima
+    of a subtree may come from different hosts, a subtree may pass the check although none of its hosts fits the VM,
+    so a lookup visits O(hosts) nodes in the worst case
+    :ivar _host_list: a list of all hosts within a data center
+    :type _host_list: list[Host]
+    :ivar _host_position: mapping between hosts and their position in the host list
+    :type _host_position: dict<Host, int>
+    :ivar _size: number of leaves (the smallest power of two not less than the number of hosts)
+    :type _size: int
+    :ivar _tree: for each resource, the maximum available amount of each node (leaves start at index _size)
+    :type _tree: list[list[float]]
+    """
+    def __init__(self, host_list):
+        self._host_list = host_list
+        self._host_position = {host: i for i, host in enumerate(host_list)}
+        self._size = 1
+        while self._size < len(host_list):
+            self._size *= 2
+        self._tree = [[-inf] * (2 * self._size) for _ in range(4)]
+        self.rebuild()
+
+    def rebuild(self):
+        """ Reload the available resources of all hosts """
+        size = self._size
+        for i, host in enumerate(self._host_list):
+            available = host.get_provisioner().get_available()
+            for r in range(4):
+                self._tree[r][size + i] = available[r]
+        for tree in self._tree:
+            for node in range(size - 1, 0, -1):
+                tree[node] = max(tree[2 * node], tree[2 * node + 1])
+
+    def update_host(self, host):
+        """ Reload the available resources of a host after VMs are created on or destroyed from it, in O(log(hosts))
+        :param host: an instance of the Host class
+        """
+        node = self._size + self._host_position[host]
+        available = host.get_provisioner().get_available()
+        for r in range(4):
+            tree = self._tree[r]
+            tree[node] = available[r]
+            parent = node // 2
+            while parent:
+                value = max(tree[2 * parent], tree[2 * parent + 1])
+                if tree[parent] == value:
+                    break
+                tree[parent] = value
+                parent //= 2
+
+    def first_fit(self, vm):
+        """ Find the first host that has enough resources for a given VM
+        :param vm: an instance of the VM class
+        :return: position of the host in the host list or -1 if no host is suitable
+        :rtype: int
+        """
+        requested = (vm.get_mips(), vm.get_ram(), vm.get_bw(), vm.get_storage())
+        mips, ram, bw, storage = self._tree
+        size = self._size
+        stack = [1]
+        while stack:
+            node = stack.pop()
+            if mips[node] < requested[0] or ram[node] < requested[1] or bw[node] < requested[2] or \
+                    storage[node] < requested[3]:
+                continue
+            if node >= size:
+                return node - size
+            stack.append(2 * node + 1)
+            stack.append(2 * node)
+        return -1
@@ -8,14 +8,19 @@ Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
 
 from abc import ABC, abstractmethod
 
+from vm_allocation.HostCapacityIndex import HostCapacityIndex
+
 
 class VMAllocationPolicy(ABC):
     """ VMAllocationPolicy class definition: It is responsible for allocate/deallocate a host for a VM
         :ivar _host_list: a list of all hosts within a data center
         :type _host_list: list[Host]
+        :ivar _capacity_index: total and available resources of all hosts, kept up to date by the policy
+        :type _capacity_index: HostCapacityIndex
     """
     def __init__(self, host_list):
         self._host_list = host_list
+        self._capacity_index = HostCapacityIndex(host_list)
 
     @abstractmethod
     def allocate_host_for_vm(self, vm):
@@ -33,6 +38,16 @@ class VMAllocationPolicy(ABC):
     def get_host(self, vm):
         pass
 
+    def reset(self):
+        """ Destroy all VMs on the hosts and return the policy to its initial state, so that it can be reused for
+        another run """
+        for host in self._host_list:
+            host.vm_destroy_all()
+        self._capacity_index.rebuild()
+
+    def get_capacity_index(self):
+        return self._capacity_index
+
     def get_host_list(self):
         return self.__host_list
 
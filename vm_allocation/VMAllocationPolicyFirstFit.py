@@ -16,19 +16,22 @@ class VMAllocationPolicyFirstFit(VMAllocationPolicy):
     :ivar _host_list: a list of all hosts within a data center
     :type _host_list: list[Host]
     :ivar _vm_table: a dictionary that stores the mapping of VMs' UID to hosts
-    :type _vm_table: dict<str, Host>
+    :type _vm_table: dict<int, Host>
     """
     def __init__(self, host_list):
         super().__init__(host_list)
         self._vm_table = dict()
 
     def allocate_host_for_vm(self, vm):
-        for host in self.get_host_list():
-            if host.is_suitable_for_vm(vm):
-                if host.vm_create(vm):
-                    self._vm_table[vm.get_vm_uid()] = host
-                    return True
-        # logging.warning(f'No suitable host for vm with vm_id = {vm.get_id()}.')
+        position = self._capacity_index.first_fit(vm)
+        if position < 0:
+            # logging.warning(f'No suitable host for vm with vm_id = {vm.get_id()}.')
+            return False
+        host = self._host_list[position]
+        if host.vm_create(vm):
+            self._vm_table[vm.get_vm_uid()] = host
+            self._capacity_index.update_host(host)
+            return True
         return False
 
     def optimize_allocation(self, vm_list):
@@ -37,6 +40,11 @@ class VMAllocationPolicyFirstFit(VMAllocationPolicy):
     def deallocate_host_for_vm(self, vm):
         host = self._vm_table.pop(vm.get_vm_uid())
         host.vm_destroy(vm)
+        self._capacity_index.update_host(host)
+
+    def reset(self):
+        super().reset()
+        self._vm_table = dict()
 
     def get_host(self, vm):
         return self._vm_table[vm.get_vm_uid()]
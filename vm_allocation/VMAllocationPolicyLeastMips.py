@@ -7,7 +7,6 @@ Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
 """
 import logging
 from vm_allocation.VMAllocationPolicy import VMAllocationPolicy
-from heapq import heappush, heappop
 
 
 class VMAllocationPolicyLeastMips(VMAllocationPolicy):
@@ -16,28 +15,22 @@ class VMAllocationPolicyLeastMips(VMAllocationPolicy):
     :ivar _host_list: a list of all hosts within a data center
     :type _host_list: list[Host]
     :ivar _vm_table: a dictionary that stores the mapping of VMs' UID to hosts
-    :type _vm_table: dict<str, Host>
+    :type _vm_table: dict<int, Host>
     """
     def __init__(self, host_list):
         super().__init__(host_list)
         self._vm_table = dict()
 
     def allocate_host_for_vm(self, vm):
-        suitable_hosts = []
-        for host in self.get_host_list():
-            if host.is_suitable_for_vm(vm):
-                suitable_hosts.append(host)
-        if not suitable_hosts:
+        position = self._capacity_index.least_mips(vm)
+        if position < 0:
             # logging.warning(f'No suitable host for vm with vm_id = {vm.get_id()}.')
             return False
-        heap_mips = []
-        for host in suitable_hosts:
-            heappush(heap_mips, (host.get_available_mips(), host.get_id(), host))
-        for i in range(len(heap_mips)):
-            host = heappop(heap_mips)[2]
-            if host.vm_create(vm):
-                self._vm_table[vm.get_vm_uid()] = host
-                return True
+        host = self._host_list[position]
+        if host.vm_create(vm):
+            self._vm_table[vm.get_vm_uid()] = host
+            self._capacity_index.update_host(host)
+            return True
         return False
 
     def optimize_allocation(self, vm_list):
@@ -46,6 +39,11 @@ class VMAllocationPolicyLeastMips(VMAllocationPolicy):
     def deallocate_host_for_vm(self, vm):
         host = self._vm_table.pop(vm.get_vm_uid())
         host.vm_destroy(vm)
+        self._capacity_index.update_host(host)
+
+    def reset(self):
+        super().reset()
+        self._vm_table = dict()
 
     def get_host(self, vm):
         return self._vm_table[vm.get_vm_uid()]
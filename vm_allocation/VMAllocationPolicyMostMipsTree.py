@@ -0,0 +1,70 @@
+"""
+Title:          PyCloudSim
+Description:    A Python-based Cloud Simulator
+Author(s):      Mahmoud Momtazpour
+Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
+Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
+"""
+import logging
+
+from vm_allocation.HostMipsOrderedIndex import HostMipsOrderedIndex
+from vm_allocation.VMAllocationPolicy import VMAllocationPolicy
+
+
+class VMAllocationPolicyMostMipsTree(VMAllocationPolicy):
+    """ The VMAllocationPolicyMostMipsTree class definition: This policy allocates the host with
+    enough capacity, and with the most mips available for the VM, via an index of hosts ordered by their available mips
+    that is updated incrementally on VM creation and destruction
+    :ivar _host_list: a list of all hosts within a data center
+    :type _host_list: list[Host]
+    :ivar _vm_table: a dictionary that stores the mapping of VMs' UID to hosts
+    :type _vm_table: dict<int, Host>
+    :ivar _host_index: an index over the available resources of hosts
+    :type _host_index: HostMipsOrderedIndex
+    """
+    def __init__(self, host_list):
+        super().__init__(host_list)
+        self._vm_table = dict()
+        self._host_index = HostMipsOrderedIndex(host_list)
+
+    def allocate_host_for_vm(self, vm):
+        position = self._host_index.most_mips(vm)
+        if position < 0:
+            # logging.warning(f'No suitable host for vm with vm_id = {vm.get_id()}.')
+            return False
+        host = self._host_list[position]
+        if host.vm_create(vm):
+            self._vm_table[vm.get_vm_uid()] = host
+            self._host_index.update_host(host)
+            self._capacity_index.update_host(host)
+            return True
+        return False
+
+    def optimize_allocation(self, vm_list):
+        pass
+
+    def deallocate_host_for_vm(self, vm):
+        host = self._vm_table.pop(vm.get_vm_uid())
+        host.vm_destroy(vm)
+        self._host_index.update_host(host)
+        self._capacity_index.update_host(host)
+
+    def reset(self):
+        super().reset()
+        self._vm_table = dict()
+        self._host_index.rebuild()
+
+    def get_host(self, vm):
+        return self._vm_table[vm.get_vm_uid()]
+
+    def get_host_list(self):
+        return self._host_list
+
+    def _set_host_list(self, host_list):
+        self._host_list = host_list
+
+    def get_vm_table(self):
+        return self._vm_table
+
+    def _set_vm_table(self, vm_table):
+        self._vm_table = vm_table
@@ -0,0 +1,61 @@
+"""
+Title:          PyCloudSim
+Description:    A Python-based Cloud Simulator
+Author(s):      Mahmoud Momtazpour
+Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
+Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
+"""
+import logging
+from vm_allocation.VMAllocationPolicy import VMAllocationPolicy
+
+
+class VMAllocationPolicyWorstFit(VMAllocationPolicy):
+    """ The VMAllocationPolicyWorstFit class definition: This policy tries to allocate the host with enough
+    capacity that would be left with the most free resources (normalized by host capacity) after allocating the VM
+    :ivar _host_list: a list of all hosts within a data center
+    :type _host_list: list[Host]
+    :ivar _vm_table: a dictionary that stores the mapping of VMs' UID to hosts
+    :type _vm_table: dict<int, Host>
+    """
+    def __init__(self, host_list):
+        super().__init__(host_list)
+        self._vm_table = dict()
+
+    def allocate_host_for_vm(self, vm):
+        position = self._capacity_index.worst_fit(vm)
+        if position < 0:
+            # logging.warning(f'No suitable host for vm with vm_id = {vm.get_id()}.')
+            return False
+        host = self._host_list[position]
+        if host.vm_create(vm):
+            self._vm_table[vm.get_vm_uid()] = host
+            self._capacity_index.update_host(host)
+            return True
+        return False
+
+    def optimize_allocation(self, vm_list):
+        pass
+
+    def deallocate_host_for_vm(self, vm):
+        host = self._vm_table.pop(vm.get_vm_uid())
+        host.vm_destroy(vm)
+        self._capacity_index.update_host(host)
+
+    def reset(self):
+        super().reset()
+        self._vm_table = dict()
+
+    def get_host(self, vm):
+        return self._vm_table[vm.get_vm_uid()]
+
+    def get_host_list(self):
+        return self._host_list
+
+    def _set_host_list(self, host_list):
+        self._host_list = host_list
+
+    def get_vm_table(self):
+        return self._vm_table
+
+    def _set_vm_table(self, vm_table):
+        self._vm_table = vm_table
@@ -0,0 +1,50 @@
+"""
+Title:          PyCloudSim
+Description:    A Python-based Cloud Simulator
+Author(s):      Mahmoud Momtazpour
+Licence:        GPL - https://www.gnu.org/copyleft/gpl.html
+Copyright (c) 2022-2023, Amirkabir University of Technology, Iran
+"""
+
+from importlib import import_module
+
+# Registry of VM allocation policies as name: (module, class). Modules are imported when their policy is first used
+_VM_ALLOCATION_POLICIES = {
+    'FirstFit': ('vm_allocation.VMAllocationPolicyFirstFit', 'VMAllocationPolicyFirstFit'),
+    'LeastMips': ('vm_allocation.VMAllocationPolicyLeastMips', 'VMAllocationPolicyLeastMips'),
+    'BestFit': ('vm_allocation.VMAllocationPolicyBestFit', 'VMAllocationPolicyBestFit'),
+    'WorstFit': ('vm_allocation.VMAllocationPolicyWorstFit', 'VMAllocationPolicyWorstFit'),
+    'FirstFitTree': ('vm_allocation.VMAllocationPolicyFirstFitTree', 'VMAllocationPolicyFirstFitTree'),
+    'LeastMipsTree': ('vm_allocation.VMAllocationPolicyLeastMipsTree', 'VMAllocationPolicyLeastMipsTree'),
+    'MostMipsTree': ('vm_allocation.VMAllocationPolicyMostMipsTree', 'VMAllocationPolicyMostMipsTree'),
+}
+
+
+def register_vm_allocation_policy(name: str, module: str, class_name: str):
+    """Register a VM allocation policy, so that it can be selected by its name
+    :param name: name of the policy, e.g. in Config.vm_allocation_policy
+    :param module: the module that defines the policy
+    :param class_name: the class of the policy (a subclass of VMAllocationPolicy)
+    """
+    _VM_ALLOCATION_POLICIES[name] = (module, class_name)
+
+
+def get_vm_allocation_policy(name: str) -> type:
+    """Get the class of a VM allocation policy by its name, importing its module on first use
+    :param name: name of the policy
+    :return: the class of the policy
+    :rtype: type
+    :raise: raises ValueError if no policy is registered with the name
+    """
+    if name not in _VM_ALLOCATION_POLICIES:
+        raise ValueError('VM allocation policy not implemented')
+    module, class_name = _VM_ALLOCATION_POLICIES[name]
+    return getattr(import_module(module), class_name)
+
+
+def get_vm_allocation_policy_names() -> list[str]:
+    """Get the names of all registered VM allocation policies
+    :return: names of the policies
+    :rtype: list[str]
+    """
+    return list(_VM_ALLOCATION_POLICIES)